@@ -0,0 +1,42 @@
+import os
+
+# =============================================================================
+# [설정] 파일명 매핑
+# =============================================================================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# 데이터 폴더 (벤치마크/합성 데이터 실행 시 SLA_DATA_DIR 로 교체)
+DATA_DIR = os.getenv("SLA_DATA_DIR", os.path.join(BASE_DIR, "data"))
+
+FILE_CONFIG = {
+    "MAIN_DATA": os.path.join(DATA_DIR, "관광지_혼잡도_찐최종결과물.csv"),
+    "PRED_DATA": os.path.join(DATA_DIR, "AI_예측_결과.csv"),
+    "IMG_RANK_DATA": os.path.join(DATA_DIR, "관광지_별_유사도_순위_refined.csv"), 
+    "IMG_MATRIX_DATA": os.path.join(DATA_DIR, "부산_관광지_유사도_최종_결과_refined.csv"), 
+    "REVIEW_SIM_DATA": os.path.join(DATA_DIR, "유사도.csv"),                  
+    "SENTIMENT_DATA": os.path.join(DATA_DIR, "관광지_감상유사도_분석(최종, TF-IDF적용).csv"),                   
+    "FEATURE_DATA": os.path.join(DATA_DIR, "관광지별_키워드_유사도_순위.csv"),
+    "KEYWORD_NOUN": os.path.join(DATA_DIR, "관광지별_키워드50_추출(정제후).csv"),
+    "KEYWORD_ADJ": os.path.join(DATA_DIR, "부산_관광지별_형용사_추출결과.csv"),
+    "CATEGORY_INFO": os.path.join(DATA_DIR, "부산_관광지명.xlsx")
+}
+
+# 정규화된 컬럼형 스냅샷 저장 위치 (snapshot.py 로 생성, 기본은 데이터 폴더 안)
+SNAPSHOT_DIR = os.getenv("SLA_SNAPSHOT_DIR", os.path.join(DATA_DIR, "_snapshot"))
+
+# 관광지 사진 원본 / 크기별 파생 이미지 (renditions.py 로 생성)
+IMAGE_DIR = os.getenv("SLA_IMAGE_DIR", os.path.join(BASE_DIR, "images"))
+RENDITION_DIR = os.path.join(IMAGE_DIR, "_renditions")
+ 
+# 이름 매핑 (별칭 -> 대표 이름, registry.py 가 공백/대소문자를 무시하고 적용)
+NAME_MAPPING = {
+    '광안리SUPZONE': '광안대교sup',
+    '오륙도': '오륙도스카이워크',
+    '다대포낙조분수': '다대포꿈의낙조분수',
+    '용호만부두': '용호만유람선',
+    '용호만유람선부두': '용호만유람선',
+    '을숙도생태공원': '을숙도',
+    '안데르센마을': '안데르센동화마을',
+    '석당박물관': '동아대석당박물관',
+    '부산시립박물관': '부산박물관',
+    '낙동강에코센터': '낙동강하구에코센터'
+}
@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+
+from profiling import timed
+
+# =============================================================================
+# [혼잡도 집계 큐브]
+# main_df(시간 단위 원본)를 (관광지, 연도, 월, 시간대) 축의 합계/건수 배열로 한 번만 집계합니다.
+# 렌더링 시점에는 원본을 다시 필터링하지 않고 이 배열만 슬라이싱합니다.
+# =============================================================================
+VALUE_COL = '실질_㎡당_방문객수'
+N_MONTHS = 12
+N_HOURS = 24
+BASE_HOURS = (np.arange(N_HOURS) >= 9) & (np.arange(N_HOURS) <= 18)
+
+
+def classify_density(val):
+    if val >= 1.2: return "매우혼잡"
+    elif val >= 0.7: return "혼잡"
+    elif val >= 0.3: return "보통"
+    else: return "쾌적"
+
+
+@timed("congestion.build_cube")
+def build_congestion_cube(df):
+    # sums/counts: [spot, year, month, hour] / 평균은 조회 시점에 sums / counts 로 계산 (월·연 단위 합산이 정확하게 유지됨)
+    empty = {'spots': [], 'spot_index': {}, 'years': [], 'year_index': {}, 'hour_labels': {},
+             'sums': np.zeros((0, 0, N_MONTHS, N_HOURS)), 'counts': np.zeros((0, 0, N_MONTHS, N_HOURS))}
+    if df.empty or '시간대_int' not in df.columns: return empty
+
+    hours = pd.to_numeric(df['시간대_int'], errors='coerce').to_numpy()
+    values = pd.to_numeric(df[VALUE_COL], errors='coerce').to_numpy(dtype=np.float64)
+    valid = ~np.isnan(hours) & ~np.isnan(values) & (hours >= 0) & (hours < N_HOURS)
+    if not valid.any(): return empty
+
+    spot_codes, spots = pd.factorize(df['관광지명'].to_numpy()[valid], sort=True)
+    year_codes, years = pd.factorize(df['날짜'].dt.year.to_numpy()[valid], sort=True)
+    month_codes = df['날짜'].dt.month.to_numpy()[valid] - 1
+    hour_codes = hours[valid].astype(np.int64)
+
+    shape = (len(spots), len(years), N_MONTHS, N_HOURS)
+    flat = np.ravel_multi_index((spot_codes, year_codes, month_codes, hour_codes), shape)
+    size = int(np.prod(shape))
+    sums = np.bincount(flat, weights=values[valid], minlength=size).reshape(shape)
+    counts = np.bincount(flat, minlength=size).reshape(shape)
+
+    # 차트 축 라벨은 원본 '시간대' 표기를 그대로 사용
+    hour_labels = {}
+    if '시간대' in df.columns:
+        labels = pd.Series(df['시간대'].astype(str).to_numpy()[valid], index=hour_codes)
+        hour_labels = labels[~labels.index.duplicated()].to_dict()
+
+    spots = [str(s) for s in spots]
+    years = [int(y) for y in years]
+    return {'spots': spots, 'spot_index': {s: i for i, s in enumerate(spots)},
+            'years': years, 'year_index': {y: i for i, y in enumerate(years)},
+            'hour_labels': hour_labels, 'sums': sums, 'counts': counts}
+
+
+def _cube_slice(cube, spot_name, year=None, month=None):
+    # 조건에 해당하는 (sums, counts)를 시간대 축[24]만 남기고 합산
+    s = cube['spot_index'].get(spot_name)
+    if s is None: return None
+    sums, counts = cube['sums'][s], cube['counts'][s]
+    if year is not None:
+        y = cube['year_index'].get(year)
+        if y is None: return None
+        sums, counts = sums[y:y + 1], counts[y:y + 1]
+    if month is not None:
+        sums, counts = sums[:, month - 1:month], counts[:, month - 1:month]
+    return sums.sum(axis=(0, 1)), counts.sum(axis=(0, 1))
+
+
+def hourly_means(cube, spot_name, year=None, month=None):
+    # 시간대별 평균 [24] (데이터가 없는 시간대는 NaN)
+    sl = _cube_slice(cube, spot_name, year, month)
+    if sl is None: return np.full(N_HOURS, np.nan)
+    sums, counts = sl
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def active_means(hourly):
+    # 활동 시간대 평균 (벡터화): hourly[..., 24] -> [...]
+    # 기본 9~18시 중 전체 평균 미만 시간 제외 + 그 외 시간 중 평균 초과 시간 포함, 활동 시간이 없으면 전체 평균
+    present = ~np.isnan(hourly)
+    n_present = present.sum(axis=-1)
+    filled = np.where(present, hourly, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        total_mean = filled.sum(axis=-1) / n_present
+        t = total_mean[..., None]
+        active = present & np.where(BASE_HOURS, ~(hourly < t), hourly > t)
+        n_active = active.sum(axis=-1)
+        active_mean = np.where(active, hourly, 0.0).sum(axis=-1) / n_active
+    return np.where(n_active > 0, active_mean, np.where(n_present > 0, total_mean, np.nan))
+
+
+def active_mean_from_hourly(hourly):
+    final_val = active_means(hourly)
+    if np.isnan(final_val): return 0, "알수없음"
+    return float(final_val), classify_density(final_val)
+
+
+@timed("congestion.active_mean")
+def cube_active_mean(cube, spot_name, year=None, month=None):
+    return active_mean_from_hourly(hourly_means(cube, spot_name, year, month))
+
+
+@timed("congestion.monthly_trend")
+def cube_monthly_trend(cube, spot_name, year):
+    # 연도별 월간 추이 (데이터가 있는 월만)
+    monthly_stats = []
+    for m in range(1, N_MONTHS + 1):
+        hourly = hourly_means(cube, spot_name, year, m)
+        if np.isnan(hourly).all(): continue
+        val, _ = active_mean_from_hourly(hourly)
+        monthly_stats.append({'month': m, 'val': val})
+    return pd.DataFrame(monthly_stats, columns=['month', 'val'])
+
+
+@timed("congestion.hourly_frame")
+def cube_hourly_frame(cube, spot_name, year, month):
+    # 시간대별 차트용 프레임 (기존 groupby(['시간대_int', '시간대']) 결과와 동일한 컬럼 구성)
+    hourly = hourly_means(cube, spot_name, year, month)
+    hours = np.flatnonzero(~np.isnan(hourly))
+    return pd.DataFrame({'시간대_int': hours, '시간대': [cube['hour_labels'].get(h, f"{h}시") for h in hours], VALUE_COL: hourly[hours]})
+
+
+@timed("congestion.ranking_table")
+def build_ranking_table(cube, year):
+    # 해당 연도 전체 관광지 순위표 (한 번의 NumPy 연산으로 전 관광지 활동 시간대 평균 산출)
+    # index=관광지명 이므로 순위/백분위 조회는 .loc 한 번 (O(1))
+    columns = ['val', 'rank', 'total', 'top_percent']
+    y = cube['year_index'].get(year)
+    if y is None: return pd.DataFrame(columns=columns)
+    sums = cube['sums'][:, y].sum(axis=1)
+    counts = cube['counts'][:, y].sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        hourly = np.where(counts > 0, sums / counts, np.nan)
+    has_data = counts.sum(axis=1) > 0
+    if not has_data.any(): return pd.DataFrame(columns=columns)
+
+    vals = active_means(hourly[has_data])
+    spots = np.asarray(cube['spots'], dtype=object)[has_data]
+    order = np.argsort(-vals, kind='stable')
+    total = len(order)
+    rank = np.arange(1, total + 1)
+    return pd.DataFrame({'val': vals[order], 'rank': rank, 'total': total, 'top_percent': rank / total * 100},
+                        index=pd.Index(spots[order], name='spot'))
@@ -0,0 +1,223 @@
+import os
+import sys
+import threading
+import time
+from functools import lru_cache
+
+from config import FILE_CONFIG
+from congestion import build_congestion_cube, build_ranking_table
+from metrics import observe_data_reload
+from profiling import timed, cached
+from registry import build_registry, category_map
+from renditions import read_manifest as read_renditions, publish as publish_renditions, source_stems, build_asset_index
+from similarity import (build_similarity, pair_names, make_recommender, make_cross_category, build_image_ranks,
+                        build_pair_keywords, SENTIMENT_KEYWORD_COLS, FEATURE_KEYWORD_COLS)
+from snapshot import (read_manifest, load_snapshot_table, normalize_table, read_source, source_stat, source_digest,
+                      write_snapshot_table)
+
+# =============================================================================
+# [데이터 버전 감시]
+# FILE_CONFIG 원본 표와 그 파생 구조(레지스트리/유사도 텐서/혼잡도 큐브/인덱스 등)를 하나의 묶음(bundle)으로 보관합니다.
+# 백그라운드 스레드가 SLA_DATA_POLL_SECONDS 마다 원본을 확인(크기/수정시각이 바뀐 파일만 sha256)하고,
+# 내용이 바뀐 표만 다시 읽어 스냅샷에 반영한 뒤 그 표에 의존하는 파생 구조만 새로 만들어 묶음을 통째로 교체합니다.
+#   current()  -> 지금 묶음 (리런 시작 시 1번 잡아 두면 교체 중에도 그 리런은 이전 버전으로 끝까지 렌더링)
+#   교체 전까지는 이전 묶음이 계속 서빙되며, 재생성이 실패하면 이전 묶음을 유지하고 파일이 다시 바뀔 때 재시도합니다.
+#   SLA_DATA_POLL_SECONDS=0 -> 감시 끔 (시작 시 1회 로드만)
+# =============================================================================
+POLL_SECONDS = float(os.getenv("SLA_DATA_POLL_SECONDS", "30"))
+
+# 파생 구조: 이름 -> (의존 대상[FILE_CONFIG 키 또는 앞서 정의된 파생 이름], 생성 함수(bundle))
+# 정의 순서대로 만들어지므로 의존 대상이 먼저 와야 합니다.
+DERIVED = {}
+
+
+def derived(name, *deps):
+    def wrap(fn):
+        DERIVED[name] = (deps, fn)
+        return fn
+    return wrap
+
+
+SIM_TABLES = ("IMG_MATRIX_DATA", "SENTIMENT_DATA", "FEATURE_DATA")
+
+
+@derived('spots', *SIM_TABLES, "CATEGORY_INFO")
+def _spots(b):
+    # 카탈로그(CATEGORY_INFO) + 유사도 표 관광지 -> 대표 이름/ID/별칭/지역구/카테고리/이미지 키
+    return build_registry(*pair_names(*(b['tables'][k] for k in SIM_TABLES)), catalog=b['tables']["CATEGORY_INFO"],
+                          assets=source_stems())
+
+
+@derived('category_map', 'spots')
+def _category_map(b):
+    return category_map(b['spots'])
+
+
+@derived('similarity', *SIM_TABLES, 'spots')
+def _similarity(b):
+    return build_similarity(*(b['tables'][k] for k in SIM_TABLES), b['spots'])
+
+
+@derived('recommend', 'similarity', 'category_map')
+def _recommend(b):
+    return make_recommender(b['similarity'], b['category_map'])
+
+
+@derived('cross_category', 'similarity', 'category_map')
+def _cross_category(b):
+    return make_cross_category(b['similarity'], b['category_map'])
+
+
+@derived('congestion_cube', "MAIN_DATA")
+def _congestion_cube(b):
+    return build_congestion_cube(b['tables']["MAIN_DATA"])
+
+
+@derived('district_spots', "MAIN_DATA")
+def _district_spots(b):
+    # 사이드바 메뉴: {행정구: [관광지명, ...]} (이름순, 리런마다 MAIN_DATA 를 스캔하지 않음)
+    df = b['tables']["MAIN_DATA"]
+    if df.empty or not {'행정구', '관광지명'} <= set(df.columns): return {}
+    pairs = df[['행정구', '관광지명']].drop_duplicates().dropna()
+    return {gu: sorted(pairs.loc[pairs['행정구'] == gu, '관광지명'].astype(str)) for gu in sorted(pairs['행정구'].astype(str).unique())}
+
+
+@derived('ranking', 'congestion_cube')
+def _ranking(b):
+    # 연도 -> 전체 관광지 순위표 (큐브가 바뀌면 함수째 새로 만들어지므로 이전 데이터 순위가 남지 않음)
+    cube = b['congestion_cube']
+
+    @cached("load.ranking_table", lru_cache(maxsize=16))
+    def ranking(year):
+        return build_ranking_table(cube, year)
+    return ranking
+
+
+@derived('image_ranks', "IMG_RANK_DATA", 'spots')
+def _image_ranks(b):
+    return build_image_ranks(b['tables']["IMG_RANK_DATA"], b['spots'])
+
+
+@derived('pair_keywords', "SENTIMENT_DATA", "FEATURE_DATA", 'spots')
+def _pair_keywords(b):
+    return (build_pair_keywords(b['tables']["SENTIMENT_DATA"], SENTIMENT_KEYWORD_COLS, b['spots']),
+            build_pair_keywords(b['tables']["FEATURE_DATA"], FEATURE_KEYWORD_COLS, b['spots']))
+
+
+@derived('image_index', 'spots')
+def _image_index(b):
+    manifest = read_renditions()
+    publish_renditions(manifest)  # SLA_STATIC_DIR 이 없으면 아무것도 하지 않음
+    return build_asset_index(b['spots'], manifest)  # spot_id 키
+
+
+# -----------------------------------------------------------------------------
+# 로드 / 재생성
+# -----------------------------------------------------------------------------
+_state = {'bundle': None, 'stats': {}}
+_lock = threading.Lock()
+_watcher = [None]
+
+
+def _digest(key, stat, manifest=None):
+    # manifest 를 주면 스냅샷 기록 당시와 크기/수정시각이 같은 원본은 해시 계산 생략 (첫 로드)
+    return source_digest(key, manifest, stat) if stat else None
+
+
+def _load(key, manifest, digest, strict=False):
+    # 스냅샷 해시가 원본과 같으면 스냅샷(mmap), 아니면 원본 파싱 후 스냅샷 갱신 (쓰기 실패 시 메모리 표만 사용)
+    # strict(갱신 시): 원본 파일이 있는데 읽은 표가 비었으면 저장 중이거나 깨진 파일로 보고 실패 처리
+    entry = (manifest or {}).get('tables', {}).get(key)
+    if entry is not None and (digest is None or entry['sha256'] == digest):
+        df = load_snapshot_table(key, manifest, verify=False)
+        if df is not None: return df
+    df = normalize_table(key, read_source(FILE_CONFIG[key]))
+    if strict and digest is not None and df.empty: raise ValueError(f"{key}: 원본을 읽을 수 없거나 빈 표")
+    if digest is not None:
+        try: write_snapshot_table(key, df)
+        except OSError: pass
+    return df
+
+
+def _build(old, changed, digests):
+    # changed 표와 그에 의존하는 파생 구조만 새로 만들고 나머지는 이전 묶음의 객체를 그대로 재사용
+    manifest = read_manifest()
+    tables = dict(old['tables']) if old else {}
+    for key in changed:
+        with timed(f"load.table.{key}"):
+            tables[key] = _load(key, manifest, digests[key], strict=old is not None)
+    bundle = {'generation': (old['generation'] + 1) if old else 1, 'loaded': time.time(),
+              'version': {**(old['version'] if old else {}), **{k: digests[k] for k in changed}},
+              'changed': sorted(changed), 'tables': tables}
+    dirty = set(changed)
+    for name, (deps, fn) in DERIVED.items():
+        if old is None or dirty & set(deps):
+            with timed(f"load.{name}"):
+                bundle[name] = fn(bundle)
+            dirty.add(name)
+        else: bundle[name] = old[name]
+    bundle['rebuilt'] = sorted(dirty - set(changed))
+    return bundle
+
+
+def load():
+    # 첫 묶음 (스레드 간 동시 호출 시 1번만 생성)
+    with _lock:
+        if _state['bundle'] is None:
+            stats = {key: source_stat(key) for key in FILE_CONFIG}
+            manifest = read_manifest()
+            digests = {key: _digest(key, stats[key], manifest) for key in FILE_CONFIG}
+            with timed("data.load"):
+                _state['bundle'] = _build(None, list(FILE_CONFIG), digests)
+            _state['stats'] = stats
+            observe_data_reload(1)
+        return _state['bundle']
+
+
+def current():
+    return _state['bundle'] or load()
+
+
+def check():
+    # 원본이 바뀌었으면 재생성 후 교체. 반환: 새 묶음 (바뀐 것이 없거나 실패하면 None)
+    old = current()
+    stats = {key: source_stat(key) for key in FILE_CONFIG}
+    touched = [k for k in FILE_CONFIG if stats[k] != _state['stats'].get(k)]
+    if not touched: return None
+    digests = {k: _digest(k, stats[k]) for k in touched}
+    changed = [k for k in touched if digests[k] != old['version'].get(k)]
+    if not changed:
+        _state['stats'] = stats  # 내용은 그대로 (touch 등)
+        return None
+    try:
+        with timed("data.reload"):
+            bundle = _build(old, changed, {**old['version'], **digests})
+    except Exception as e:
+        # 이전 묶음 유지, 같은 파일 상태로는 다시 시도하지 않음 (파일이 또 바뀌면 이전 버전과 비교해 재시도)
+        _state['stats'] = stats
+        observe_data_reload(old['generation'], ok=False)
+        print(f"[데이터 갱신 실패] {', '.join(changed)}: {e!r} (이전 버전 유지)", file=sys.stderr)
+        return None
+    with _lock:
+        _state['bundle'], _state['stats'] = bundle, stats
+    observe_data_reload(bundle['generation'])
+    print(f"[데이터 갱신] #{bundle['generation']} 표 {', '.join(bundle['changed'])} -> 파생 {', '.join(bundle['rebuilt'])}",
+          file=sys.stderr)
+    return bundle
+
+
+def _watch(poll_seconds):
+    while True:
+        time.sleep(poll_seconds)
+        try: check()
+        except Exception as e: print(f"[데이터 감시 오류] {e!r}", file=sys.stderr)
+
+
+def start(poll_seconds=POLL_SECONDS):
+    # 첫 묶음을 만들고 감시 스레드 시작 (프로세스당 1회)
+    load()
+    with _lock:
+        if _watcher[0] is None and poll_seconds > 0:
+            _watcher[0] = threading.Thread(target=_watch, args=(poll_seconds,), name="sla-data-watch", daemon=True)
+            _watcher[0].start()
+    return current
@@ -0,0 +1,59 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from llm import rate_limited
+
+# =============================================================================
+# [백그라운드 LLM 작업]
+# 렌더링 중에 네트워크 응답을 기다리지 않도록 generate_* 호출을 스레드 풀에서 실행합니다.
+# 같은 key 의 작업이 진행 중이면 새로 실행하지 않고 기존 Future 를 돌려줍니다. (세션 간 중복 호출 병합)
+#   LLM_JOB_WORKERS        화면 표시용 작업 동시 실행 수
+#   LLM_PREFETCH_WORKERS   리포트 프리페치 동시 실행 수 (전 세션 합산, 화면 표시용 풀과 분리)
+# =============================================================================
+LLM_JOB_WORKERS = int(os.getenv("LLM_JOB_WORKERS", "4"))
+LLM_PREFETCH_WORKERS = int(os.getenv("LLM_PREFETCH_WORKERS", "3"))
+
+_pools = {}
+_inflight = {}
+_lock = threading.Lock()
+
+
+def get_executor(name="llm", workers=LLM_JOB_WORKERS):
+    with _lock:
+        if name not in _pools:
+            _pools[name] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{name}-job")
+        return _pools[name]
+
+
+def _submit(executor, key, fn, args):
+    with _lock:
+        fut = _inflight.get(key)
+        if fut is not None: return fut
+        fut = executor.submit(fn, *args)
+        _inflight[key] = fut
+    fut.add_done_callback(lambda f: _forget(key, f))
+    return fut
+
+
+def submit_job(key, fn, *args):
+    return _submit(get_executor(), key, fn, args)
+
+
+def _forget(key, fut):
+    # 완료된 작업은 목록에서 제거 (결과는 각 세션과 공유 캐시에 남음)
+    with _lock:
+        if _inflight.get(key) is fut: del _inflight[key]
+
+
+def _prefetch_call(fn, args):
+    # 레이트 리밋 대기 중이면 보내지 않음 (나중에 버튼 클릭 시 정상 호출됨)
+    if rate_limited(): return None
+    return fn(*args)
+
+
+def prefetch(calls):
+    # [(generate_*, args)] 를 전용 풀에서 동시에 실행하여 공유 응답 캐시를 채움
+    # 이미 캐시된 프롬프트는 네트워크 호출 없이 끝나고, 같은 프롬프트의 진행 중 작업은 병합됨
+    executor = get_executor("prefetch", LLM_PREFETCH_WORKERS)
+    return [_submit(executor, ("prefetch", fn.__name__, repr(args)), _prefetch_call, (fn, args)) for fn, args in calls]
@@ -0,0 +1,259 @@
+import os
+import threading
+import time
+
+import httpx
+from openai import OpenAI, RateLimitError, APITimeoutError, APIConnectionError, InternalServerError
+
+from llm_cache import prompt_key, cache_get, cache_put
+from metrics import observe_tokens
+from profiling import timed, count
+from prompts import count_tokens
+from ratelimit import TokenBucket, CircuitBreaker, backoff_delay
+from stub_llm import LatencyProfile, stream_reply, complete_reply
+
+# =============================================================================
+# [LLM 클라이언트]
+# 프로세스 전체에서 OpenAI 클라이언트 1개를 공유합니다. (커넥션 풀 + HTTP keep-alive)
+# 호출마다 OpenAI(...) 를 새로 만들면 TLS 핸드셰이크/커넥션 생성 비용을 매번 지불하게 됩니다.
+# 환경변수로 조정:
+#   OPENAI_BASE_URL          OpenAI 호환 서버 주소 (로컬 스텁 서버 테스트용)
+#   OPENAI_TIMEOUT           전체 요청 타임아웃(초)
+#   OPENAI_CONNECT_TIMEOUT   연결 타임아웃(초)
+#   OPENAI_MAX_CONNECTIONS   최대 동시 연결 수
+#   OPENAI_MAX_KEEPALIVE     유지할 유휴 연결 수
+#   OPENAI_MAX_RETRIES       SDK 자체 재시도 횟수 (기본 0: 재시도는 아래 공유 리미터가 담당)
+#   LLM_RPM / LLM_TPM        분당 요청 수 / 분당 토큰 수 상한 (전 세션 공유 토큰 버킷)
+#   LLM_MAX_ATTEMPTS         429·타임아웃·연결 오류·5xx 시 지터 포함 지수 백오프 재시도 횟수
+#   LLM_BREAKER_THRESHOLD    연속 실패 몇 번에 서킷을 열지
+#   LLM_BREAKER_COOLDOWN     서킷이 열려 있는 시간(초), 그동안은 캐시된 응답만 제공
+#   LLM_BACKEND              openai(기본) | stub (프로세스 내 결정적 응답, 부하 테스트용)
+# =============================================================================
+LLM_MODEL = "gpt-4o-mini"
+
+LLM_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+LLM_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "10"))
+LLM_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "0"))
+LLM_RATE_LIMIT_COOLDOWN = 20.0
+
+LLM_RPM = int(os.getenv("LLM_RPM", "300"))
+LLM_TPM = int(os.getenv("LLM_TPM", "150000"))
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "4"))
+LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+LLM_BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+LLM_OUTPUT_TOKEN_ESTIMATE = 1000  # 응답 토큰 예상치 (TPM 선차감용)
+LLM_QUEUE_TIMEOUT = 30.0          # 리미터 대기 상한(초)
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+
+request_bucket = TokenBucket(LLM_RPM)
+token_bucket = TokenBucket(LLM_TPM)
+breaker = CircuitBreaker(LLM_BREAKER_THRESHOLD, LLM_BREAKER_COOLDOWN)
+
+_client = None
+_client_lock = threading.Lock()
+_rate_limited_until = 0.0
+
+
+def create_client(api_key=None, base_url=None):
+    timeout = httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT)
+    http_client = httpx.Client(
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=LLM_MAX_CONNECTIONS,
+                            max_keepalive_connections=LLM_MAX_KEEPALIVE,
+                            keepalive_expiry=60),
+    )
+    base_url = base_url or os.getenv("OPENAI_BASE_URL") or None
+    # 키 없는 로컬 호환 서버: SDK 는 키가 비어 있으면 생성을 거부하므로 자리표시 값 사용
+    api_key = api_key or os.getenv("OPENAI_API_KEY") or ("no-key" if base_url else None)
+    return OpenAI(api_key=api_key, base_url=base_url,
+                  timeout=timeout, max_retries=LLM_MAX_RETRIES, http_client=http_client)
+
+
+def get_client():
+    # 최초 호출 시 1회 생성 (스레드 안전), 이후 모든 세션이 같은 커넥션 풀을 공유
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_client()
+    return _client
+
+
+def reset_client():
+    # 설정 변경/테스트 시 풀을 닫고 다음 호출에서 다시 생성
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+
+
+# -----------------------------------------------------------------------------
+# 백엔드: complete() -> 전체 텍스트, stream() -> 텍스트 조각 이터레이터
+# stream() 은 요청을 즉시 보내고(실패는 호출 시점에 발생) 조각 이터레이터를 반환해야 함
+# -----------------------------------------------------------------------------
+class OpenAIBackend:
+    name = "openai"
+
+    def cache_scope(self):
+        base_url = os.getenv("OPENAI_BASE_URL")
+        return f"{self.name}@{base_url}" if base_url else self.name
+
+    def available(self):
+        # 실제 API 는 키 필요, OPENAI_BASE_URL 로컬 호환 서버는 키 없이 허용
+        return bool(os.getenv("OPENAI_API_KEY") or os.getenv("OPENAI_BASE_URL"))
+
+    def complete(self, model, messages, temperature):
+        response = get_client().chat.completions.create(model=model, messages=messages, temperature=temperature)
+        return response.choices[0].message.content
+
+    def stream(self, model, messages, temperature):
+        return _deltas(get_client().chat.completions.create(model=model, messages=messages, temperature=temperature, stream=True))
+
+
+def _deltas(stream):
+    try:
+        for chunk in stream:
+            if not chunk.choices: continue
+            delta = chunk.choices[0].delta.content
+            if delta: yield delta
+    finally:
+        stream.close()
+
+
+class StubBackend:
+    # 네트워크 없이 stub_llm 과 같은 결정적 응답/지연을 흉내 냄
+    name = "stub"
+
+    def __init__(self, profile=None):
+        self.profile = profile or LatencyProfile.from_env()
+
+    def cache_scope(self):
+        return self.name
+
+    def available(self):
+        return True
+
+    def complete(self, model, messages, temperature):
+        return complete_reply(messages, self.profile)
+
+    def stream(self, model, messages, temperature):
+        return stream_reply(messages, self.profile)
+
+
+BACKENDS = {"openai": OpenAIBackend, "stub": StubBackend}
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _client_lock:
+            if _backend is None:
+                _backend = BACKENDS[os.getenv("LLM_BACKEND", "openai")]()
+    return _backend
+
+
+def backend_available():
+    # 선택된 백엔드로 호출할 수 있는지 (API 키 누락 안내용)
+    return get_backend().available()
+
+
+def set_backend(backend):
+    # 벤치마크/테스트에서 백엔드 교체 (None 이면 다음 호출에서 LLM_BACKEND 로 다시 생성)
+    global _backend
+    with _client_lock:
+        _backend = backend
+
+
+class LLMUnavailable(Exception):
+    # 서킷이 열려 있거나 리미터 대기 시간을 넘겨 호출하지 않은 경우
+    pass
+
+
+def rate_limited():
+    # 서킷이 열려 있거나 최근 429 의 Retry-After 가 아직 지나지 않았는지 (프리페치 등 선택적 호출이 참고)
+    return breaker.is_open() or time.time() < _rate_limited_until
+
+
+def _retry_after(e):
+    response = getattr(e, "response", None)
+    if response is None: return None
+    try: return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError): return None
+
+
+def prompt_tokens(messages):
+    return sum(count_tokens(m["content"]) for m in messages)
+
+
+def _call(method, model, messages, temperature):
+    # 서킷 확인 -> RPM/TPM 버킷 대기 -> backend.complete/stream, 일시적 오류는 지터 백오프로 재시도
+    global _rate_limited_until
+    if not breaker.allow(): raise LLMUnavailable("circuit open")
+    tokens = prompt_tokens(messages) + LLM_OUTPUT_TOKEN_ESTIMATE
+    for attempt in range(LLM_MAX_ATTEMPTS):
+        if not (request_bucket.acquire(1, LLM_QUEUE_TIMEOUT) and token_bucket.acquire(tokens, LLM_QUEUE_TIMEOUT)):
+            breaker.record_failure()
+            raise LLMUnavailable("rate limiter queue timeout")
+        try:
+            result = getattr(get_backend(), method)(model, messages, temperature)
+        except RETRYABLE_ERRORS as e:
+            retry_after = _retry_after(e)
+            if isinstance(e, RateLimitError):
+                _rate_limited_until = max(_rate_limited_until, time.time() + (retry_after or LLM_RATE_LIMIT_COOLDOWN))
+            if attempt == LLM_MAX_ATTEMPTS - 1:
+                breaker.record_failure()
+                raise
+            time.sleep(backoff_delay(attempt, retry_after=retry_after))
+        except Exception:
+            breaker.record_failure()
+            raise
+        else:
+            breaker.record_success()
+            return result
+
+
+@timed("llm.complete")
+def chat_completion(messages, temperature=0.3, model=LLM_MODEL, use_cache=True):
+    # 공유 캐시 확인 -> 미스일 때만 API 호출. 예외(실패)는 그대로 올려 보내며 캐시에 저장하지 않음
+    key = prompt_key(model, messages, temperature, get_backend().cache_scope())
+    if use_cache:
+        cached = cache_get(key)
+        count("llm.response_cache", cached is not None)
+        if cached is not None: return cached
+    content = _call("complete", model, messages, temperature)
+    observe_tokens(prompt_tokens(messages), count_tokens(content or ""))
+    if use_cache and content:
+        cache_put(key, model, content)
+    return content
+
+
+@timed("llm.stream")
+def chat_completion_stream(messages, temperature=0.3, model=LLM_MODEL, use_cache=True):
+    # 토큰 스트리밍: 캐시 적중 시 전체 텍스트를 한 번에, 미스면 델타를 도착 즉시 내보냄
+    # 스트림이 끝까지 정상 완료된 경우에만 전체 텍스트를 캐시에 저장 (중단/실패 시 저장하지 않음)
+    key = prompt_key(model, messages, temperature, get_backend().cache_scope())
+    if use_cache:
+        cached = cache_get(key)
+        count("llm.response_cache", cached is not None)
+        if cached is not None:
+            yield cached
+            return
+    parts = []
+    stream = _call("stream", model, messages, temperature)
+    try:
+        for delta in stream:
+            parts.append(delta)
+            yield delta
+    except Exception:
+        breaker.record_failure()
+        raise
+    finally:
+        if hasattr(stream, "close"): stream.close()
+    content = "".join(parts)
+    observe_tokens(prompt_tokens(messages), count_tokens(content))
+    if use_cache and content:
+        cache_put(key, model, content)
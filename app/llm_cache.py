@@ -0,0 +1,134 @@
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from config import BASE_DIR
+
+# =============================================================================
+# [LLM 응답 캐시]
+# 세션/워커/재시작과 무관하게 공유되는 SQLite 캐시. 키 = sha256(model, system, user, temperature, 백엔드)
+# 같은 관광지의 ABOUT 텍스트나 같은 연도 리포트는 첫 방문자 이후로 네트워크 호출 없이 반환됩니다.
+#   LLM_CACHE_PATH       캐시 파일 경로
+#   LLM_CACHE_TTL        유효 기간(초), 기본 30일
+#   LLM_CACHE_MAX_BYTES  응답 본문 총량 상한, 초과 시 오래 쓰이지 않은 항목부터 삭제
+# 연결은 스레드마다 1개를 재사용하고(스키마/WAL 설정은 파일당 1회), 끝난 스레드의 연결과 종료 시 남은 연결은 닫습니다.
+# =============================================================================
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(BASE_DIR, "cache", "llm_cache.sqlite3"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(30 * 24 * 3600)))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key      TEXT PRIMARY KEY,
+    model    TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size     INTEGER NOT NULL,
+    created  REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed);
+"""
+
+
+def prompt_key(model, messages, temperature, scope="openai"):
+    # system/user 프롬프트는 messages 안에 포함 (역할 순서 그대로 해시)
+    # scope: 응답을 만든 백엔드/서버 (스텁이나 로컬 서버 응답이 실제 API 응답 자리를 차지하지 않도록 구분)
+    payload = json.dumps([model, messages, temperature, scope], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+_local = threading.local()
+_open = []          # [(스레드, 연결)] - 스레드가 끝났거나 프로세스 종료 시 닫음
+_ready = set()      # 스키마/WAL 설정을 마친 캐시 파일
+_epoch = [0]        # close_all 때마다 증가 -> 스레드에 남은 이전 연결은 다시 열림
+_open_lock = threading.Lock()
+
+
+def _connect(path=None):
+    # 이 스레드의 연결 (없으면 생성). 닫힌 연결(close_all 이후)은 새로 엶
+    path = path or LLM_CACHE_PATH
+    conns = _local.__dict__.setdefault('conns', {})
+    epoch, conn = conns.get(path, (None, None))
+    if epoch == _epoch[0]: return conn
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # 끝난 스레드의 연결을 다른 스레드가 닫을 수 있도록 check_same_thread=False (사용은 만든 스레드에서만)
+    conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+    try:
+        with _open_lock:
+            if path not in _ready:
+                conn.execute("PRAGMA journal_mode=WAL")  # 파일에 유지되는 설정
+                conn.executescript(_SCHEMA)
+                _ready.add(path)
+            _reap()
+            _open.append((threading.current_thread(), conn))
+            conns[path] = (_epoch[0], conn)
+    except sqlite3.Error:
+        conn.close()
+        raise
+    return conn
+
+
+def _reap():
+    # _open_lock 안에서 호출: 끝난 스레드(리런/작업 스레드)의 연결 닫기
+    alive = []
+    for thread, conn in _open:
+        if thread.is_alive(): alive.append((thread, conn))
+        else: conn.close()
+    _open[:] = alive
+
+
+@atexit.register
+def close_all():
+    with _open_lock:
+        for _, conn in _open: conn.close()
+        _open.clear()
+        _epoch[0] += 1
+
+
+def cache_get(key, path=None):
+    try:
+        with _connect(path) as conn:
+            row = conn.execute("SELECT response, created FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None: return None
+            response, created = row
+            now = time.time()
+            if now - created > LLM_CACHE_TTL:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE llm_cache SET accessed = ? WHERE key = ?", (now, key))
+            return response
+    except (sqlite3.Error, OSError):
+        # 캐시 장애(DB 오류, 캐시 폴더 생성 실패 등)는 응답 생성을 막지 않음
+        return None
+
+
+def cache_put(key, model, response, path=None):
+    now = time.time()
+    try:
+        with _connect(path) as conn:
+            conn.execute("INSERT OR REPLACE INTO llm_cache (key, model, response, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                         (key, model, response, len(response.encode('utf-8')), now, now))
+            _evict(conn, now)
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def _evict(conn, now):
+    conn.execute("DELETE FROM llm_cache WHERE created < ?", (now - LLM_CACHE_TTL,))
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+    if total <= LLM_CACHE_MAX_BYTES: return
+    # 오래 쓰이지 않은 순서로 상한 이하가 될 때까지 삭제
+    excess = total - LLM_CACHE_MAX_BYTES
+    for key, size in conn.execute("SELECT key, size FROM llm_cache ORDER BY accessed").fetchall():
+        conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+        excess -= size
+        if excess <= 0: break
+
+
+def cache_clear(path=None):
+    with _connect(path) as conn:
+        conn.execute("DELETE FROM llm_cache")
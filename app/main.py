@@ -1,52 +1,51 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import pandas as pd
 import plotly.express as px
-from openai import OpenAI
 import os
-import re
-import numpy as np
+import html
 import textwrap
+from collections import deque
 from dotenv import load_dotenv
-
-# =============================================================================
-# [설정] 파일명 매핑
-# =============================================================================
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+from congestion import (classify_density, cube_active_mean,
+                        cube_monthly_trend, cube_hourly_frame, VALUE_COL)
+from config import BASE_DIR
+from datastore import start as start_data_store
+from jobs import submit_job, prefetch
+from llm import backend_available
+from metrics import start_server as start_metrics_server, touch_session
+from profiling import (timed, cached, start_run, finish_run, totals, section_rows, cache_rows, to_jsonl,
+                       PROFILE_HISTORY)
+from prompts import summarize_series
+from reports import (ReportUnavailable, unavailable, generate_spot_info_ai, generate_visual_rank1_analysis, generate_strategic_analysis,
+                     generate_weighted_insight, generate_section_analysis)
+from registry import spot_id
+from renditions import asset_for, STATIC_URL
+from similarity import (recommendations_frame, image_candidates, pair_keywords,
+                        SENTIMENT_KEYWORD_COLS, FEATURE_KEYWORD_COLS)
 
 # dotenv_path = os.path.join(BASE_DIR, ".env")
 # load_dotenv(dotenv_path)
-api_key = os.getenv("OPENAI_API_KEY")
-if not api_key:
+if not backend_available():
     st.error("API Key를 찾을 수 없습니다. 설정 확인이 필요합니다.")
-FILE_CONFIG = {
-    "MAIN_DATA": os.path.join(BASE_DIR, "data", "관광지_혼잡도_찐최종결과물.csv"),
-    "PRED_DATA": os.path.join(BASE_DIR, "data", "AI_예측_결과.csv"),
-    "IMG_RANK_DATA": os.path.join(BASE_DIR, "data", "관광지_별_유사도_순위_refined.csv"), 
-    "IMG_MATRIX_DATA": os.path.join(BASE_DIR, "data", "부산_관광지_유사도_최종_결과_refined.csv"), 
-    "REVIEW_SIM_DATA": os.path.join(BASE_DIR, "data", "유사도.csv"),                  
-    "SENTIMENT_DATA": os.path.join(BASE_DIR, "data", "관광지_감상유사도_분석(최종, TF-IDF적용).csv"),                   
-    "FEATURE_DATA": os.path.join(BASE_DIR, "data", "관광지별_키워드_유사도_순위.csv"),
-    "KEYWORD_NOUN": os.path.join(BASE_DIR, "data", "관광지별_키워드50_추출(정제후).csv"),
-    "KEYWORD_ADJ": os.path.join(BASE_DIR, "data", "부산_관광지별_형용사_추출결과.csv"),
-    "CATEGORY_INFO": os.path.join(BASE_DIR, "data", "부산_관광지명.xlsx")
-}
- 
-# 이름 매핑
-NAME_MAPPING = {
-    '광안리SUPZONE': '광안대교sup',
-    '오륙도': '오륙도스카이워크',
-    '다대포낙조분수': '다대포꿈의낙조분수',
-    '용호만부두': '용호만유람선',
-    '을숙도생태공원': '을숙도',
-    '안데르센마을': '안데르센동화마을',
-    '석당박물관': '동아대석당박물관',
-    '부산시립박물관': '부산박물관',
-    '낙동강에코센터': '낙동강하구에코센터'
-}
 
 # 1. 페이지 설정
 st.set_page_config(layout="wide", page_title="SLA PROJECT", page_icon="⚫")
 
+# [계측] 이번 리런의 구간별 소요 시간 / 캐시 적중·미스 기록 시작 (관리자 패널: SLA_ADMIN=1)
+ADMIN_MODE = os.getenv("SLA_ADMIN", "0") == "1"
+PROFILE_RUNS = st.session_state.setdefault('profile_runs', deque(maxlen=PROFILE_HISTORY))
+start_run(PROFILE_RUNS, spot=st.session_state.get('selected_spot'))
+
+# [메트릭] Prometheus /metrics 사이드카 (SLA_METRICS_PORT, 프로세스당 1회) + 세션 활동 기록
+@st.cache_resource
+def get_metrics_server():
+    return start_metrics_server()
+
+get_metrics_server()
+_ctx = get_script_run_ctx()
+if _ctx is not None: touch_session(_ctx.session_id)
+
 # -----------------------------------------------------------------------------
 # 2. [디자인] CSS 스타일링
 # -----------------------------------------------------------------------------
@@ -63,176 +62,64 @@ local_css("style.css")
 # -----------------------------------------------------------------------------
 # 3. [데이터 로드]
 # -----------------------------------------------------------------------------
-@st.cache_data
-def load_data_smart(file_path):
-    if os.path.exists(file_path):
-        try: return pd.read_csv(file_path, encoding='utf-8-sig')
-        except: 
-            try: return pd.read_csv(file_path, encoding='cp949')
-            except: pass
-    xlsx_path = file_path.replace('.csv', '.xlsx').strip()
-    if os.path.exists(xlsx_path):
-        try: return pd.read_excel(xlsx_path)
-        except: pass
-    return pd.DataFrame()
-
-
-@st.cache_data
-def get_category_map():
-    cat_df = load_data_smart(FILE_CONFIG["CATEGORY_INFO"])
-    if cat_df.empty: return {}
-    cat_df.columns = cat_df.columns.str.strip()
-    if '관광지명' in cat_df.columns and '카테고리' in cat_df.columns:
-        cat_df['관광지명'] = cat_df['관광지명'].astype(str).str.strip().replace(NAME_MAPPING)
-        cat_df['카테고리'] = cat_df['카테고리'].astype(str).str.strip()
-        return dict(zip(cat_df['관광지명'], cat_df['카테고리']))
-    return {}
-
-CATEGORY_MAP = get_category_map()
-
-@st.cache_data
-def get_scaled_data():
-    df_vis = load_data_smart(FILE_CONFIG["IMG_MATRIX_DATA"])
-    df_sen = load_data_smart(FILE_CONFIG["SENTIMENT_DATA"])
-    df_fea = load_data_smart(FILE_CONFIG["FEATURE_DATA"])
-    
-    if not df_fea.empty:
-        df_fea['기준_관광지'] = df_fea['기준_관광지'].astype(str).str.strip().replace(NAME_MAPPING)
-        df_fea['비교_대상'] = df_fea['비교_대상'].astype(str).str.strip().replace(NAME_MAPPING)
-
-    if not df_sen.empty:
-        df_sen['기준_관광지'] = df_sen['기준_관광지'].astype(str).str.strip().replace(NAME_MAPPING)
-        df_sen['비교_대상'] = df_sen['비교_대상'].astype(str).str.strip().replace(NAME_MAPPING)
-
-    vis_long = pd.DataFrame()
-    if not df_vis.empty:
-        df_vis.columns = df_vis.columns.str.strip()
-        if df_vis.columns[0] == '관광지명':
-            df_vis['관광지명'] = df_vis['관광지명'].astype(str).str.strip().replace(NAME_MAPPING)
-        
-        vis_long = df_vis.set_index(df_vis.columns[0]).stack().reset_index()
-        vis_long.columns = ['기준_관광지', '비교_대상', 'VIS_RAW']
-        vis_long['기준_관광지'] = vis_long['기준_관광지'].astype(str).str.strip().replace(NAME_MAPPING)
-        vis_long['비교_대상'] = vis_long['비교_대상'].astype(str).str.strip().replace(NAME_MAPPING)
-        
-        v_min, v_max = vis_long['VIS_RAW'].min(), vis_long['VIS_RAW'].max()
-        vis_long['VIS_SCALED'] = (vis_long['VIS_RAW'] - v_min) / (v_max - v_min + 1e-9)
+# [데이터 묶음] 원본 표 + 파생 구조(레지스트리/유사도 텐서/혼잡도 큐브/인덱스)를 datastore.py 가 1회 만들고 워커 내 모든 세션이 공유
+# 원본 CSV 가 바뀌면 백그라운드에서 바뀐 표와 그 파생 구조만 다시 만들어 통째로 교체 (SLA_DATA_POLL_SECONDS)
+# 리런 시작 시 묶음을 1번 잡아 두므로 교체가 일어나도 이번 리런은 같은 버전으로 끝까지 렌더링됩니다.
+# 표는 정규화 스냅샷(mmap)을 공유하므로 호출부에서 원본을 수정하지 않습니다.
+@cached("load.data_store", st.cache_resource)
+def get_data_store():
+    return start_data_store()
+
+DATA = get_data_store()()
 
-    if not df_sen.empty and 'SBERT_유사도(가중적용)' in df_sen.columns:
-        s_min, s_max = df_sen['SBERT_유사도(가중적용)'].min(), df_sen['SBERT_유사도(가중적용)'].max()
-        df_sen['SEN_SCALED'] = (df_sen['SBERT_유사도(가중적용)'] - s_min) / (s_max - s_min + 1e-9)
-    
-    if not df_fea.empty and '최종_유사도' in df_fea.columns:
-        f_min, f_max = df_fea['최종_유사도'].min(), df_fea['최종_유사도'].max()
-        df_fea['FEA_SCALED'] = (df_fea['최종_유사도'] - f_min) / (f_max - f_min + 1e-9)
+def get_table(key):
+    return DATA['tables'][key]
 
-    return vis_long, df_sen, df_fea
+# [관광지 레지스트리] 대표 이름/ID/별칭/지역구/카테고리/이미지 키 (표들의 관광지명은 스냅샷 단계에서 이미 대표 이름)
+SPOTS = DATA['spots']
+CATEGORY_MAP = DATA['category_map']
 
-@st.cache_data
 def load_all_data():
-    df_main = load_data_smart(FILE_CONFIG["MAIN_DATA"])
-    if not df_main.empty:
-        df_main['날짜'] = pd.to_datetime(df_main['날짜'], format='mixed', errors='coerce')
-        df_main = df_main.dropna(subset=['날짜'])
-        if '행정동' in df_main.columns:
-            df_main['행정구'] = df_main['행정동'].astype(str).apply(lambda x: x.split()[0] if len(x.split()) > 0 else "미분류")
-        else: df_main['행정구'] = "전체"
-        
-        df_main['관광지명'] = df_main['관광지명'].astype(str).str.strip().replace(NAME_MAPPING)
-        
-        if '시간대' in df_main.columns:
-             df_main['시간대_int'] = df_main['시간대'].astype(str).str.replace('시', '').apply(pd.to_numeric, errors='coerce')
-
-    df_pred = load_data_smart(FILE_CONFIG["PRED_DATA"])
-    if not df_pred.empty:
-        df_pred['ds'] = pd.to_datetime(df_pred['ds'])
-        df_pred['관광지명'] = df_pred['관광지명'].astype(str).str.strip().replace(NAME_MAPPING)
-
-    df_noun = load_data_smart(FILE_CONFIG["KEYWORD_NOUN"])
-    df_adj = load_data_smart(FILE_CONFIG["KEYWORD_ADJ"])
-    
-    if not df_noun.empty and '관광지명' in df_noun.columns:
-        df_noun['관광지명'] = df_noun['관광지명'].astype(str).str.strip().replace(NAME_MAPPING)
-    if not df_adj.empty and '관광지명' in df_adj.columns:
-        df_adj['관광지명'] = df_adj['관광지명'].astype(str).str.strip().replace(NAME_MAPPING)
-
-    return df_main, df_pred, df_noun, df_adj
-
-main_df, forecast_df, noun_df, adj_df = load_all_data()
-df_vis_scaled, df_sen_scaled, df_fea_scaled = get_scaled_data()
-
-@st.cache_data
-def get_global_top1_avg():
-    df_img = load_data_smart(FILE_CONFIG["IMG_RANK_DATA"])
-    if df_img.empty: return 0.5
-    scores = []
-    for val in df_img['1순위'].dropna():
-        m = re.search(r'\(([\d.]+)\)', str(val))
-        if m: scores.append(float(m.group(1)))
-    return np.mean(scores) if scores else 0.5
-
-GLOBAL_TOP1_AVG = get_global_top1_avg()
+    # 날짜 파싱/행정구/시간대_int/이름 매핑은 스냅샷(normalize_table)에서 이미 처리됨
+    return get_table("MAIN_DATA"), get_table("PRED_DATA"), get_table("KEYWORD_NOUN"), get_table("KEYWORD_ADJ")
+
+with timed("load.all_data"):
+    main_df, forecast_df, noun_df, adj_df = load_all_data()
+# [유사도 텐서] 레지스트리 ID 기준 VIS/SEN/FEA [3, N, N] float32
+SIMILARITY = DATA['similarity']
+
+# [가중 추천] 정규화된 가중치 기준 LRU 캐시 (세션 간 공유, 데이터 버전마다 새로 생성)
+recommend = DATA['recommend']
+
+# [Cross-Category] 관광지별 결과를 LRU 캐시 (하위 탭 전환 시 재계산 없음)
+cross_category = DATA['cross_category']
+df_sen_data = get_table("SENTIMENT_DATA")
+
+# [혼잡도 큐브] 리런마다 main_df를 스캔하지 않도록 1회 집계 (복사 없이 공유)
+CONGESTION_CUBE = DATA['congestion_cube']
+
+# [이미지 순위] 순위 파일을 1회 파싱하여 이웃 ID/점수 배열로 보관 (렌더링 시 정규식 없음)
+IMAGE_RANKS = DATA['image_ranks']
+GLOBAL_TOP1_AVG = IMAGE_RANKS['top1_avg']
+
+# [키워드 인덱스] (기준 ID, 비교 ID) -> 토큰화된 감성/특성 키워드 (설명 카드는 dict 조회 1회)
+SENTIMENT_KEYWORDS, FEATURE_KEYWORDS = DATA['pair_keywords']
 
 def get_spot_category(name):
     if name in CATEGORY_MAP: return CATEGORY_MAP[name]
     return '기타'
 
-def classify_density(val):
-    if val >= 1.2: return "매우혼잡"
-    elif val >= 0.7: return "혼잡"
-    elif val >= 0.3: return "보통"
-    else: return "쾌적"
-
-def get_smart_active_mean(df, spot_name):
-    spot_df = df[df['관광지명'] == spot_name]
-    if spot_df.empty: return 0, "알수없음"
-    
-    hourly_grp = spot_df.groupby('시간대_int')['실질_㎡당_방문객수'].mean()
-    if hourly_grp.empty: return 0, "알수없음"
-    
-    total_mean = hourly_grp.mean()
-    base_hours = list(range(9, 19)) 
-    active_hours = set(base_hours)
-    
-    for h in hourly_grp.index:
-        val = hourly_grp[h]
-        if h not in base_hours and val > total_mean:
-            active_hours.add(h)
-        if h in base_hours and val < total_mean:
-            if h in active_hours: active_hours.remove(h)
-            
-    valid_vals = [hourly_grp[h] for h in active_hours if h in hourly_grp.index]
-    
-    if not valid_vals:
-        final_val = total_mean
-    else:
-        final_val = np.mean(valid_vals)
-        
-    return final_val, classify_density(final_val)
-
-def get_active_time_stats(df, spot_name, year=None):
-    if year: spot_df = df[(df['관광지명'] == spot_name) & (df['날짜'].dt.year == year)]
-    else: spot_df = df[df['관광지명'] == spot_name]
-    return get_smart_active_mean(spot_df, spot_name)
-
-def get_ranking_info(df, spot_name, year):
-    y_df = df[df['날짜'].dt.year == year]
-    if y_df.empty: return "정보 없음"
-    
-    rank_list = []
-    for s in y_df['관광지명'].unique():
-        val, _ = get_smart_active_mean(y_df, s)
-        rank_list.append({'spot': s, 'val': val})
-    
-    rank_df = pd.DataFrame(rank_list).sort_values(by='val', ascending=False).reset_index(drop=True)
-    
-    if spot_name not in rank_df['spot'].values: return "정보 없음"
-    
-    my_rank = rank_df[rank_df['spot'] == spot_name].index[0] + 1
-    total = len(rank_df)
-    percent = (my_rank / total) * 100
-    
-    return f"전체 {total}곳 중 {my_rank}위 (상위 {percent:.1f}%)"
+def get_active_time_stats(spot_name, year=None):
+    return cube_active_mean(CONGESTION_CUBE, spot_name, year)
+
+# [순위표] 연도별 전체 관광지 순위 (데이터 묶음에 속한 캐시 -> 혼잡도 데이터가 갱신되면 함께 교체)
+get_ranking_table = DATA['ranking']
+
+def get_ranking_info(spot_name, year):
+    rank_df = get_ranking_table(year)
+    if spot_name not in rank_df.index: return "정보 없음"
+    row = rank_df.loc[spot_name]
+    return f"전체 {int(row['total'])}곳 중 {int(row['rank'])}위 (상위 {row['top_percent']:.1f}%)"
 
 def get_spot_keywords(spot_name):
     nouns, adjs = [], []
@@ -242,8 +129,8 @@ def get_spot_keywords(spot_name):
     if not adj_df.empty:
         row = adj_df[adj_df['관광지명'] == spot_name]
         if not row.empty: adjs = [k.strip() for k in str(row.iloc[0]['추출_형용사']).split(',') if k.strip()][:30]
-    if not nouns and not df_sen_scaled.empty:
-        row = df_sen_scaled[df_sen_scaled['기준_관광지'] == spot_name]
+    if not nouns and not df_sen_data.empty:
+        row = df_sen_data[df_sen_data['기준_관광지'] == spot_name]
         if not row.empty:
             raw_k = str(row.iloc[0].get('기준지_고유_키워드', ''))
             if raw_k and raw_k != 'nan':
@@ -252,175 +139,69 @@ def get_spot_keywords(spot_name):
                 adjs = all_k[len(all_k)//2:]
     return nouns, adjs
 
-# [페르소나 정의]
-AI_SYSTEM_PROMPT = """
-당신은 날카롭고 깊이 있는 통찰력을 가진 수석 데이터 분석가입니다.
-'분석하겠습니다', '결과입니다', '안녕하세요' 같은 형식적인 서론을 일절 생략하고, 즉시 핵심 수치와 그 이면의 의미를 파고드십시오.
-문장은 명료하되 내용은 심층적이어야 하며, 분량은 충분히 길고 자세하게 작성하십시오.
-톤은 전문적이고 냉철한 존댓말(~입니다/합니다)을 유지하십시오.
-"""
-
-def generate_spot_info_ai(spot_name):
-    if not api_key: return "API Key Missing"
-    try:
-        client = OpenAI(api_key=api_key)
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "system", "content": AI_SYSTEM_PROMPT}, 
-                      {"role": "user", "content": f"'{spot_name}'의 위치, 주요 특징, 역사적/문화적 배경을 심층적으로 서술하십시오."}], 
-            temperature=0.3
-        )
-        return response.choices[0].message.content
-    except: return "정보 로드 실패"
-
-def generate_visual_rank1_analysis(spot_name, rank1_name, rank1_score, avg_score, rank1_congestion):
-    if not api_key: return "API Key Missing"
-    
-    score_diff = rank1_score - avg_score
-    score_eval = f"평균({avg_score:.2f})보다 {score_diff:+.2f}점 높음" if score_diff > 0 else "평균 이하"
-    
-    policy_guide = ""
-    if rank1_congestion in ["혼잡", "매우혼잡"]:
-        policy_guide = "해당 대체지 역시 현재 '포화 상태'입니다. 이곳으로의 유입 유도는 풍선 효과를 초래하므로 정책적으로 '부적절'합니다."
-    else:
-        policy_guide = "해당 대체지는 현재 '수용 여력'이 충분합니다. 이곳으로의 유입 유도는 분산 정책상 '타당'합니다."
-
-    user_msg = f"""
-    [분석 대상]: {spot_name}
-    [시각적 대체지 1위]: {rank1_name}
-    [데이터]: 유사도 {rank1_score:.4f} ({score_eval}), 혼잡도 '{rank1_congestion}'
-    
-    [지시사항]
-    당신은 엄격한 데이터 분석가입니다. 인사말(안녕하세요 등)을 생략하고 바로 분석 내용을 서술하십시오. 정중한 존댓말(~입니다/합니다)을 사용하십시오.
-    
-    1. **대체지 기본 정보**: {rank1_name}이 어떤 곳인지 간략히 설명하십시오.
-    2. **유사도 평가**: 전체 평균 대비 유사도 수준을 수치와 함께 객관적으로 서술하십시오.
-    3. **수용력 진단**: 대체지의 현재 혼잡도를 근거로, 분산 수용 가능 여부를 냉정하게 판정하십시오.
-    
-    (참고 가이드: {policy_guide})
-    """
-    try:
-        client = OpenAI(api_key=api_key)
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "system", "content": AI_SYSTEM_PROMPT}, {"role": "user", "content": user_msg}],
-            temperature=0.3
-        )
-        return response.choices[0].message.content
-    except Exception as e: return str(e)
-
-def generate_strategic_analysis(source, candidates_data, anal_type="text"):
-    if not api_key: return "⚠️ API Key Missing"
-    candidates_text = ""
-    for c in candidates_data:
-        candidates_text += f"- {c['name']} (Rank {c['rank']}): 유사도 {c['score']:.4f}, 혼잡도 [{c['congestion']}]\n"
-    
-    user_msg = f"""
-    [분석 대상]: {source.get('name', 'Unknown')} (현재 혼잡도: {source.get('congestion', 'Unknown')})
-    [분석 유형]: {anal_type} 기반 유사도 후보군
-    {candidates_text}
-    
-    [추가 정보]
-    {source}
-
-    [요청사항]
-    데이터 분석가 입장에서 진단하십시오. 인사말을 절대 하지 마십시오. 반드시 존댓말(~입니다/합니다)을 사용하십시오.
-    
-    1. 유사도가 높으면서 혼잡도가 '쾌적/보통'인 곳을 **'유효 대체지'**로 분류하십시오.
-    2. 유사도가 높더라도 혼잡도가 '혼잡/매우혼잡'인 곳은 **'대체 불가(포화)'**로 명시하십시오.
-    3. 오직 데이터에 근거하여 분산 가능성 여부만 객관적으로 서술하십시오. (추상적 전략 제안 금지)
-    """
-    try:
-        client = OpenAI(api_key=api_key)
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "system", "content": AI_SYSTEM_PROMPT}, {"role": "user", "content": user_msg}],
-            temperature=0.3
-        )
-        return response.choices[0].message.content
-    except Exception as e: return f"Error: {str(e)}"
-
-def generate_weighted_insight(spot_name, top_cand, weights):
-    if not api_key: return "API Key Missing"
-    user_msg = f"""
-    [User Preferences - Weighted Priority]
-    - Visual: {weights[0]}
-    - Sentiment: {weights[1]}
-    - Feature: {weights[2]}
-    
-    [Result]
-    - Source: {spot_name}
-    - Recommended: {top_cand['name']}
-    - Scores: V({top_cand['raw_v']:.2f}), S({top_cand['raw_s']:.2f}), F({top_cand['raw_f']:.2f})
-    
-    [Task]
-    Explain clearly and deeply why this spot was selected based on data scores. 
-    No greetings. Start immediately.
-    Use polite Korean (Honorifics).
-    Max 5 sentences.
-    """
-    try:
-        client = OpenAI(api_key=api_key)
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "system", "content": AI_SYSTEM_PROMPT}, {"role": "user", "content": user_msg}],
-            temperature=0.3
-        )
-        return response.choices[0].message.content
-    except Exception as e: return f"Error: {str(e)}"
-
-def generate_section_analysis(section_type, spot_name, year, data_summary, congestion_stage, ranking_info="정보 없음"):
-    if  not api_key: return "⚠️ API Key Missing"
-    
-    tone_guide = ""
-    if congestion_stage in ["쾌적", "보통"]:
-        tone_guide = """
-        [Diagnosis]: 수용 여력 충분 (Under Capacity).
-        [Implication]: 데이터상 관광객 추가 유입이 가능하며, 분산 정책의 수용지(Destination)로서 적합함.
-        """
-    else: # 혼잡, 매우혼잡
-        tone_guide = """
-        [Diagnosis]: 수용 한계 초과 (Over Capacity).
-        [Implication]: 데이터상 추가 유입 시 혼잡도 임계치를 넘음. 분산 정책의 대상지(Source)로 분류되어야 함.
-        """
-
-    msg = f"""
-    [Target]: {spot_name} ({year})
-    [Type]: {section_type} Analysis
-    [Status]: {congestion_stage}
-    [Ranking]: {ranking_info}
-    [Data]: {data_summary}
-    
-    [Instruction]
-    You are a strict Data Analyst evaluating urban data.
-    Do NOT use greetings (Hello, etc). Start analysis directly.
-    Do NOT propose marketing strategies or vague improvements.
-    Use polite Korean (Honorifics, ~입니다/합니다).
-    
-    {tone_guide}
-    
-    1. **Quantify**: Use the ranking info (Top X%) to define the spot's relative density clearly.
-    2. **Analyze**: Interpret the volatility (standard deviation/peaks) and seasonality patterns in depth.
-    3. **Conclude**: Diagnose the 'Capacity' status strictly based on data.
-    """
-    
-    try:
-        client = OpenAI(api_key=api_key)
-        response = client.chat.completions.create(model="gpt-4o-mini", 
-            messages=[{"role": "system", "content": AI_SYSTEM_PROMPT}, {"role": "user", "content": msg}], 
-            temperature=0.3) 
-        return response.choices[0].message.content, "#0F172A"
-    except Exception as e: return str(e), "#000"
-
-def get_ranking_dict(df, spot_name, year):
-    y_df = df[df['날짜'].dt.year == year]
-    if y_df.empty: return None
-    rank_list = [{'spot': spot, 'val': get_smart_active_mean(y_df, spot)[0]} for spot in y_df['관광지명'].unique()]
-    rank_df = pd.DataFrame(rank_list).sort_values(by='val', ascending=False).reset_index(drop=True)
-    try:
-        rank = rank_df[rank_df['spot'] == spot_name].index[0] + 1
-        return {"rank": rank, "total": len(rank_df), "top_percent": (rank/len(rank_df))*100}
-    except: return None
+def get_ranking_dict(spot_name, year):
+    rank_df = get_ranking_table(year)
+    if spot_name not in rank_df.index: return None
+    row = rank_df.loc[spot_name]
+    return {"rank": int(row['rank']), "total": int(row['total']), "top_percent": row['top_percent']}
+
+def get_forecast_2025(spot_name):
+    # 2025년 예측 구간과 예측 혼잡 단계 (평균 이상 구간 기준)
+    f_spot = forecast_df[forecast_df['관광지명'] == spot_name]
+    f_25 = f_spot[(f_spot['ds'] >= '2025-01-01') & (f_spot['ds'] <= '2025-12-31')]
+    if f_25.empty: return f_25, None
+    mean_val = f_25['yhat'].mean()
+    active_pred_val = f_25[f_25['yhat'] >= mean_val]['yhat'].mean()
+    return f_25, classify_density(active_pred_val)
+
+def get_text_candidates(spot_name):
+    # 리뷰 유사도 상위 5곳 + 혼잡도 + 공통/고유 키워드
+    df_rev = get_table("REVIEW_SIM_DATA")
+    if df_rev.empty: return []
+    targets = df_rev[df_rev['관광지명'] == spot_name].head(5)
+    text_candidates = []
+    for idx, row in enumerate(targets.iterrows(), 1):
+        _, data = row
+        target = data['리뷰 유사 관광지']
+        score = data['리뷰유사도']
+        _, t_cong = get_active_time_stats(target, 2024)
+        vibe = pair_keywords(SENTIMENT_KEYWORDS, SIMILARITY['registry'], spot_name, target)
+        feat = pair_keywords(FEATURE_KEYWORDS, SIMILARITY['registry'], spot_name, target)
+        text_candidates.append({'rank': idx, 'name': target, 'score': score, 'congestion': t_cong,
+                                **{k: list(vibe.get(k, ())[:3]) for k in SENTIMENT_KEYWORD_COLS},
+                                **{k: list(feat.get(k, ())[:3]) for k in FEATURE_KEYWORD_COLS}})
+    return text_candidates
+
+def weighted_candidate(res_df):
+    top_cand = res_df.iloc[0]
+    return {'name': res_df.index[0], 'raw_v': top_cand['VIS_SCALED'], 'raw_s': top_cand['SEN_SCALED'], 'raw_f': top_cand['FEA_SCALED']}
+
+# [프리페치] 관광지 선택 시 각 리포트 버튼이 보낼 프롬프트를 미리 실행 (버튼과 같은 인자 -> 같은 캐시 키)
+DEFAULT_WEIGHTS = [50, 30, 20]
+PREFETCH_DEFAULT = os.getenv("LLM_PREFETCH", "0") == "1"
+
+def report_jobs(spot_name, year, month):
+    _, current_stage = get_active_time_stats(spot_name, year)
+    ranking = get_ranking_info(spot_name, year)
+    calls = []
+    y_chart_df = cube_monthly_trend(CONGESTION_CUBE, spot_name, year)
+    if not y_chart_df.empty:
+        calls.append((generate_section_analysis, ("trend", spot_name, year, summarize_series(y_chart_df, 'month', 'val'), current_stage, ranking)))
+    h_df = cube_hourly_frame(CONGESTION_CUBE, spot_name, year, month)
+    if not h_df.empty:
+        calls.append((generate_section_analysis, ("hourly", spot_name, year, summarize_series(h_df, '시간대', VALUE_COL), current_stage, ranking)))
+    if not forecast_df.empty:
+        f_25, pred_stage = get_forecast_2025(spot_name)
+        if pred_stage is not None:
+            calls.append((generate_section_analysis, ("forecast", spot_name, 2025, summarize_series(f_25, 'ds', 'yhat'), pred_stage)))
+    text_candidates = get_text_candidates(spot_name)
+    if text_candidates:
+        _, source_cong = get_active_time_stats(spot_name, 2024)
+        calls.append((generate_strategic_analysis, ({'name': spot_name, 'congestion': source_cong}, text_candidates, "리뷰(Context)")))
+    recs = recommend(spot_name, DEFAULT_WEIGHTS, k=5)
+    if recs:
+        calls.append((generate_weighted_insight, (spot_name, weighted_candidate(recommendations_frame(recs)), DEFAULT_WEIGHTS)))
+    return calls
 
 def style_chart(fig):
     fig.update_layout(
@@ -434,6 +215,78 @@ def style_chart(fig):
     )
     return fig
 
+# [이미지] 슬롯별 크기 파생본 (renditions.py 로 생성, 없으면 원본 jpg)
+# SLA_STATIC_URL 이 있으면 nginx 가 서빙하는 해시 URL 로 참조 -> 워커는 이미지 파일을 읽지 않음
+# 레지스트리 spot_id -> 슬롯별 URL/경로를 데이터 묶음 생성 시 1회 계산 (렌더링 중 파일 존재 확인 없음)
+IMAGE_INDEX = DATA['image_index']
+
+def spot_image(name, slot):
+    # slot: thumb / card / hero -> 정적 URL 또는 파생본 경로 (없으면 None). 이름 변형도 같은 ID 로 조회
+    return asset_for(IMAGE_INDEX, spot_id(SPOTS, name), slot)
+
+def show_image(src):
+    # 정적 URL 이면 <img> 태그만 전송 (브라우저가 nginx 에서 직접 받음), 파일 경로면 st.image 로 읽어서 전송
+    with timed("image.render"):
+        if not (STATIC_URL and src.startswith(STATIC_URL.rstrip("/"))): st.image(src, use_container_width=True)
+        else: st.markdown(f'<img src="{html.escape(src)}" loading="lazy" decoding="async" style="width:100%;">', unsafe_allow_html=True)
+
+def stream_insight(chunks, render):
+    # 토큰이 도착하는 대로 인사이트 박스를 갱신하고 완성된 전체 텍스트 반환 (문자열이면 그대로 반환)
+    if isinstance(chunks, str): return chunks
+    box = st.empty()
+    text = ""
+    for piece in chunks:
+        if isinstance(piece, ReportUnavailable):
+            box.empty()
+            return piece
+        text += piece
+        box.markdown(render(text + " ▌"), unsafe_allow_html=True)
+    return text
+
+def keep_report(kind, key, res, value=None):
+    # 실패 안내(ReportUnavailable)는 답변으로 저장하지 않고 경고만 표시 -> 다음 클릭 때 다시 시도
+    if isinstance(res, ReportUnavailable):
+        st.warning(res)
+        return False
+    st.session_state['analysis_results'][kind][key] = res if value is None else value
+    return True
+
+JOB_POLL_SECONDS = 1.0
+
+def background_result(kind, key, fn, *args):
+    # 세션에 결과가 있으면 반환, 없으면 백그라운드 작업을 등록하고 None (완료되면 세션에 저장)
+    results = st.session_state['analysis_results'][kind]
+    if key in results: return results[key]
+    jobs = st.session_state.setdefault('llm_jobs', {})
+    fut = jobs.get((kind, key))
+    if fut is None:
+        # 작업 이름에 데이터 버전 포함 -> 갱신 전 데이터로 시작된 작업과 합쳐지지 않음
+        fut = jobs[(kind, key)] = submit_job(f"{kind}:{key}@{DATA['generation']}", fn, *args)
+    if not fut.done(): return None
+    del jobs[(kind, key)]
+    try: res = fut.result()
+    except Exception as e: res = unavailable(e)
+    # 실패 안내도 저장 (폴링마다 다시 요청하지 않음) -> '다시 시도' 버튼으로만 재요청
+    results[key] = res
+    return res
+
+def render_when_ready(kind, key, fn, args, render, placeholder):
+    # 작업이 끝나기 전에는 placeholder 를 그리고, 이 fragment 만 주기적으로 다시 실행하여 결과를 채움
+    pending = key not in st.session_state['analysis_results'][kind]
+
+    def body():
+        res = background_result(kind, key, fn, *args)
+        # 결과가 도착하면 앱 전체를 한 번 다시 실행 -> run_every 없는 fragment 로 다시 그려져 폴링 종료
+        if pending and res is not None: st.rerun(scope="app")
+        if not isinstance(res, ReportUnavailable):
+            st.markdown(render(placeholder if res is None else res), unsafe_allow_html=True)
+            return
+        st.warning(res)
+        if st.button("다시 시도", key=f"retry_{kind}_{key}"):
+            st.session_state['analysis_results'][kind].pop(key, None)
+            st.rerun(scope="app")
+    st.fragment(body, run_every=JOB_POLL_SECONDS if pending else None)()
+
 
 # -----------------------------------------------------------------------------
 # 5. UI 및 세션
@@ -447,24 +300,33 @@ if 'cross_result' not in st.session_state: st.session_state['cross_result'] = No
 if 'analysis_results' not in st.session_state: 
     st.session_state['analysis_results'] = {'trend': {}, 'hourly': {}, 'forecast': {}, 'sim_strat': {}, 'sim_img': {}, 'spot_info': {}, 'visual_rank1': {}, 'weighted': {}}
 
+# [데이터 갱신] 이 세션이 보던 버전 이후 데이터가 교체되었으면 이전 데이터로 만든 결과를 비우고 알림
+if st.session_state.setdefault('data_generation', DATA['generation']) != DATA['generation']:
+    st.session_state['data_generation'] = DATA['generation']
+    st.session_state['weighted_result'] = st.session_state['cross_result'] = None
+    st.session_state['analysis_results'] = {k: {} for k in st.session_state['analysis_results']}
+    st.session_state['llm_jobs'], st.session_state['prefetched'] = {}, None
+    st.toast(f"데이터가 갱신되었습니다 ({', '.join(DATA['changed'])})", icon="🔄")
+
 with st.sidebar:
     st.markdown('<h3 style="color:white; margin-bottom:30px; font-weight:850; letter-spacing:1px; padding-left:10px;">SLA PROJECT</h3>', unsafe_allow_html=True)
-    if not main_df.empty:
-        gu_list = sorted(main_df['행정구'].unique())
-        for gu in gu_list:
-            with st.expander(gu, expanded=False):
-                spots = sorted(main_df[main_df['행정구'] == gu]['관광지명'].unique())
-                for spot in spots:
-                    btn_kind = "primary" if st.session_state['selected_spot'] == spot else "secondary"
-                    # [수정] 탭 초기화 로직
-                    if st.button(spot, key=f"btn_{gu}_{spot}", type=btn_kind):
-                        st.session_state['selected_spot'] = spot
-                        st.session_state['sel_month'] = 1 
-                        st.session_state['sim_sub_tab'] = "이미지 유사도" 
-                        st.session_state['weighted_result'] = None 
-                        st.session_state['cross_result'] = None 
-                        st.rerun()
-    else: st.error("Data Load Failed")
+    with timed("ui.sidebar_spots"):
+        if DATA['district_spots']:
+            for gu, spots in DATA['district_spots'].items():
+                with st.expander(gu, expanded=False):
+                    for spot in spots:
+                        btn_kind = "primary" if st.session_state['selected_spot'] == spot else "secondary"
+                        # [수정] 탭 초기화 로직
+                        if st.button(spot, key=f"btn_{gu}_{spot}", type=btn_kind):
+                            st.session_state['selected_spot'] = spot
+                            st.session_state['sel_month'] = 1 
+                            st.session_state['sim_sub_tab'] = "이미지 유사도" 
+                            st.session_state['weighted_result'] = None 
+                            st.session_state['cross_result'] = None 
+                            st.rerun()
+        else: st.error("Data Load Failed")
+    st.toggle("⚡ AI 리포트 미리 생성", value=PREFETCH_DEFAULT, key="prefetch_reports",
+              help="관광지를 선택하면 모든 AI 리포트를 백그라운드에서 미리 생성하여 버튼 클릭 시 즉시 표시합니다.")
 
 if not st.session_state['selected_spot']:
     # [수정] 메인 화면 레이아웃 (좌: 텍스트 / 우: 이미지)
@@ -493,27 +355,28 @@ else:
     st.title(spot_name)
     st.markdown(" ") 
 
-    if spot_name not in st.session_state['analysis_results']['spot_info']:
-        st.session_state['analysis_results']['spot_info'][spot_name] = generate_spot_info_ai(spot_name)
-    
+    prefetch_key = (spot_name, st.session_state['sel_year'], st.session_state['sel_month'])
+    if st.session_state['prefetch_reports'] and st.session_state.get('prefetched') != prefetch_key:
+        prefetch(report_jobs(*prefetch_key))
+        st.session_state['prefetched'] = prefetch_key
+
     with st.expander(f"ℹ️ ABOUT {spot_name}", expanded=True):
         ic1, ic2 = st.columns([1, 2])
         with ic1:
-            img_path = os.path.join(BASE_DIR,"images", f"{spot_name}.jpg")
-            if os.path.exists(img_path): 
-                st.image(img_path, use_container_width=True) 
+            img_path = spot_image(spot_name, "card")
+            if img_path: show_image(img_path)
             else: st.markdown("<div style='background:#F4F4F5; height:200px; display:flex; justify-content:center; align-items:center; color:#999;'>NO IMAGE</div>", unsafe_allow_html=True)
         with ic2:
-            st.markdown(f"<div style='line-height:1.6; color:#333;'>{st.session_state['analysis_results']['spot_info'][spot_name]}</div>", unsafe_allow_html=True)
+            render_when_ready('spot_info', spot_name, generate_spot_info_ai, (spot_name,),
+                              lambda t: f"<div style='line-height:1.6; color:#333;'>{t}</div>", "🔄 관광지 정보를 불러오는 중...")
 
     # [수정] 탭 키 제거
     tab1, tab2 = st.tabs(["⚫ CROWD ANALYSIS (혼잡도)", "⚪ SIMILARITY & DISPERSION (유사도)"])
 
     # TAB 1: 혼잡도
     with tab1:
-        spot_data = main_df[main_df['관광지명'] == spot_name].copy()
         # [수정] 연도별 필터 적용된 배지 계산
-        _, current_stage = get_active_time_stats(main_df, spot_name, st.session_state['sel_year'])
+        _, current_stage = get_active_time_stats(spot_name, st.session_state['sel_year'])
         st.markdown("<h3 style='font-size:1.5rem; font-weight:900; margin-bottom:15px; margin-top:20px; text-align:center;'>⚫ YEARLY TREND ANALYSIS</h3>", unsafe_allow_html=True)
         # [수정] 캡션 가운데 정렬
         st.markdown("<div class='center-caption'>선택한 연도의 월별 평균 혼잡도 추이입니다.</div>", unsafe_allow_html=True)
@@ -527,35 +390,26 @@ else:
                     st.session_state['sel_year'] = y
                     st.rerun()
         with c2:
-            y_df = spot_data[spot_data['날짜'].dt.year == st.session_state['sel_year']]
-            if not y_df.empty:
-                monthly_stats = []
-                for m in range(1, 13):
-                    m_data = y_df[y_df['날짜'].dt.month == m]
-                    if not m_data.empty:
-                        val, _ = get_smart_active_mean(m_data, spot_name)
-                        monthly_stats.append({'month': m, 'val': val})
-                
-                if monthly_stats:
-                    y_chart_df = pd.DataFrame(monthly_stats)
+            y_chart_df = cube_monthly_trend(CONGESTION_CUBE, spot_name, st.session_state['sel_year'])
+            if not y_chart_df.empty:
+                with timed("chart.trend"):
                     fig = px.line(y_chart_df, x='month', y='val', markers=True)
                     fig.update_traces(line_color='#000000', line_width=3)
                     fig.update_xaxes(tickmode='linear', tick0=1, dtick=1)
                     st.plotly_chart(style_chart(fig), use_container_width=True)
-                    
-                    cache_key = f"{spot_name}_{st.session_state['sel_year']}_trend"
-                    if cache_key in st.session_state['analysis_results']['trend']:
-                        content, color = st.session_state['analysis_results']['trend'][cache_key]
-                        st.markdown(f"""<div class="ai-insight-box" style="border-left-color:{color};"><div class="ai-header" style="color:{color};">📉 DATA INSIGHT: {current_stage}</div>{content}</div>""", unsafe_allow_html=True)
-                    else:
-                        if st.button("📄 AI 심층 분석 보고서 생성 (Click)", key="btn_trend", use_container_width=True, type="primary"):
-                            with st.spinner("🔄 AI 심층분석 중..."):
-                                ranking = get_ranking_info(main_df, spot_name, st.session_state['sel_year'])
-                                summary = y_chart_df.to_string(index=False)
-                                res, color,*_ = generate_section_analysis("trend", spot_name, st.session_state['sel_year'], summary, current_stage, ranking)
-                                st.session_state['analysis_results']['trend'][cache_key] = (res, color)
-                                st.rerun()
-                else: st.info("해당 연도 데이터 없음")
+                
+                cache_key = f"{spot_name}_{st.session_state['sel_year']}_trend"
+                if cache_key in st.session_state['analysis_results']['trend']:
+                    content, color = st.session_state['analysis_results']['trend'][cache_key]
+                    st.markdown(f"""<div class="ai-insight-box" style="border-left-color:{color};"><div class="ai-header" style="color:{color};">📉 DATA INSIGHT: {current_stage}</div>{content}</div>""", unsafe_allow_html=True)
+                else:
+                    if st.button("📄 AI 심층 분석 보고서 생성 (Click)", key="btn_trend", use_container_width=True, type="primary"):
+                        with st.spinner("🔄 AI 심층분석 중..."):
+                            ranking = get_ranking_info(spot_name, st.session_state['sel_year'])
+                            summary = summarize_series(y_chart_df, 'month', 'val')
+                            chunks, color,*_ = generate_section_analysis("trend", spot_name, st.session_state['sel_year'], summary, current_stage, ranking, stream=True)
+                            res = stream_insight(chunks, lambda t: f"""<div class="ai-insight-box" style="border-left-color:{color};"><div class="ai-header" style="color:{color};">📉 DATA INSIGHT: {current_stage}</div>{t}</div>""")
+                            if keep_report('trend', cache_key, res, (res, color)): st.rerun()
             else: st.info("해당 연도 데이터 없음")
 
         st.markdown("---")
@@ -571,12 +425,12 @@ else:
                 st.session_state['sel_month'] = i+1
                 st.rerun()
         st.markdown(" ") 
-        m_df = spot_data[(spot_data['날짜'].dt.year == st.session_state['sel_year']) & (spot_data['날짜'].dt.month == st.session_state['sel_month'])]
-        if not m_df.empty:
-            h_df = m_df.groupby(['시간대_int', '시간대'])['실질_㎡당_방문객수'].mean().reset_index().sort_values('시간대_int')
-            fig_h = px.area(h_df, x='시간대', y='실질_㎡당_방문객수')
-            fig_h.update_traces(line_color='#666', fillcolor='rgba(0,0,0,0.1)')
-            st.plotly_chart(style_chart(fig_h), use_container_width=True)
+        h_df = cube_hourly_frame(CONGESTION_CUBE, spot_name, st.session_state['sel_year'], st.session_state['sel_month'])
+        if not h_df.empty:
+            with timed("chart.hourly"):
+                fig_h = px.area(h_df, x='시간대', y='실질_㎡당_방문객수')
+                fig_h.update_traces(line_color='#666', fillcolor='rgba(0,0,0,0.1)')
+                st.plotly_chart(style_chart(fig_h), use_container_width=True)
             
             key_h = f"hourly_{spot_name}_{st.session_state['sel_month']}"
             if key_h in st.session_state['analysis_results']['hourly']:
@@ -585,10 +439,10 @@ else:
             else:
                 if st.button("📄 AI 심층 분석 보고서 생성 (Click)", key="btn_hourly", use_container_width=True, type="primary"):
                     with st.spinner("🔄 AI 심층분석 중..."):
-                        ranking = get_ranking_info(main_df, spot_name, st.session_state['sel_year'])
-                        res, color,*_ = generate_section_analysis("hourly", spot_name, st.session_state['sel_year'], h_df.to_string(), current_stage, ranking)
-                        st.session_state['analysis_results']['hourly'][key_h] = (res, color)
-                        st.rerun()
+                        ranking = get_ranking_info(spot_name, st.session_state['sel_year'])
+                        chunks, color,*_ = generate_section_analysis("hourly", spot_name, st.session_state['sel_year'], summarize_series(h_df, '시간대', VALUE_COL), current_stage, ranking, stream=True)
+                        res = stream_insight(chunks, lambda t: f"""<div class="ai-insight-box" style="border-left-color:{color}; padding:15px; margin-top:10px;"><div class="ai-header" style="color:{color}; font-size:0.9rem;">⏳ TIME ANALYSIS</div>{t}</div>""")
+                        if keep_report('hourly', key_h, res, (res, color)): st.rerun()
         else: st.write("해당 월 데이터 없음")
 
         st.markdown("---")
@@ -596,15 +450,12 @@ else:
         st.markdown("<div class='center-caption'>머신러닝 모델(Prophet)이 예측한 2025년 월별 혼잡도 추이입니다.</div>", unsafe_allow_html=True)
         
         if not forecast_df.empty:
-            f_spot = forecast_df[forecast_df['관광지명'] == spot_name]
-            f_25 = f_spot[(f_spot['ds'] >= '2025-01-01') & (f_spot['ds'] <= '2025-12-31')]
+            f_25, pred_stage = get_forecast_2025(spot_name)
             if not f_25.empty:
-                mean_val = f_25['yhat'].mean()
-                active_pred_val = f_25[f_25['yhat'] >= mean_val]['yhat'].mean()
-                pred_stage = classify_density(active_pred_val)
-                fig_f = px.line(f_25, x='ds', y='yhat')
-                fig_f.update_traces(line_color='#000000', line_dash='dot')
-                st.plotly_chart(style_chart(fig_f), use_container_width=True)
+                with timed("chart.forecast"):
+                    fig_f = px.line(f_25, x='ds', y='yhat')
+                    fig_f.update_traces(line_color='#000000', line_dash='dot')
+                    st.plotly_chart(style_chart(fig_f), use_container_width=True)
                 key_f = f"forecast_{spot_name}"
                 if key_f in st.session_state['analysis_results']['forecast']:
                     content, color = st.session_state['analysis_results']['forecast'][key_f]
@@ -612,9 +463,9 @@ else:
                 else:
                     if st.button("📄 AI 심층 분석 보고서 생성 (Click)", key="btn_forecast", use_container_width=True, type="primary"):
                         with st.spinner("🔄 AI 심층분석 중..."):
-                            res, color,*_ = generate_section_analysis("forecast", spot_name, 2025, f_25.head().to_string(), pred_stage)
-                            st.session_state['analysis_results']['forecast'][key_f] = (res, color)
-                            st.rerun()
+                            chunks, color,*_ = generate_section_analysis("forecast", spot_name, 2025, summarize_series(f_25, 'ds', 'yhat'), pred_stage, stream=True)
+                            res = stream_insight(chunks, lambda t: f"""<div class="ai-insight-box" style="border-left-color:{color}; padding:15px; margin-top:10px;"><div class="ai-header" style="color:{color}; font-size:0.9rem;">📈 PREDICTIVE ANALYTICS</div>{t}</div>""")
+                            if keep_report('forecast', key_f, res, (res, color)): st.rerun()
         else: st.write("예측 데이터 없음")
 
         # 2. 마크다운 적용
@@ -651,44 +502,23 @@ else:
         st.markdown("---")
         current_sub = st.session_state['sim_sub_tab']
         # [수정] 연도별 필터 적용된 배지 계산
-        _, source_cong = get_active_time_stats(main_df, spot_name, 2024)
+        _, source_cong = get_active_time_stats(spot_name, 2024)
 
         if current_sub == "이미지 유사도":
             st.markdown(f"<h4 style='text-align:center;'>Visual Similarity Analysis</h4>", unsafe_allow_html=True)
             st.markdown("<div class='center-caption'>딥러닝으로 분석한 시각적 유사도 순위입니다.</div>", unsafe_allow_html=True)
             
-            df_img = load_data_smart(FILE_CONFIG["IMG_RANK_DATA"])
-            row = df_img[df_img['대상_관광지'] == spot_name] if not df_img.empty else pd.DataFrame()
-            
-            # [NEW] 전체 데이터의 1순위 평균 점수 계산 (비교 분석용)
-            avg_top1_score = 0.0
-            if not df_img.empty and '1순위' in df_img.columns:
-                try:
-                    # '관광지명(0.8123)' 형태에서 점수만 추출하여 평균 계산
-                    scores = []
-                    for val in df_img['1순위'].astype(str):
-                        match = re.search(r'\(([\d.-]+)\)', val)
-                        if match: scores.append(float(match.group(1)))
-                    if scores: avg_top1_score = sum(scores) / len(scores)
-                except: pass
-
-            if not row.empty:
-                visual_candidates = []
-                for i in range(1, 9):
-                    col = f"{i}순위"
-                    if col in row.columns:
-                        val = str(row.iloc[0][col])
-                        match = re.search(r'(.+)\(([\d.-]+)\)', val)
-                        if match:
-                            t_name = match.group(1).strip()
-                            t_score = float(match.group(2))
-                            _, t_cong = get_active_time_stats(main_df, t_name, 2024)
-                            visual_candidates.append({'rank': i, 'name': t_name, 'score': t_score, 'congestion': t_cong})
+            # [NEW] 전체 데이터의 1순위 평균 점수 (비교 분석용, 시작 시 1회 계산)
+            avg_top1_score = GLOBAL_TOP1_AVG
+            ranked = image_candidates(IMAGE_RANKS, SIMILARITY['registry'], spot_name, k=8)
+
+            if ranked is not None:
+                visual_candidates = [{**c, 'congestion': get_active_time_stats(c['name'], 2024)[1]} for c in ranked]
                 
                 if visual_candidates:
                     top1 = visual_candidates[0]
                     
-                    st.markdown(f"#### 🥇 PRIMARY ALTERNATIVE (Rank 1)")
+                    st.markdown(f"#### 🥇 PRIMARY ALTERNATIVE (Rank {top1['rank']})")
                     
                     # [레이아웃] 좌측: 이미지/정보(1), 우측: AI 분석(1.2)
                     c1, c2 = st.columns([1, 1.2])
@@ -706,43 +536,34 @@ else:
                         </div>
                         """, unsafe_allow_html=True)
                         
-                        img_path = os.path.join(BASE_DIR,"images", f"{top1['name']}.jpg")
-                        if os.path.exists(img_path): st.image(img_path, use_container_width=True)
+                        img_path = spot_image(top1['name'], "hero")
+                        if img_path: show_image(img_path)
                         else: st.markdown("<div style='background:#F4F4F5; height:200px; border-radius:8px;'></div>", unsafe_allow_html=True)
 
                     # --- RIGHT COLUMN: AI Auto Insight (자동 실행 / 데이터 중심) ---
                     with c2:
                         auto_key = f"{spot_name}_vis_auto_analysis"
                         
-                        # [핵심 수정] 세션에 결과가 없으면 버튼 클릭 없이 자동 실행
-                        if auto_key not in st.session_state['analysis_results']['sim_img']:
-                            with st.spinner(f"📊 {top1['name']} 데이터 분석 중..."):
-                                try:
-                                    sim_diff = top1['score'] - avg_top1_score
-                                    
-                                    # [수정] 'name' 키 추가 (오류 해결) 및 데이터 중심 정보 구성
-                                    data_info = {
-                                        'name': top1['name'],
-                                        'target_name': top1['name'],
-                                        'current_score': f"{top1['score']:.4f}",
-                                        'average_benchmark': f"{avg_top1_score:.4f}", 
-                                        'score_deviation': f"{sim_diff:+.4f}",
-                                        'congestion_status': top1['congestion']
-                                    }
-                                    
-                                    # anal_type을 '이미지_데이터분석'으로 전달
-                                    res = generate_strategic_analysis(data_info, [], anal_type="이미지_데이터분석")
-                                    st.session_state['analysis_results']['sim_img'][auto_key] = res
-                                except Exception as e:
-                                    st.session_state['analysis_results']['sim_img'][auto_key] = f"분석 오류: {str(e)}"
+                        # [핵심 수정] 세션에 결과가 없으면 버튼 클릭 없이 자동 실행 (백그라운드 작업, 완료 시 박스가 채워짐)
+                        sim_diff = top1['score'] - avg_top1_score
+                        
+                        # [수정] 'name' 키 추가 (오류 해결) 및 데이터 중심 정보 구성
+                        data_info = {
+                            'name': top1['name'],
+                            'target_name': top1['name'],
+                            'current_score': f"{top1['score']:.4f}",
+                            'average_benchmark': f"{avg_top1_score:.4f}", 
+                            'score_deviation': f"{sim_diff:+.4f}",
+                            'congestion_status': top1['congestion']
+                        }
                         
-                        # 결과 표시
-                        if auto_key in st.session_state['analysis_results']['sim_img']:
-                            st.markdown(f"""
+                        # anal_type을 '이미지_데이터분석'으로 전달
+                        render_when_ready('sim_img', auto_key, generate_strategic_analysis, (data_info, [], "이미지_데이터분석"),
+                                          lambda t: f"""
                             <div class="ai-insight-box" style="height:100%; min-height:300px;">
                                 <div class="ai-header">📉 DATA ANALYSIS</div>
-                                {st.session_state['analysis_results']['sim_img'][auto_key]}
-                            </div>""", unsafe_allow_html=True)
+                                {t}
+                            </div>""", f"📊 {top1['name']} 데이터 분석 중...")
 
                     st.markdown("---")
                     
@@ -755,8 +576,8 @@ else:
                         
                         with r2_cols[idx]:
                             st.markdown(f"<div style='font-weight:700; margin-bottom:5px; font-size:1.8rem;'>{medal} {label} (Rank {cand['rank']})</div>", unsafe_allow_html=True)
-                            i_path = os.path.join(BASE_DIR,"images", f"{cand['name']}.jpg")
-                            if os.path.exists(i_path): st.image(i_path, use_container_width=True)
+                            i_path = spot_image(cand['name'], "card")
+                            if i_path: show_image(i_path)
                             else: st.markdown("<div style='background:#EEE; height:150px; display:flex; align-items:center; justify-content:center; color:#999;'>NO IMAGE</div>", unsafe_allow_html=True)
                             st.markdown(f"<div style='font-weight:800; font-size:1.1rem;'>{cand['name']}</div>", unsafe_allow_html=True)
                             st.markdown(f"<span class='congestion-badge {cong_cls}'>{cand['congestion']}</span>", unsafe_allow_html=True)
@@ -786,9 +607,9 @@ else:
                                     'candidate_count': len(visual_candidates)
                                 }
                                 # 전체 후보군(visual_candidates)을 넘겨서 종합 분석
-                                res = generate_strategic_analysis(summary_info, visual_candidates, anal_type="이미지_종합분석")
-                                st.session_state['analysis_results']['sim_img'][total_key] = res
-                                st.rerun()
+                                res = stream_insight(generate_strategic_analysis(summary_info, visual_candidates, anal_type="이미지_종합분석", stream=True),
+                                                     lambda t: f"""<div class="ai-insight-box"><div class="ai-header">🧠 VISUAL DEEP DIVE</div>{t}</div>""")
+                                if keep_report('sim_img', total_key, res): st.rerun()
                             except Exception as e:
                                 st.error(f"Error: {str(e)}")
 
@@ -803,40 +624,10 @@ else:
             if nouns or adjs:
                 st.markdown(f"""<div class="keyword-box"><div class="keyword-header">IDENTITY OF {spot_name}</div><div style="margin-bottom:8px;"><span style="font-size:0.8rem; font-weight:700; margin-right:10px;">VIBE (감성):</span>{' '.join([f"<span class='meta-tag tag-common'>#{k}</span>" for k in adjs[:5]])}</div><div><span style="font-size:0.8rem; font-weight:700; margin-right:10px;">FEATURE (시설):</span>{' '.join([f"<span class='meta-tag tag-common'>#{k}</span>" for k in nouns[:5]])}</div></div>""", unsafe_allow_html=True)
             else: st.info("키워드 데이터가 없습니다.")
-            df_rev = load_data_smart(FILE_CONFIG["REVIEW_SIM_DATA"])
+            df_rev = get_table("REVIEW_SIM_DATA")
             if not df_rev.empty:
-                if '관광지명' in df_rev.columns: df_rev['관광지명'] = df_rev['관광지명'].ffill()
-                targets = df_rev[df_rev['관광지명'] == spot_name].head(5)
-                if not targets.empty:
-                    text_candidates = []
-                    df_emo = load_data_smart(FILE_CONFIG["SENTIMENT_DATA"])
-                    df_key = load_data_smart(FILE_CONFIG["FEATURE_DATA"])
-                    for idx, row in enumerate(targets.iterrows(), 1):
-                        _, data = row
-                        target = data['리뷰 유사 관광지']
-                        score = data['리뷰유사도']
-                        _, t_cong = get_active_time_stats(main_df, target, 2024)
-                        common_vibe, unique_s_vibe, unique_t_vibe = [], [], []
-                        common_feat, unique_s_feat, unique_t_feat = [], [], []
-                        if not df_emo.empty:
-                            e = df_emo[(df_emo['기준_관광지']==spot_name) & (df_emo['비교_대상']==target)]
-                            if not e.empty:
-                                try: common_vibe = [k.strip() for k in str(e.iloc[0]['공통_키워드']).split(',') if k.strip()][:3]
-                                except: pass
-                                try: unique_s_vibe = [k.strip() for k in str(e.iloc[0]['기준지_고유_키워드']).split(',') if k.strip()][:3]
-                                except: pass
-                                try: unique_t_vibe = [k.strip() for k in str(e.iloc[0]['비교지_고유_키워드']).split(',') if k.strip()][:3]
-                                except: pass
-                        if not df_key.empty:
-                            k = df_key[(df_key['기준_관광지']==spot_name) & (df_key['비교_대상']==target)]
-                            if not k.empty:
-                                try: common_feat = [k.strip() for k in str(k.iloc[0]['엣지_공통_키워드']).split(',') if k.strip()][:3]
-                                except: pass
-                                try: unique_s_feat = [k.strip() for k in str(k.iloc[0]['기준지_고유']).split(',') if k.strip()][:3]
-                                except: pass
-                                try: unique_t_feat = [k.strip() for k in str(k.iloc[0]['비교지_고유']).split(',') if k.strip()][:3]
-                                except: pass
-                        text_candidates.append({'rank': idx, 'name': target, 'score': score, 'congestion': t_cong, 'vibe_com': common_vibe, 'vibe_uniq_s': unique_s_vibe, 'vibe_uniq_t': unique_t_vibe, 'feat_com': common_feat, 'feat_uniq_s': unique_s_feat, 'feat_uniq_t': unique_t_feat})
+                text_candidates = get_text_candidates(spot_name)
+                if text_candidates:
                     def make_tags(tags, cls):
                         if not tags: return "<span style='color:#ccc; font-size:0.8rem;'>-</span>"
                         return ' '.join([f"<span class='meta-tag {cls}'>#{t}</span>" for t in tags])
@@ -853,9 +644,9 @@ else:
                         with st.spinner("🔄 AI 심층분석 중..."):
                             try:
                                 source_info = {'name': spot_name, 'congestion': source_cong}
-                                res = generate_strategic_analysis(source_info, text_candidates, anal_type="리뷰(Context)")
-                                st.session_state['analysis_results']['sim_strat'][spot_name] = res
-                                st.rerun()
+                                res = stream_insight(generate_strategic_analysis(source_info, text_candidates, anal_type="리뷰(Context)", stream=True),
+                                                     lambda t: f"""<div class="ai-insight-box"><div class="ai-header">🧠 CONTEXT DATA INSIGHT</div>{t}</div>""")
+                                if keep_report('sim_strat', spot_name, res): st.rerun()
                             except Exception as e:
                                 st.error(f"분석 중 오류 발생: {str(e)}")
                 else: st.info("유사도 데이터 없음")
@@ -868,25 +659,16 @@ else:
             
             st.info("이미지(Visual), 감성(Sentiment), 특성(Feature) 데이터를 사용자가 설정한 가중치로 결합합니다.")
             c1, c2, c3 = st.columns(3)
-            w_vis = c1.number_input("📸 Visual Weight (시각)", min_value=0, max_value=100, value=50, step=10, key="w_v_num")
-            w_sen = c2.number_input("💬 Sentiment Weight (감성)", min_value=0, max_value=100, value=30, step=10, key="w_s_num")
-            w_fea = c3.number_input("🏟️ Feature Weight (특성)", min_value=0, max_value=100, value=20, step=10, key="w_f_num")
+            w_vis = c1.number_input("📸 Visual Weight (시각)", min_value=0, max_value=100, value=DEFAULT_WEIGHTS[0], step=10, key="w_v_num")
+            w_sen = c2.number_input("💬 Sentiment Weight (감성)", min_value=0, max_value=100, value=DEFAULT_WEIGHTS[1], step=10, key="w_s_num")
+            w_fea = c3.number_input("🏟️ Feature Weight (특성)", min_value=0, max_value=100, value=DEFAULT_WEIGHTS[2], step=10, key="w_f_num")
             st.markdown(" ")
             
             if st.button("🔍 결과 분석 및 순위 산출 (Click)", type="primary", use_container_width=True):
                 with st.spinner("데이터 분석 중..."):
-                    total_w = w_vis + w_sen + w_fea
-                    if total_w == 0: total_w = 1 
-                    if not df_vis_scaled.empty:
-                        curr_v = df_vis_scaled[df_vis_scaled['기준_관광지'] == spot_name].drop_duplicates('비교_대상').set_index('비교_대상')['VIS_SCALED']
-                        curr_s = pd.Series()
-                        if not df_sen_scaled.empty: curr_s = df_sen_scaled[df_sen_scaled['기준_관광지'] == spot_name].drop_duplicates('비교_대상').set_index('비교_대상')['SEN_SCALED']
-                        curr_f = pd.Series()
-                        if not df_fea_scaled.empty: curr_f = df_fea_scaled[df_fea_scaled['기준_관광지'] == spot_name].drop_duplicates('비교_대상').set_index('비교_대상')['FEA_SCALED']
-                        merged = pd.concat([curr_v, curr_s, curr_f], axis=1).fillna(0)
-                        merged.columns = ['VIS_SCALED', 'SEN_SCALED', 'FEA_SCALED'] 
-                        merged['FINAL_SCORE'] = ((merged['VIS_SCALED'] * w_vis) + (merged['SEN_SCALED'] * w_sen) + (merged['FEA_SCALED'] * w_fea)) / total_w
-                        st.session_state['weighted_result'] = merged[merged.index != spot_name].sort_values(by='FINAL_SCORE', ascending=False).head(5)
+                    recs = recommend(spot_name, [w_vis, w_sen, w_fea], k=5)
+                    if recs:
+                        st.session_state['weighted_result'] = recommendations_frame(recs)
                     else: st.warning("데이터가 부족하여 계산할 수 없습니다.")
 
             if st.session_state['weighted_result'] is not None:
@@ -894,68 +676,27 @@ else:
                 st.markdown("---")
                 st.markdown(f"<h4 style='text-align:center;'>🏆 TOP 5 WEIGHTED RECOMMENDATIONS</h4>", unsafe_allow_html=True)
                 for rank, (cand_name, row) in enumerate(res_df.iterrows(), 1):
-                    _, c_cong = get_active_time_stats(main_df, cand_name, 2024)
+                    _, c_cong = get_active_time_stats(cand_name, 2024)
                     c_cong_cls = "cong-bad" if c_cong in ['혼잡', '매우혼잡'] else ("cong-norm" if c_cong == '보통' else "cong-good")
                     st.markdown(f"""<div class="sim-card" style="padding: 20px;"><div style="display:flex; justify-content:space-between; align-items:center;"><div><span class="sim-rank-badge" style="background:#0F172A;">#{rank}</span><span style="font-size:1.2rem; font-weight:800; margin-right:10px;">{cand_name}</span><span class="congestion-badge {c_cong_cls}">{c_cong}</span></div><div style="text-align:right;"><div style="font-size:1.3rem; font-weight:900; color:#0F172A;">{row['FINAL_SCORE']:.4f}</div><div style="font-size:0.75rem; color:#666;">WEIGHTED SCORE</div></div></div><div style="margin-top:15px; background:#F8FAFC; padding:10px; border-radius:8px; display:flex; gap:15px;"><div style="flex:1; text-align:center;"><div style="font-size:0.7rem; color:#64748B;">VISUAL ({w_vis}%)</div><div style="font-weight:700;">{row['VIS_SCALED']:.2f}</div></div><div style="flex:1; text-align:center; border-left:1px solid #E2E8F0;"><div style="font-size:0.7rem; color:#64748B;">SENTIMENT ({w_sen}%)</div><div style="font-weight:700;">{row['SEN_SCALED']:.2f}</div></div><div style="flex:1; text-align:center; border-left:1px solid #E2E8F0;"><div style="font-size:0.7rem; color:#64748B;">FEATURE ({w_fea}%)</div><div style="font-weight:700;">{row['FEA_SCALED']:.2f}</div></div></div></div>""", unsafe_allow_html=True)
-                top_cand = res_df.iloc[0]
-                cand_info = {'name': res_df.index[0], 'raw_v': top_cand['VIS_SCALED'], 'raw_s': top_cand['SEN_SCALED'], 'raw_f': top_cand['FEA_SCALED']}
+                cand_info = weighted_candidate(res_df)
                 st.markdown("---")
                 if spot_name in st.session_state['analysis_results']['weighted']:
                       st.markdown(f"""<div class="ai-insight-box"><div class="ai-header">⚖️ WEIGHTED INSIGHT</div>{st.session_state['analysis_results']['weighted'][spot_name]}</div>""", unsafe_allow_html=True)
                 if st.button("📄 AI 가중치 결과 분석 (Click)", key="btn_weighted_ai", type="primary", use_container_width=True):
                     with st.spinner("가중치 기반 분석 중..."):
-                        res = generate_weighted_insight(spot_name, cand_info, [w_vis, w_sen, w_fea])
-                        st.session_state['analysis_results']['weighted'][spot_name] = res
-                        st.rerun()
+                        res = stream_insight(generate_weighted_insight(spot_name, cand_info, [w_vis, w_sen, w_fea], stream=True),
+                                             lambda t: f"""<div class="ai-insight-box"><div class="ai-header">⚖️ WEIGHTED INSIGHT</div>{t}</div>""")
+                        if keep_report('weighted', spot_name, res): st.rerun()
             
         elif current_sub == "Cross-Category":
             st.markdown(f"<h4 style='text-align:center;'>Cross-Category Analysis (Genre-Breaking)</h4>", unsafe_allow_html=True)
             st.markdown("<div class='center-caption'>동일 카테고리의 평균 유사도보다 높은 점수를 가진(3가지 기준 중 3개 모두 충족), '다른 카테고리'의 관광지 리스트입니다.</div>", unsafe_allow_html=True)
             
             with st.spinner("다차원 교차 분석 중..."):
-                if not df_vis_scaled.empty:
-                    curr_v = df_vis_scaled[df_vis_scaled['기준_관광지'] == spot_name].drop_duplicates('비교_대상').set_index('비교_대상')['VIS_SCALED']
-                    curr_s = pd.Series()
-                    if not df_sen_scaled.empty: curr_s = df_sen_scaled[df_sen_scaled['기준_관광지'] == spot_name].drop_duplicates('비교_대상').set_index('비교_대상')['SEN_SCALED']
-                    curr_f = pd.Series()
-                    if not df_fea_scaled.empty: curr_f = df_fea_scaled[df_fea_scaled['기준_관광지'] == spot_name].drop_duplicates('비교_대상').set_index('비교_대상')['FEA_SCALED']
-                    
-                    merged = pd.concat([curr_v, curr_s, curr_f], axis=1).fillna(0)
-                    merged.columns = ['VIS_SCALED', 'SEN_SCALED', 'FEA_SCALED']
-                    merged['FINAL_SCORE'] = ((merged['VIS_SCALED'] * 50) + (merged['SEN_SCALED'] * 30) + (merged['FEA_SCALED'] * 20)) / 100
-                    
-                    source_cat = get_spot_category(spot_name)
-                    merged['CATEGORY'] = merged.index.map(get_spot_category)
-                    
-                    same_cat_group = merged[merged['CATEGORY'] == source_cat]
-                    
-                    if not same_cat_group.empty:
-                        avg_vis = same_cat_group[same_cat_group['VIS_SCALED'] > 0]['VIS_SCALED'].mean()
-                        avg_sen = same_cat_group[same_cat_group['SEN_SCALED'] > 0]['SEN_SCALED'].mean()
-                        avg_fea = same_cat_group[same_cat_group['FEA_SCALED'] > 0]['FEA_SCALED'].mean()
-                        if np.isnan(avg_vis): avg_vis = 0
-                        if np.isnan(avg_sen): avg_sen = 0
-                        if np.isnan(avg_fea): avg_fea = 0
-                    else:
-                        avg_vis, avg_sen, avg_fea = 0, 0, 0
-                    
-                    def check_all_pass(row):
-                        mult = 1.0 
-                        return (row['VIS_SCALED'] > avg_vis * mult) and \
-                            (row['SEN_SCALED'] > avg_sen * mult) and \
-                            (row['FEA_SCALED'] > avg_fea * mult)
-
-                    candidates = merged[
-                        (merged.index != spot_name) & 
-                        (merged['CATEGORY'] != source_cat) & 
-                        (merged['CATEGORY'] != '기타')
-                    ]
-                    
-                    filtered = candidates[candidates.apply(check_all_pass, axis=1)]
-                    
-                    st.session_state['cross_result'] = filtered.sort_values(by='FINAL_SCORE', ascending=False)
-                    st.session_state['source_cat'] = source_cat
-                    st.session_state['debug_avg'] = (avg_vis, avg_sen, avg_fea)
+                cross = cross_category(spot_name)
+                if cross is not None:
+                    st.session_state['cross_result'], st.session_state['source_cat'], st.session_state['debug_avg'] = cross
                 else: st.warning("데이터 부족")
 
             if st.session_state['cross_result'] is not None:
@@ -981,7 +722,7 @@ else:
                 if not res_df.empty:
                     st.success(f"✅ 총 {len(res_df)}곳의 검증된 대체지가 발견되었습니다.")
                     for rank, (cand_name, row) in enumerate(res_df.iterrows(), 1):
-                        _, c_cong = get_active_time_stats(main_df, cand_name, 2024)
+                        _, c_cong = get_active_time_stats(cand_name, 2024)
                         c_cong_cls = "cong-bad" if c_cong in ['혼잡', '매우혼잡'] else ("cong-norm" if c_cong == '보통' else "cong-good")
                         tgt_cat = row['CATEGORY']
                         
@@ -1009,4 +750,30 @@ else:
                             </div>
                         </div>""", unsafe_allow_html=True)
                 else:
-                    st.warning(f"조건을 충족하는 cross-category 대체지가 없습니다.")
\ No newline at end of file
+                    st.warning(f"조건을 충족하는 cross-category 대체지가 없습니다.")
+# -----------------------------------------------------------------------------
+# 6. [관리자] 프로파일링 패널 (SLA_ADMIN=1)
+# -----------------------------------------------------------------------------
+LAST_RUN = finish_run()
+if ADMIN_MODE:
+    with st.sidebar:
+        if st.toggle("🛠 프로파일링", key="show_profiler"):
+            st.caption(f"리런 #{LAST_RUN['run']} · {LAST_RUN['total_s'] * 1000:.0f} ms (구간 시간은 안쪽 구간 포함)")
+            st.caption(f"데이터 버전 #{DATA['generation']} · {pd.Timestamp(DATA['loaded'], unit='s'):%m-%d %H:%M:%S} UTC"
+                       + (f" · 갱신 표 {', '.join(DATA['changed'])}" if DATA['generation'] > 1 else ""))
+            st.dataframe(pd.DataFrame(section_rows(LAST_RUN['sections'])), hide_index=True, use_container_width=True)
+            cache = cache_rows(LAST_RUN['cache'])
+            if cache: st.dataframe(pd.DataFrame(cache), hide_index=True, use_container_width=True)
+            with st.expander("최근 리런"):
+                st.dataframe(pd.DataFrame([{'run': r['run'], 'spot': r.get('spot'), 'total_ms': round(r['total_s'] * 1000, 1),
+                                            'interrupted': r['interrupted']} for r in PROFILE_RUNS if r['total_s'] is not None]),
+                             hide_index=True, use_container_width=True)
+            with st.expander("프로세스 누적 (백그라운드 작업 포함)"):
+                tot = totals()
+                st.dataframe(pd.DataFrame(section_rows(tot)), hide_index=True, use_container_width=True)
+                st.dataframe(pd.DataFrame(cache_rows(tot)), hide_index=True, use_container_width=True)
+            with st.expander("이미지 매칭"):
+                st.caption(f"사진 {len(IMAGE_INDEX['assets'])}곳 · 이름 변환 {len(IMAGE_INDEX['aliases'])}곳")
+                if IMAGE_INDEX['missing']: st.warning("사진 없음: " + ", ".join(IMAGE_INDEX['missing']))
+                if IMAGE_INDEX['orphans']: st.warning("관광지와 맞지 않는 사진: " + ", ".join(IMAGE_INDEX['orphans']))
+            st.download_button("⬇️ JSONL 내보내기", to_jsonl(PROFILE_RUNS), file_name="sla_profile.jsonl", mime="application/x-ndjson")
@@ -0,0 +1,252 @@
+import bisect
+import os
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# =============================================================================
+# [Prometheus 메트릭]
+# 외부 의존성 없이 Prometheus 텍스트 포맷(0.0.4)으로 내보내는 카운터/게이지/히스토그램입니다.
+# profiling.py 의 구간 계측/캐시 적중 기록과 리런 종료가 그대로 아래 메트릭으로 집계됩니다.
+#   sla_report_duration_seconds{report}        generate_* 호출 시간 (히스토그램)
+#   sla_llm_duration_seconds{mode}             LLM 호출 시간 (complete / stream, 캐시 적중 포함)
+#   sla_section_duration_seconds{section}      로더/혼잡도/유사도/차트 등 그 밖의 계측 구간
+#   sla_rerun_duration_seconds{interrupted}    Streamlit 리런 1회 시간
+#   sla_llm_tokens_total{kind}                 실제 API 호출의 prompt / completion 토큰 수
+#   sla_cache_requests_total{cache,result}     데이터 로더/LLM 응답 캐시 적중(hit)/미스(miss)
+#   sla_cache_hit_ratio{cache}                 위 카운터의 누적 적중률
+#   sla_sessions_started_total / sla_active_sessions
+#   sla_data_generation / sla_data_reloads_total{result}   datastore.py 데이터 묶음 버전과 백그라운드 갱신 결과
+# 사이드카 HTTP 엔드포인트: SLA_METRICS_PORT(기본 9108) 의 /metrics (0 이면 끔)
+#   curl http://127.0.0.1:9108/metrics
+# =============================================================================
+METRICS_PORT = int(os.getenv("SLA_METRICS_PORT", "9108"))
+METRICS_HOST = os.getenv("SLA_METRICS_HOST", "0.0.0.0")
+SESSION_ACTIVE_SECONDS = float(os.getenv("SLA_SESSION_ACTIVE_SECONDS", "300"))
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+REGISTRY = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs: return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _num(v):
+    if v == float("inf"): return "+Inf"
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self.lock:
+            return self.values.get(self._key(labels), 0)
+
+    def render(self):
+        with self.lock:
+            items = sorted(self.values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_num(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    # fn 이 있으면 수집 시점에 {라벨 튜플: 값} 을 계산
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labelnames=(), fn=None):
+        super().__init__(name, help_text, labelnames)
+        self.fn = fn
+
+    def set(self, value, **labels):
+        with self.lock:
+            self.values[self._key(labels)] = value
+
+    def render(self):
+        if self.fn is not None: items = sorted(self.fn().items())
+        else:
+            with self.lock:
+                items = sorted(self.values.items())
+        return self.header() + [f"{self.name}{_labels(self.labelnames, k)} {_num(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            counts, total = self.values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[i] += 1
+            self.values[key] = (counts, total + value)
+
+    def count(self, **labels):
+        with self.lock:
+            counts, _ = self.values.get(self._key(labels), ([0], 0.0))
+            return sum(counts)
+
+    def render(self):
+        with self.lock:
+            items = sorted((k, (list(c), s)) for k, (c, s) in self.values.items())
+        lines = self.header()
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, [('le', _num(bound))])} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_num(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+def render():
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+# -----------------------------------------------------------------------------
+# 앱 메트릭
+# -----------------------------------------------------------------------------
+REPORT_DURATION = Histogram("sla_report_duration_seconds", "generate_* call duration", ["report"])
+LLM_DURATION = Histogram("sla_llm_duration_seconds", "LLM call duration including response cache hits", ["mode"])
+SECTION_DURATION = Histogram("sla_section_duration_seconds", "Instrumented section duration (loaders, congestion, similarity, charts)", ["section"])
+RERUN_DURATION = Histogram("sla_rerun_duration_seconds", "Streamlit script rerun duration", ["interrupted"])
+LLM_TOKENS = Counter("sla_llm_tokens_total", "Tokens sent to / received from the LLM API (cache hits excluded)", ["kind"])
+PROMPT_OVER_BUDGET = Counter("sla_llm_prompt_over_budget_total", "Prompts whose system + fixed template alone exceed LLM_PROMPT_TOKEN_BUDGET (sent without data)")
+CACHE_REQUESTS = Counter("sla_cache_requests_total", "Cache lookups by result", ["cache", "result"])
+SESSIONS_STARTED = Counter("sla_sessions_started_total", "Browser sessions that ran the script at least once")
+DATA_GENERATION = Gauge("sla_data_generation", "Data bundle version currently served (increments on each hot reload)")
+DATA_RELOADS = Counter("sla_data_reloads_total", "Background data reloads by result", ["result"])
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _hit_ratios():
+    with CACHE_REQUESTS.lock:
+        values = dict(CACHE_REQUESTS.values)
+    caches = {cache for cache, _ in values}
+    out = {}
+    for cache in caches:
+        hit, miss = values.get((cache, "hit"), 0), values.get((cache, "miss"), 0)
+        if hit + miss: out[(cache,)] = hit / (hit + miss)
+    return out
+
+
+def _active_sessions():
+    cutoff = time.time() - SESSION_ACTIVE_SECONDS
+    with _sessions_lock:
+        for sid in [s for s, seen in _sessions.items() if seen < cutoff]: del _sessions[sid]
+        return {(): len(_sessions)}
+
+
+Gauge("sla_cache_hit_ratio", "Cumulative cache hit ratio", ["cache"], fn=_hit_ratios)
+Gauge("sla_active_sessions", f"Sessions with a rerun in the last SLA_SESSION_ACTIVE_SECONDS ({SESSION_ACTIVE_SECONDS:.0f}s)", fn=_active_sessions)
+
+
+def observe_section(name, elapsed):
+    # profiling 구간 이름 접두어로 메트릭 분류 (report.* / llm.* / 그 외)
+    group, _, rest = name.partition(".")
+    if group == "report": REPORT_DURATION.observe(elapsed, report=rest)
+    elif group == "llm": LLM_DURATION.observe(elapsed, mode=rest)
+    else: SECTION_DURATION.observe(elapsed, section=name)
+
+
+def observe_cache(name, hit):
+    CACHE_REQUESTS.inc(cache=name, result="hit" if hit else "miss")
+
+
+def observe_rerun(run):
+    RERUN_DURATION.observe(run['total_s'], interrupted=str(bool(run.get('interrupted'))).lower())
+
+
+def observe_tokens(prompt, completion):
+    LLM_TOKENS.inc(prompt, kind="prompt")
+    LLM_TOKENS.inc(completion, kind="completion")
+
+
+def observe_prompt_over_budget():
+    PROMPT_OVER_BUDGET.inc()
+
+
+def observe_data_reload(generation, ok=True):
+    # generation: 지금 서빙 중인 묶음 번호 (첫 로드는 result 없이 버전만 기록)
+    DATA_GENERATION.set(generation)
+    if generation > 1 or not ok: DATA_RELOADS.inc(result="ok" if ok else "error")
+
+
+def touch_session(session_id):
+    # 세션별 마지막 리런 시각 (처음 보는 세션이면 시작 카운터 증가)
+    with _sessions_lock:
+        new = session_id not in _sessions
+        _sessions[session_id] = time.time()
+    if new: SESSIONS_STARTED.inc()
+
+
+# -----------------------------------------------------------------------------
+# /metrics 사이드카 서버
+# -----------------------------------------------------------------------------
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args): pass
+
+    def do_GET(self):
+        if self.path.split("?")[0].rstrip("/") not in ("", "/metrics"):
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        out = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(out)))
+        self.end_headers()
+        self.wfile.write(out)
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_server(port=METRICS_PORT, host=METRICS_HOST):
+    # 프로세스당 1회 (포트 사용 중이면 None, 앱 동작에는 영향 없음)
+    global _server
+    with _server_lock:
+        if _server is None and port:
+            try: _server = ThreadingHTTPServer((host, port), _Handler)
+            except OSError: return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="sla-metrics", daemon=True).start()
+    return _server
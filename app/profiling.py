@@ -0,0 +1,174 @@
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+
+from metrics import observe_section, observe_cache, observe_rerun
+
+# =============================================================================
+# [구간 계측]
+# 로더/혼잡도 집계/유사도 계산/generate_* 호출의 소요 시간과 캐시 적중·미스를 리런 단위로 기록합니다.
+#   with timed("chart.trend"): ...        # 구간 계측 (중첩 시 바깥 구간은 안쪽 시간을 포함)
+#   @timed("report.spot_info_ai")          # 함수 계측, 제너레이터를 돌려주면 끝까지 소비될 때까지 계측
+#   @cached("load.table", st.cache_resource)       # 캐시 데코레이터 + 적중/미스 (본문이 실행되면 미스)
+#   count("llm.response_cache", hit)       # 그 밖의 캐시 적중/미스
+# 스크립트 스레드에서 start_run() ~ finish_run() 사이의 기록만 해당 리런에 남고,
+# 백그라운드 작업(프리페치 등)까지 포함한 누적값은 totals() 로 봅니다. (모든 기록은 metrics.py 로도 집계)
+#   SLA_PROFILE_LOG=/tmp/sla_profile.jsonl  -> 끝난 리런을 JSON Lines 로 추가 기록
+# =============================================================================
+PROFILE_LOG = os.getenv("SLA_PROFILE_LOG")
+PROFILE_HISTORY = int(os.getenv("SLA_PROFILE_HISTORY", "50"))
+
+_local = threading.local()
+_totals = {}
+_totals_lock = threading.Lock()
+_run_seq = [0]
+
+
+def _current():
+    return getattr(_local, 'run', None)
+
+
+def _record(name, elapsed):
+    run = _current()
+    if run is not None:
+        sec = run['sections'].setdefault(name, {'calls': 0, 'total_s': 0.0, 'max_s': 0.0})
+        sec['calls'] += 1
+        sec['total_s'] += elapsed
+        sec['max_s'] = max(sec['max_s'], elapsed)
+        run['last'] = time.perf_counter()
+    with _totals_lock:
+        tot = _totals.setdefault(name, {'calls': 0, 'total_s': 0.0, 'max_s': 0.0, 'hit': 0, 'miss': 0})
+        tot['calls'] += 1
+        tot['total_s'] += elapsed
+        tot['max_s'] = max(tot['max_s'], elapsed)
+    observe_section(name, elapsed)
+
+
+def count(name, hit):
+    run = _current()
+    if run is not None:
+        c = run['cache'].setdefault(name, {'hit': 0, 'miss': 0})
+        c['hit' if hit else 'miss'] += 1
+    with _totals_lock:
+        tot = _totals.setdefault(name, {'calls': 0, 'total_s': 0.0, 'max_s': 0.0, 'hit': 0, 'miss': 0})
+        tot['hit' if hit else 'miss'] += 1
+    observe_cache(name, hit)
+
+
+class timed:
+    # 컨텍스트 매니저 겸 데코레이터 (매 호출마다 새 인스턴스로 계측하므로 스레드 간 공유 가능)
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        _record(self.name, time.perf_counter() - self.t0)
+
+    def __call__(self, fn):
+        name = self.name
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            res = fn(*args, **kwargs)
+            if inspect.isgenerator(res): return _timed_gen(name, res, t0)
+            # (제너레이터, 부가값...) 튜플 반환 (예: generate_section_analysis(stream=True) -> (조각들, 색상))
+            if isinstance(res, tuple) and res and inspect.isgenerator(res[0]):
+                return (_timed_gen(name, res[0], t0), *res[1:])
+            _record(name, time.perf_counter() - t0)
+            return res
+        return wrapper
+
+
+def _timed_gen(name, gen, t0):
+    # 스트리밍 응답: 마지막 조각까지(또는 중단 시점까지) 걸린 시간
+    try: yield from gen
+    finally: _record(name, time.perf_counter() - t0)
+
+
+def cached(name, cache_decorator):
+    # cache_decorator(st.cache_resource / st.cache_data / lru_cache(...))로 감싸면서 적중/미스와 시간을 기록
+    def wrap(fn):
+        @functools.wraps(fn)
+        def body(*args, **kwargs):
+            _local.miss[-1] = True
+            return fn(*args, **kwargs)
+        cached_fn = cache_decorator(body)
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            stack = _local.__dict__.setdefault('miss', [])
+            stack.append(False)
+            t0 = time.perf_counter()
+            try: return cached_fn(*args, **kwargs)
+            finally:
+                _record(name, time.perf_counter() - t0)
+                count(name, not stack.pop())
+        for attr in ('clear', 'cache_info', 'cache_clear'):
+            if hasattr(cached_fn, attr): setattr(call, attr, getattr(cached_fn, attr))
+        return call
+    return wrap
+
+
+# -----------------------------------------------------------------------------
+# 리런 단위 기록
+# -----------------------------------------------------------------------------
+def _close(run, interrupted=False):
+    end = run.pop('last', None) if interrupted else time.perf_counter()
+    run['total_s'] = (end or run['t0']) - run.pop('t0')
+    run['interrupted'] = interrupted
+    run.pop('last', None)
+    observe_rerun(run)
+    if PROFILE_LOG:
+        try:
+            with open(PROFILE_LOG, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(run, ensure_ascii=False) + "\n")
+        except OSError: pass
+
+
+def start_run(history, **labels):
+    # history(세션별 deque)에 새 리런 기록을 추가. st.rerun() 으로 끊긴 이전 기록은 마지막 계측 시점까지로 닫음
+    for run in history:
+        if run.get('total_s') is None: _close(run, interrupted=True)
+    with _totals_lock:
+        _run_seq[0] += 1
+        seq = _run_seq[0]
+    run = {'run': seq, 'started': time.time(), **labels, 'total_s': None, 'sections': {}, 'cache': {},
+           't0': time.perf_counter()}
+    history.append(run)
+    _local.run = run
+    return run
+
+
+def finish_run():
+    run = _current()
+    _local.run = None
+    if run is not None and run.get('total_s') is None: _close(run)
+    return run
+
+
+def totals():
+    # 프로세스 누적 (모든 세션 + 백그라운드 스레드)
+    with _totals_lock:
+        return {k: dict(v) for k, v in _totals.items()}
+
+
+def section_rows(sections):
+    # 패널 표시용: 총 시간 내림차순 (sections = run['sections'] 또는 totals())
+    rows = [{'section': k, 'calls': v['calls'], 'total_ms': round(v['total_s'] * 1000, 1), 'max_ms': round(v['max_s'] * 1000, 1)}
+            for k, v in sections.items() if v['calls']]
+    return sorted(rows, key=lambda r: -r['total_ms'])
+
+
+def cache_rows(cache):
+    return [{'cache': k, 'hit': v['hit'], 'miss': v['miss']} for k, v in sorted(cache.items()) if v['hit'] or v['miss']]
+
+
+def to_jsonl(runs):
+    return "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in runs if r.get('total_s') is not None)
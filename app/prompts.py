@@ -0,0 +1,94 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+from metrics import observe_prompt_over_budget
+
+# =============================================================================
+# [프롬프트 데이터 압축]
+# generate_* 에 넘기는 데이터 블록을 고정 소수점 CSV + 요약 통계(최고/최저/평균/표준편차)로 만듭니다.
+# DataFrame.to_string()/dict repr 대신 항상 같은 형식이므로 입력 토큰이 줄고 캐시 키도 안정적입니다.
+#   LLM_PROMPT_TOKEN_BUDGET   호출 1회 입력(system + user) 토큰 상한, 넘으면 데이터 블록을 줄임
+#                             (고정 부분만으로 넘으면 데이터 없이 보내고 sla_llm_prompt_over_budget_total 증가)
+# =============================================================================
+PRECISION = 3
+LLM_PROMPT_TOKEN_BUDGET = int(os.getenv("LLM_PROMPT_TOKEN_BUDGET", "1500"))
+TRUNCATED_MARK = "...(생략)"
+
+_encoding = None
+
+
+def _fmt(v, precision=PRECISION):
+    if isinstance(v, (float, np.floating)):
+        return "nan" if np.isnan(v) else f"{v:.{precision}f}"
+    if isinstance(v, pd.Timestamp):
+        return v.strftime("%Y-%m-%d")
+    return str(v)
+
+
+def compact_frame(df, precision=PRECISION):
+    # 헤더 1줄 + 행마다 쉼표 구분, 실수는 고정 소수점
+    lines = [",".join(map(str, df.columns))]
+    lines += [",".join(_fmt(v, precision) for v in row) for row in df.itertuples(index=False)]
+    return "\n".join(lines)
+
+
+def series_stats(df, label_col, value_col, precision=PRECISION):
+    # 최고/최저 지점과 평균·표준편차 (표본 표준편차, 결측 제외)
+    s = pd.to_numeric(df[value_col], errors='coerce')
+    valid = s.notna()
+    if not valid.any(): return "stats: 데이터 없음"
+    s, labels = s[valid], df[label_col][valid]
+    peak, trough = s.to_numpy().argmax(), s.to_numpy().argmin()
+    std = s.std() if len(s) > 1 else 0.0
+    return (f"peak={_fmt(labels.iloc[peak])}({_fmt(s.iloc[peak], precision)}), "
+            f"trough={_fmt(labels.iloc[trough])}({_fmt(s.iloc[trough], precision)}), "
+            f"mean={_fmt(s.mean(), precision)}, std={_fmt(std, precision)}, n={len(s)}")
+
+
+def summarize_series(df, label_col, value_col, precision=PRECISION):
+    return f"{series_stats(df, label_col, value_col, precision)}\n{compact_frame(df[[label_col, value_col]], precision)}"
+
+
+def compact_dict(d, precision=PRECISION):
+    return "; ".join(f"{k}={_fmt(v, precision)}" for k, v in d.items())
+
+
+def count_tokens(text):
+    # tiktoken 이 있으면 정확히, 없으면 UTF-8 바이트 기반 보수적 추정 (한글 1자 ≈ 1토큰)
+    global _encoding
+    if tiktoken is not None:
+        if _encoding is None:
+            try: _encoding = tiktoken.get_encoding("o200k_base")
+            except Exception: _encoding = False
+        if _encoding: return len(_encoding.encode(text))
+    return len(text.encode("utf-8")) // 3 + 1
+
+
+def fit_tokens(text, budget):
+    # 예산을 넘으면 뒤쪽 줄부터 잘라내고 생략 표시 (요약 통계가 첫 줄에 오므로 유지됨)
+    if count_tokens(text) <= budget: return text
+    lines = text.split("\n")
+    while len(lines) > 1:
+        lines.pop()
+        candidate = "\n".join(lines + [TRUNCATED_MARK])
+        if count_tokens(candidate) <= budget: return candidate
+    return TRUNCATED_MARK
+
+
+def budgeted(build, data, system_prompt="", budget=LLM_PROMPT_TOKEN_BUDGET):
+    # build(data) -> user 메시지. 고정 부분을 뺀 나머지 예산 안으로 데이터 블록을 맞춤
+    fixed = count_tokens(system_prompt) + count_tokens(build(""))
+    if fixed >= budget:
+        # 템플릿 자체가 예산 초과: 줄일 수 있는 건 데이터뿐이므로 비우고 기록 (예산 설정/템플릿 점검 필요)
+        observe_prompt_over_budget()
+        print(f"[프롬프트 예산 초과] 고정 부분 {fixed} 토큰 >= 예산 {budget}, 데이터 블록 생략", file=sys.stderr)
+        return build("")
+    return build(fit_tokens(data, budget - fixed))
@@ -0,0 +1,74 @@
+import random
+import threading
+import time
+
+# =============================================================================
+# [레이트 리미터 / 서킷 브레이커]
+# 프로세스 전체(모든 Streamlit 세션)가 공유하는 호출 제어 도구입니다.
+#   TokenBucket      분당 허용량(요청 수, 토큰 수)을 넘지 않도록 대기
+#   CircuitBreaker   연속 실패가 쌓이면 일정 시간 호출을 차단하고, 이후 1건만 시험 호출
+# =============================================================================
+
+
+class TokenBucket:
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, amount=1.0, timeout=None):
+        # 필요한 양이 찰 때까지 대기, timeout 안에 얻지 못하면 False
+        amount = min(float(amount), self.capacity)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return True
+                wait = (amount - self.tokens) / self.rate
+            if deadline is not None and now + wait > deadline: return False
+            time.sleep(min(wait, 1.0))
+
+
+class CircuitBreaker:
+    def __init__(self, threshold=5, cooldown=30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        # closed: 통과 / open: 차단 / cooldown 경과(half-open): 시험 호출 1건만 통과
+        with self.lock:
+            if self.opened_at is None: return True
+            if time.monotonic() - self.opened_at < self.cooldown or self.trial: return False
+            self.trial = True
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.failures, self.opened_at, self.trial = 0, None, False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self.trial = False
+
+    def is_open(self):
+        with self.lock:
+            return self.opened_at is not None and (time.monotonic() - self.opened_at < self.cooldown or self.trial)
+
+
+def backoff_delay(attempt, base=1.0, cap=30.0, retry_after=None):
+    # 서버가 Retry-After 를 주면 그대로, 아니면 지수 백오프 + full jitter
+    if retry_after is not None: return min(retry_after, cap)
+    return random.uniform(0, min(cap, base * 2 ** attempt))
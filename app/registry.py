@@ -0,0 +1,69 @@
+import re
+
+from config import NAME_MAPPING
+
+# =============================================================================
+# [관광지 레지스트리]
+# 대표 이름 <-> 정수 ID 와 관광지별 지역구/카테고리/이미지 키를 한 곳에서 관리합니다.
+# 유사도 배열 등은 이름 대신 이 ID 로 인덱싱합니다.
+#   수집 단계: canonical_name("광안리 SUPZONE") -> "광안대교sup"   (snapshot.py 가 모든 관광지명 컬럼에 1회 적용)
+#   조회 단계: spot_id(registry, "안데르센 동화마을") -> ID            (별칭 키 해시 조회, O(1))
+# 별칭 키(alias_key)는 공백/밑줄 제거 + 소문자이며, 수집 파일명 접두/접미어(naver_blog_, _리뷰 등)와
+# 노트북의 "{지역구}_{파일명}" 접두어도 떼어냅니다. 대표 이름은 config.NAME_MAPPING 으로 정합니다.
+# =============================================================================
+CRAWL_AFFIXES = re.compile(r'naver_blog_|_stable|_재추출|_블로그|_리뷰|복사본')
+DISTRICT_PREFIX = re.compile(r'^[가-힣]+[구군]_')
+
+
+def alias_key(name):
+    key = DISTRICT_PREFIX.sub('', CRAWL_AFFIXES.sub('', str(name).strip()))
+    return re.sub(r'[\s_]+', '', key).casefold()
+
+
+# 별칭 키 -> 대표 이름 (매핑 원본 이름과 대표 이름 자신 모두 등록)
+ALIASES = {**{alias_key(v): v for v in NAME_MAPPING.values()}, **{alias_key(k): v for k, v in NAME_MAPPING.items()}}
+
+
+def canonical_name(name):
+    # NAME_MAPPING 에 없는 이름은 앞뒤 공백만 제거
+    return ALIASES.get(alias_key(name), str(name).strip())
+
+
+def build_registry(*name_sources, catalog=None, assets=()):
+    # name_sources: 관광지명 iterable 들 (대표 이름으로 바꾼 뒤 합집합 -> 이름순 ID)
+    # catalog: CATEGORY_INFO 표 (관광지명/지역구명/카테고리), assets: 이미지 파일명(확장자 제외)들
+    has_catalog = catalog is not None and not catalog.empty and '관광지명' in catalog.columns
+    sources = list(name_sources) + ([catalog['관광지명']] if has_catalog else [])
+    names = sorted({canonical_name(n) for source in sources for n in source if isinstance(n, str) and n.strip()})
+    ids = {n: i for i, n in enumerate(names)}
+    aliases = {alias_key(n): i for n, i in ids.items()}
+    for key, name in ALIASES.items():
+        if name in ids: aliases.setdefault(key, ids[name])
+
+    district, category, asset = [None] * len(names), ['기타'] * len(names), [None] * len(names)
+    if has_catalog:
+        for row in catalog.itertuples(index=False):
+            sid = ids.get(canonical_name(row.관광지명)) if isinstance(row.관광지명, str) else None
+            if sid is None: continue
+            if district[sid] is None and isinstance(getattr(row, '지역구명', None), str): district[sid] = row.지역구명.strip()
+            if category[sid] == '기타' and isinstance(getattr(row, '카테고리', None), str): category[sid] = row.카테고리.strip()
+    for stem in assets:
+        sid = aliases.get(alias_key(canonical_name(stem)))
+        if sid is not None and asset[sid] is None: asset[sid] = stem
+    return {'names': names, 'ids': ids, 'aliases': aliases, 'district': district, 'category': category, 'asset': asset}
+
+
+def spot_id(registry, name):
+    # 대표 이름이면 바로, 아니면 별칭 키로 조회 (없으면 None)
+    sid = registry['ids'].get(name)
+    if sid is None and isinstance(name, str): sid = registry['aliases'].get(alias_key(name))
+    return sid
+
+
+def spot_name(registry, sid):
+    return registry['names'][sid]
+
+
+def category_map(registry):
+    # {대표 이름: 카테고리} (카탈로그에 없는 관광지는 '기타')
+    return dict(zip(registry['names'], registry['category']))
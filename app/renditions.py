@@ -0,0 +1,245 @@
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import time
+from urllib.parse import quote
+
+from config import IMAGE_DIR, RENDITION_DIR
+from registry import alias_key, canonical_name
+
+# =============================================================================
+# [이미지 파생본]
+# images/*.jpg 원본(약 400KB, 최대 1440x1800)을 화면 슬롯별 고정 폭으로 줄여 WebP + JPEG 로 미리 만들어 둡니다.
+# 파일명에 내용 해시를 넣어(이름.폭w.해시.확장자) 원본이 바뀌면 새 파일명이 되며, 같은 원본은 다시 인코딩하지 않습니다.
+#   빌드: python renditions.py            (Dockerfile 에서 이미지 복사 후 1회)
+#   앱:   rendition_path(manifest, "감천문화마을", "card") -> 슬롯에 맞는 파일 경로 (없으면 원본), 렌더링에는 아래 자산 인덱스 사용
+# [정적 배포] SLA_STATIC_DIR 이 있으면 해시 파일을 그 폴더로 복사(publish)하고, 앱은 SLA_STATIC_URL 아래 URL 로 참조합니다.
+#   nginx 가 그 폴더를 직접 서빙(Cache-Control: immutable + ETag)하므로 이미지 바이트가 웹소켓/파이썬 워커를 거치지 않습니다.
+#   파일명이 내용 해시라 덮어쓰기가 없고, 이전 배포 파일도 지우지 않습니다 (열려 있는 페이지가 계속 참조 가능).
+# [자산 인덱스] build_asset_index(관광지명들, manifest) -> {관광지명: {슬롯: URL/경로}} 를 시작 시 1회 계산
+#   폴더는 한 번씩만 읽고, 파일명은 레지스트리 별칭 규칙(공백 무시 + NAME_MAPPING)으로 관광지명과 맞춥니다.
+#   ('광안리 SUPZONE.jpg' -> 광안대교sup, '안데르센 동화마을.jpg' -> 안데르센동화마을, '석당박물관.jpg' -> 동아대석당박물관)
+#   python renditions.py --report   # 사진 없는 관광지(missing) / 관광지와 맞지 않는 사진(orphans) 출력
+# =============================================================================
+MANIFEST_VERSION = 2
+MANIFEST_NAME = "manifest.json"
+SOURCE_EXTS = ('.jpg', '.jpeg', '.png', '.webp')
+
+# 슬롯별 최대 폭(px, 레티나 2배 기준). 원본이 더 작으면 원본 폭 그대로
+RENDITIONS = {
+    'thumb': 320,   # OTHER CANDIDATES 등 작은 카드
+    'card': 640,    # ABOUT 패널, 2/3순위 카드
+    'hero': 1024,   # 1순위 대체지 대표 이미지
+}
+FORMATS = {'webp': dict(format='WEBP', quality=80, method=4), 'jpeg': dict(format='JPEG', quality=82, optimize=True, progressive=True)}
+PREFERRED_FORMAT = os.getenv("SLA_IMAGE_FORMAT", "webp")
+STATIC_DIR = os.getenv("SLA_STATIC_DIR")
+STATIC_URL = os.getenv("SLA_STATIC_URL")   # 예: /static-img/
+ORIGINAL_SLOT = 'original'                 # 원본도 해시 이름으로 함께 배포 (파생본이 없는 슬롯의 대체)
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _encode(img, width, fmt):
+    from PIL import Image
+    if img.width > width:
+        img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+    buf = io.BytesIO()
+    img.save(buf, **FORMATS[fmt])
+    return buf.getvalue(), img.size
+
+
+def _renditions_for(path, stem, digest, out_dir):
+    # 원본 1장 -> 슬롯 x 포맷 파일들 (EXIF 회전 반영, 확장자와 실제 포맷이 달라도 내용 기준으로 읽음)
+    from PIL import Image, ImageOps
+    with Image.open(path) as src:
+        real_fmt = (src.format or 'jpeg').lower()
+        img = ImageOps.exif_transpose(src).convert("RGB")
+    ext = {'jpeg': 'jpg'}.get(real_fmt, real_fmt)
+    orig_name = f"{stem}.orig.{digest[:12]}.{ext}"
+    shutil.copyfile(path, os.path.join(out_dir, orig_name))
+    entry = {ORIGINAL_SLOT: {real_fmt: {'file': orig_name, 'width': img.width, 'height': img.height, 'bytes': os.path.getsize(path)}}}
+    for slot, width in RENDITIONS.items():
+        entry[slot] = {}
+        for fmt in FORMATS:
+            data, (w, h) = _encode(img, width, fmt)
+            name = f"{stem}.{w}w.{digest[:12]}.{'jpg' if fmt == 'jpeg' else fmt}"
+            with open(os.path.join(out_dir, name), 'wb') as f:
+                f.write(data)
+            entry[slot][fmt] = {'file': name, 'width': w, 'height': h, 'bytes': len(data)}
+    return entry
+
+
+def build_renditions(image_dir=IMAGE_DIR, out_dir=RENDITION_DIR, force=False):
+    # 원본 해시가 같고 파일이 남아 있으면 재사용, 나머지만 인코딩 -> manifest 교체
+    os.makedirs(out_dir, exist_ok=True)
+    old = {} if force else (read_manifest(out_dir) or {}).get('images', {})
+    manifest = {'version': MANIFEST_VERSION, 'created': time.time(), 'widths': RENDITIONS, 'images': {}}
+    sources = sorted(f for f in os.listdir(image_dir) if f.lower().endswith(SOURCE_EXTS)) if os.path.isdir(image_dir) else []
+    built = 0
+    for fname in sources:
+        path = os.path.join(image_dir, fname)
+        stem = os.path.splitext(fname)[0]
+        with open(path, 'rb') as f:
+            digest = _sha256(f.read())
+        prev = old.get(stem)
+        if prev and prev['sha256'] == digest and all(os.path.exists(os.path.join(out_dir, r['file']))
+                                                     for slot in prev['renditions'].values() for r in slot.values()):
+            manifest['images'][stem] = prev
+            continue
+        try: renditions = _renditions_for(path, stem, digest, out_dir)
+        except Exception as e:
+            print(f"[실패] {fname}: {e}")
+            continue
+        manifest['images'][stem] = {'source': fname, 'sha256': digest, 'bytes': os.path.getsize(path), 'renditions': renditions}
+        built += 1
+
+    tmp = os.path.join(out_dir, f"{MANIFEST_NAME}.tmp-{os.getpid()}")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, os.path.join(out_dir, MANIFEST_NAME))
+
+    # manifest 에 없는 이전 해시 파일 정리
+    keep = {r['file'] for img in manifest['images'].values() for slot in img['renditions'].values() for r in slot.values()}
+    for f in os.listdir(out_dir):
+        if f not in keep and f != MANIFEST_NAME and not f.startswith(MANIFEST_NAME): os.remove(os.path.join(out_dir, f))
+    return manifest, built
+
+
+def read_manifest(out_dir=RENDITION_DIR):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != MANIFEST_VERSION: return None
+    return manifest
+
+
+def rendition_path(manifest, stem, slot, fmt=PREFERRED_FORMAT, out_dir=RENDITION_DIR, image_dir=IMAGE_DIR):
+    # 슬롯에 맞는 파생본 경로, 파생본이 없으면 원본 jpg, 그것도 없으면 None
+    image = (manifest or {}).get('images', {}).get(stem)
+    if image is not None:
+        slot_entry = image['renditions'].get(slot, {})
+        rendition = slot_entry.get(fmt) or next(iter(slot_entry.values()), None)
+        if rendition is not None:
+            path = os.path.join(out_dir, rendition['file'])
+            if os.path.exists(path): return path
+    path = os.path.join(image_dir, f"{stem}.jpg")
+    return path if os.path.exists(path) else None
+
+
+def rendition_url(manifest, stem, slot, fmt=PREFERRED_FORMAT, base_url=STATIC_URL):
+    # 정적 배포 URL (파생본 -> 원본 순), 배포 설정이 없거나 이미지가 없으면 None
+    image = (manifest or {}).get('images', {}).get(stem)
+    if not base_url or image is None: return None
+    for key in (slot, ORIGINAL_SLOT):
+        slot_entry = image['renditions'].get(key, {})
+        rendition = slot_entry.get(fmt) or next(iter(slot_entry.values()), None)
+        if rendition is not None: return base_url.rstrip("/") + "/" + quote(rendition['file'])
+    return None
+
+
+def publish(manifest, static_dir=STATIC_DIR, out_dir=RENDITION_DIR):
+    # 해시 파일을 정적 폴더로 복사 (이미 있으면 같은 내용이므로 건너뜀, 임시 파일 -> rename 으로 반쯤 쓴 파일 노출 방지)
+    if not static_dir or not manifest: return 0
+    os.makedirs(static_dir, exist_ok=True)
+    copied = 0
+    for image in manifest['images'].values():
+        for slot in image['renditions'].values():
+            for r in slot.values():
+                dst = os.path.join(static_dir, r['file'])
+                if os.path.exists(dst): continue
+                tmp = f"{dst}.tmp-{os.getpid()}"
+                shutil.copyfile(os.path.join(out_dir, r['file']), tmp)
+                os.replace(tmp, dst)
+                copied += 1
+    return copied
+
+
+def _match_key(name):
+    return alias_key(canonical_name(name))
+
+
+def _listdir(path):
+    return os.listdir(path) if os.path.isdir(path) else []
+
+
+def source_stems(image_dir=IMAGE_DIR):
+    # 원본 사진 파일명(확장자 제외) -> 레지스트리 이미지 키
+    return [os.path.splitext(f)[0] for f in sorted(_listdir(image_dir)) if f.lower().endswith(SOURCE_EXTS)]
+
+
+def build_asset_index(registry, manifest, image_dir=IMAGE_DIR, out_dir=RENDITION_DIR, base_url=STATIC_URL):
+    # 레지스트리 spot_id 별 슬롯 -> 정적 URL (배포 시) / 파생본 경로 / 원본 경로. 렌더링 시에는 dict 조회만 하면 됨
+    # 사진 파일명도 레지스트리 별칭 키로 ID 에 붙이므로 같은 관광지의 이름 변형은 모두 같은 사진을 가리킴
+    sources = {os.path.splitext(f)[0]: f for f in sorted(_listdir(image_dir)) if f.lower().endswith(SOURCE_EXTS)}
+    on_disk = set(_listdir(out_dir))
+    images = (manifest or {}).get('images', {})
+    stems = {}
+    for stem in list(sources) + [s for s in images if s not in sources]:
+        sid = registry['aliases'].get(_match_key(stem))
+        if sid is not None: stems.setdefault(sid, stem)
+
+    def resolve(stem, slot):
+        url = rendition_url(manifest, stem, slot, base_url=base_url)
+        if url: return url
+        slot_entry = images.get(stem, {}).get('renditions', {}).get(slot, {})
+        rendition = slot_entry.get(PREFERRED_FORMAT) or next(iter(slot_entry.values()), None)
+        if rendition is not None and rendition['file'] in on_disk: return os.path.join(out_dir, rendition['file'])
+        return os.path.join(image_dir, sources[stem]) if stem in sources else None
+
+    assets = {sid: {slot: resolve(stem, slot) for slot in (*RENDITIONS, ORIGINAL_SLOT)} for sid, stem in stems.items()}
+    aliases = {registry['names'][sid]: stem for sid, stem in stems.items() if stem != registry['names'][sid]}
+    missing = [name for sid, name in enumerate(registry['names']) if sid not in assets]
+    # 레지스트리에 없는 사진 + 같은 관광지의 두 번째 이후 사진
+    orphans = sorted((set(sources) | set(images)) - set(stems.values()))
+    return {'assets': assets, 'aliases': aliases, 'missing': missing, 'orphans': orphans}
+
+
+def asset_for(index, sid, slot):
+    # sid: registry.spot_id(...) 결과 (레지스트리에 없는 관광지면 None -> 사진 없음)
+    return index['assets'].get(sid, {}).get(slot)
+
+
+def summary(manifest):
+    # 원본 대비 슬롯/포맷별 총 용량
+    images = manifest['images'].values()
+    rows = {'source': sum(i['bytes'] for i in images)}
+    for slot in RENDITIONS:
+        for fmt in FORMATS:
+            rows[f"{slot}.{fmt}"] = sum(i['renditions'][slot][fmt]['bytes'] for i in images if slot in i['renditions'])
+    return rows
+
+
+if __name__ == "__main__":
+    if "--report" in sys.argv[1:]:
+        # 데이터에 등장하는 관광지명으로 만든 레지스트리 기준 사진 매칭 결과
+        from registry import build_registry
+        from snapshot import read_manifest as read_snapshot, load_table
+        snap = read_snapshot()
+        names = set()
+        for key, col in (("MAIN_DATA", '관광지명'), ("CATEGORY_INFO", '관광지명'), ("IMG_MATRIX_DATA", '관광지명')):
+            df = load_table(key, snap)
+            if col in df.columns: names.update(df[col].dropna().astype(str).unique())
+        registry = build_registry(names)
+        index = build_asset_index(registry, read_manifest())
+        print(f"[매칭] 관광지 {len(registry['names'])}곳 중 {len(index['assets'])}곳 사진 있음 (이름 변환 {len(index['aliases'])}곳)")
+        for name, stem in sorted(index['aliases'].items()): print(f"  {name} <- {stem}")
+        print(f"[missing] {len(index['missing'])}곳: {', '.join(index['missing'])}")
+        print(f"[orphans] {len(index['orphans'])}장: {', '.join(index['orphans'])}")
+        sys.exit(1 if index['missing'] or index['orphans'] else 0)
+    force = "--force" in sys.argv[1:]
+    if "--clean" in sys.argv[1:]: shutil.rmtree(RENDITION_DIR, ignore_errors=True)
+    t0 = time.perf_counter()
+    manifest, built = build_renditions(force=force)
+    print(f"[완료] {len(manifest['images'])}장 (새로 인코딩 {built}장, {time.perf_counter() - t0:.1f}s) -> {RENDITION_DIR}")
+    if "--publish" in sys.argv[1:]:
+        print(f"[배포] {publish(manifest)}개 파일 -> {STATIC_DIR}")
+    for key, size in summary(manifest).items():
+        print(f"  {key:<12} {size / 2 ** 20:>7.2f} MB")
@@ -0,0 +1,186 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from openai import RateLimitError
+
+from llm import chat_completion, chat_completion_stream, backend_available, LLMUnavailable
+from profiling import timed
+from prompts import compact_frame, compact_dict, budgeted
+
+# =============================================================================
+# [AI 리포트] generate_* 프롬프트 모음 (Streamlit 없이도 호출 가능: 캐시 워밍업 CLI 등)
+#   워밍업: python reports.py warmup   -> 전체 관광지 ABOUT 텍스트를 공유 캐시에 미리 생성
+#   stream=True 로 호출하면 완성된 문자열 대신 토큰 조각을 내보내는 제너레이터를 반환합니다.
+# =============================================================================
+# [페르소나 정의]
+AI_SYSTEM_PROMPT = """
+당신은 날카롭고 깊이 있는 통찰력을 가진 수석 데이터 분석가입니다.
+'분석하겠습니다', '결과입니다', '안녕하세요' 같은 형식적인 서론을 일절 생략하고, 즉시 핵심 수치와 그 이면의 의미를 파고드십시오.
+문장은 명료하되 내용은 심층적이어야 하며, 분량은 충분히 길고 자세하게 작성하십시오.
+톤은 전문적이고 냉철한 존댓말(~입니다/합니다)을 유지하십시오.
+"""
+
+
+class ReportUnavailable(str):
+    # 생성 실패 시 돌려주는 안내 문구: 화면에는 표시하되 답변으로 저장(세션/캐시)하지 않음
+    pass
+
+def unavailable(e):
+    if isinstance(e, (LLMUnavailable, RateLimitError)):
+        return ReportUnavailable("⚠️ AI 분석 요청이 많아 잠시 생성할 수 없습니다. 잠시 후 다시 시도해 주십시오.")
+    return ReportUnavailable("⚠️ AI 분석을 생성하지 못했습니다. 잠시 후 다시 시도해 주십시오.")
+
+def _messages(user_msg):
+    return [{"role": "system", "content": AI_SYSTEM_PROMPT}, {"role": "user", "content": user_msg}]
+
+def _respond(user_msg, stream=False):
+    # 완성된 문자열(기본) 또는 토큰 제너레이터(stream=True). 실패 시 ReportUnavailable
+    messages = _messages(user_msg)
+    if stream: return _stream_respond(messages)
+    try: return chat_completion(messages, temperature=0.3)
+    except Exception as e: return unavailable(e)
+
+def _stream_respond(messages):
+    # 중간에 실패하면 마지막 조각으로 ReportUnavailable 을 내보냄 (받는 쪽은 부분 텍스트를 버림)
+    try: yield from chat_completion_stream(messages, temperature=0.3)
+    except Exception as e: yield unavailable(e)
+
+@timed("report.spot_info_ai")
+def generate_spot_info_ai(spot_name, stream=False):
+    if not backend_available(): return "API Key Missing"
+    return _respond(f"'{spot_name}'의 위치, 주요 특징, 역사적/문화적 배경을 심층적으로 서술하십시오.", stream)
+
+@timed("report.visual_rank1_analysis")
+def generate_visual_rank1_analysis(spot_name, rank1_name, rank1_score, avg_score, rank1_congestion, stream=False):
+    if not backend_available(): return "API Key Missing"
+    
+    score_diff = rank1_score - avg_score
+    score_eval = f"평균({avg_score:.2f})보다 {score_diff:+.2f}점 높음" if score_diff > 0 else "평균 이하"
+    
+    policy_guide = ""
+    if rank1_congestion in ["혼잡", "매우혼잡"]:
+        policy_guide = "해당 대체지 역시 현재 '포화 상태'입니다. 이곳으로의 유입 유도는 풍선 효과를 초래하므로 정책적으로 '부적절'합니다."
+    else:
+        policy_guide = "해당 대체지는 현재 '수용 여력'이 충분합니다. 이곳으로의 유입 유도는 분산 정책상 '타당'합니다."
+
+    user_msg = f"""
+    [분석 대상]: {spot_name}
+    [시각적 대체지 1위]: {rank1_name}
+    [데이터]: 유사도 {rank1_score:.4f} ({score_eval}), 혼잡도 '{rank1_congestion}'
+    
+    [지시사항]
+    당신은 엄격한 데이터 분석가입니다. 인사말(안녕하세요 등)을 생략하고 바로 분석 내용을 서술하십시오. 정중한 존댓말(~입니다/합니다)을 사용하십시오.
+    
+    1. **대체지 기본 정보**: {rank1_name}이 어떤 곳인지 간략히 설명하십시오.
+    2. **유사도 평가**: 전체 평균 대비 유사도 수준을 수치와 함께 객관적으로 서술하십시오.
+    3. **수용력 진단**: 대체지의 현재 혼잡도를 근거로, 분산 수용 가능 여부를 냉정하게 판정하십시오.
+    
+    (참고 가이드: {policy_guide})
+    """
+    return _respond(user_msg, stream)
+
+@timed("report.strategic_analysis")
+def generate_strategic_analysis(source, candidates_data, anal_type="text", stream=False):
+    if not backend_available(): return "⚠️ API Key Missing"
+    candidates_text = compact_frame(pd.DataFrame(candidates_data, columns=['rank', 'name', 'score', 'congestion']), precision=4) if candidates_data else "(후보 없음)"
+    
+    build = lambda data: f"""
+    [분석 대상]: {source.get('name', 'Unknown')} (현재 혼잡도: {source.get('congestion', 'Unknown')})
+    [분석 유형]: {anal_type} 기반 유사도 후보군
+    {data}
+    
+    [추가 정보]
+    {compact_dict(source, precision=4)}
+
+    [요청사항]
+    데이터 분석가 입장에서 진단하십시오. 인사말을 절대 하지 마십시오. 반드시 존댓말(~입니다/합니다)을 사용하십시오.
+    
+    1. 유사도가 높으면서 혼잡도가 '쾌적/보통'인 곳을 **'유효 대체지'**로 분류하십시오.
+    2. 유사도가 높더라도 혼잡도가 '혼잡/매우혼잡'인 곳은 **'대체 불가(포화)'**로 명시하십시오.
+    3. 오직 데이터에 근거하여 분산 가능성 여부만 객관적으로 서술하십시오. (추상적 전략 제안 금지)
+    """
+    user_msg = budgeted(build, candidates_text, AI_SYSTEM_PROMPT)
+    return _respond(user_msg, stream)
+
+@timed("report.weighted_insight")
+def generate_weighted_insight(spot_name, top_cand, weights, stream=False):
+    if not backend_available(): return "API Key Missing"
+    user_msg = f"""
+    [User Preferences - Weighted Priority]
+    - Visual: {weights[0]}
+    - Sentiment: {weights[1]}
+    - Feature: {weights[2]}
+    
+    [Result]
+    - Source: {spot_name}
+    - Recommended: {top_cand['name']}
+    - Scores: V({top_cand['raw_v']:.2f}), S({top_cand['raw_s']:.2f}), F({top_cand['raw_f']:.2f})
+    
+    [Task]
+    Explain clearly and deeply why this spot was selected based on data scores. 
+    No greetings. Start immediately.
+    Use polite Korean (Honorifics).
+    Max 5 sentences.
+    """
+    return _respond(user_msg, stream)
+
+@timed("report.section_analysis")
+def generate_section_analysis(section_type, spot_name, year, data_summary, congestion_stage, ranking_info="정보 없음", stream=False):
+    if not backend_available(): return "⚠️ API Key Missing"
+    
+    tone_guide = ""
+    if congestion_stage in ["쾌적", "보통"]:
+        tone_guide = """
+        [Diagnosis]: 수용 여력 충분 (Under Capacity).
+        [Implication]: 데이터상 관광객 추가 유입이 가능하며, 분산 정책의 수용지(Destination)로서 적합함.
+        """
+    else: # 혼잡, 매우혼잡
+        tone_guide = """
+        [Diagnosis]: 수용 한계 초과 (Over Capacity).
+        [Implication]: 데이터상 추가 유입 시 혼잡도 임계치를 넘음. 분산 정책의 대상지(Source)로 분류되어야 함.
+        """
+
+    build = lambda data: f"""
+    [Target]: {spot_name} ({year})
+    [Type]: {section_type} Analysis
+    [Status]: {congestion_stage}
+    [Ranking]: {ranking_info}
+    [Data]:
+    {data}
+    
+    [Instruction]
+    You are a strict Data Analyst evaluating urban data.
+    Do NOT use greetings (Hello, etc). Start analysis directly.
+    Do NOT propose marketing strategies or vague improvements.
+    Use polite Korean (Honorifics, ~입니다/합니다).
+    
+    {tone_guide}
+    
+    1. **Quantify**: Use the ranking info (Top X%) to define the spot's relative density clearly.
+    2. **Analyze**: Interpret the volatility (standard deviation/peaks) and seasonality patterns in depth.
+    3. **Conclude**: Diagnose the 'Capacity' status strictly based on data.
+    """
+    msg = budgeted(build, data_summary, AI_SYSTEM_PROMPT)
+    
+    if stream: return _respond(msg, stream=True), "#0F172A"
+    try:
+        return chat_completion(_messages(msg), temperature=0.3), "#0F172A"
+    except Exception as e: return unavailable(e), "#000"
+
+
+def warmup_spot_info(spot_names, max_workers=4):
+    # ABOUT 텍스트를 병렬로 미리 생성하여 공유 캐시에 채움 (이미 캐시된 항목은 네트워크 호출 없음)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for name, text in zip(spot_names, pool.map(generate_spot_info_ai, spot_names)):
+            print(f"[{'완료' if text != 'API Key Missing' and not isinstance(text, ReportUnavailable) else '실패'}] {name}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["warmup"]:
+        from snapshot import load_table
+        cat_df = load_table("CATEGORY_INFO")
+        warmup_spot_info(sorted(cat_df['관광지명'].dropna().unique()) if not cat_df.empty else [])
+    else:
+        print("usage: python reports.py warmup")
@@ -0,0 +1,272 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from profiling import timed, cached
+from registry import build_registry, spot_id
+
+# =============================================================================
+# [유사도 텐서]
+# VIS/SEN/FEA 스케일 점수를 [3, N, N] float32 배열 하나로 보관합니다. (tensor[c, 기준, 비교])
+# 데이터가 없는 쌍은 NaN 이며, 가중 점수 계산 시 0 으로 취급합니다. (기존 fillna(0) 과 동일)
+# =============================================================================
+CHANNELS = ['VIS_SCALED', 'SEN_SCALED', 'FEA_SCALED']
+
+
+def _min_max(values):
+    v_min, v_max = np.nanmin(values), np.nanmax(values)
+    return (values - v_min) / (v_max - v_min + 1e-9)
+
+
+def _long_pairs(df_vis, df_sen, df_fea):
+    # 세 소스를 (기준, 비교, 스케일 점수) 형태로 통일
+    pairs = []
+    if not df_vis.empty:
+        vis_long = df_vis.set_index(df_vis.columns[0]).stack().reset_index()
+        vis_long.columns = ['기준_관광지', '비교_대상', 'RAW']
+        pairs.append(vis_long)
+    else: pairs.append(None)
+    for df, col in [(df_sen, 'SBERT_유사도(가중적용)'), (df_fea, '최종_유사도')]:
+        if not df.empty and col in df.columns:
+            pairs.append(df[['기준_관광지', '비교_대상', col]].rename(columns={col: 'RAW'}))
+        else: pairs.append(None)
+    for p in pairs:
+        if p is None: continue
+        p['RAW'] = pd.to_numeric(p['RAW'], errors='coerce')
+        p.dropna(subset=['기준_관광지', '비교_대상', 'RAW'], inplace=True)
+    return pairs
+
+
+def _pair_names(pairs):
+    return [np.concatenate([p['기준_관광지'].to_numpy(), p['비교_대상'].to_numpy()]) for p in pairs if p is not None]
+
+
+def pair_names(df_vis, df_sen, df_fea):
+    # 유사도 표 3종에 나오는 관광지명 (레지스트리 구성용)
+    return _pair_names(_long_pairs(df_vis, df_sen, df_fea))
+
+
+@timed("similarity.build_tensor")
+def build_similarity(df_vis, df_sen, df_fea, registry=None):
+    # registry 를 주면 그 ID 공간(카탈로그 전체)을 사용, 유사도 데이터가 없는 관광지는 NaN 행/열 (후보에서 제외됨)
+    pairs = _long_pairs(df_vis, df_sen, df_fea)
+    names = _pair_names(pairs)
+    if registry is None: registry = build_registry(*names)
+    lookup = {name: spot_id(registry, name) for source in names for name in pd.unique(source)}
+    n = len(registry['names'])
+    tensor = np.full((len(CHANNELS), n, n), np.nan, dtype=np.float32)
+    for c, p in enumerate(pairs):
+        if p is None or p.empty: continue
+        p = p.assign(SCALED=_min_max(p['RAW'].to_numpy(dtype=np.float64)))
+        # 같은 (기준, 비교) 쌍이 여러 번 나오면 첫 행 사용 (기존 drop_duplicates 와 동일)
+        p = p.drop_duplicates(['기준_관광지', '비교_대상'])
+        src, tgt = p['기준_관광지'].map(lookup), p['비교_대상'].map(lookup)
+        ok = (src.notna() & tgt.notna()).to_numpy()
+        tensor[c, src[ok].astype(int).to_numpy(), tgt[ok].astype(int).to_numpy()] = p['SCALED'].to_numpy()[ok]
+    return {'registry': registry, 'tensor': tensor}
+
+
+def source_scores(sim, name, exclude_self=True):
+    # 기준 관광지 1곳의 [3, N] 점수(결측 0)와 후보 마스크(세 지표 중 하나라도 존재하는 비교 대상)
+    sid = spot_id(sim['registry'], name)
+    if sid is None: return None, None
+    rows = sim['tensor'][:, sid, :]
+    candidates = ~np.isnan(rows).all(axis=0)
+    if exclude_self: candidates[sid] = False
+    return np.nan_to_num(rows), candidates
+
+
+def weighted_scores(rows, weights):
+    # 가중 합 = 벡터 내적 한 번, weights 는 (w_vis, w_sen, w_fea)
+    w = np.asarray(weights, dtype=np.float32)
+    total_w = w.sum() or 1
+    return (w @ rows) / total_w
+
+
+def top_k_ids(scores, candidates, k):
+    # argpartition 으로 상위 k 개만 고른 뒤 그 안에서만 정렬
+    ids = np.flatnonzero(candidates)
+    if len(ids) == 0: return ids
+    if len(ids) > k:
+        ids = ids[np.argpartition(-scores[ids], k - 1)[:k]]
+    return ids[np.argsort(-scores[ids], kind='stable')]
+
+
+def scores_frame(sim, rows, scores, ids):
+    # UI 표시용 소규모 프레임 (index=비교 관광지, 기존 merged 와 같은 컬럼 구성)
+    names = [sim['registry']['names'][i] for i in ids]
+    frame = pd.DataFrame(rows[:, ids].T, index=names, columns=CHANNELS)
+    frame['FINAL_SCORE'] = scores[ids]
+    return frame
+
+
+# -----------------------------------------------------------------------------
+# [가중 추천 API] UI 밖에서도(향후 HTTP 엔드포인트 등) 호출 가능한 top-k 추천
+# -----------------------------------------------------------------------------
+def normalize_weights(weights, ndigits=6):
+    # 합이 1 이 되도록 정규화 (50/30/20 과 5/3/2 는 같은 캐시 키)
+    w = np.asarray(weights, dtype=np.float64)
+    total = w.sum()
+    if total <= 0: return tuple(0.0 for _ in w)
+    return tuple(round(float(x), ndigits) for x in w / total)
+
+
+def make_recommender(sim, category_map=None, maxsize=1024):
+    category_map = category_map or {}
+    names = sim['registry']['names']
+    categories = np.array([category_map.get(n, '기타') for n in names], dtype=object)
+
+    @cached("similarity.recommend", lru_cache(maxsize=maxsize))
+    def _recommend(spot, weights, k, exclude_same_category):
+        rows, candidates = source_scores(sim, spot)
+        if rows is None: return ()
+        if exclude_same_category:
+            candidates = candidates & (categories != category_map.get(spot, '기타'))
+        scores = weighted_scores(rows, weights)
+        return tuple((names[i], float(scores[i]), *map(float, rows[:, i])) for i in top_k_ids(scores, candidates, k))
+
+    def recommend(spot, weights, k=5, exclude_same_category=False):
+        # 반환: [{'name', 'FINAL_SCORE', 'VIS_SCALED', 'SEN_SCALED', 'FEA_SCALED'}, ...] (점수 내림차순)
+        res = _recommend(spot, normalize_weights(weights), int(k), bool(exclude_same_category))
+        return [dict(zip(['name', 'FINAL_SCORE', *CHANNELS], r)) for r in res]
+
+    recommend.cache_info = _recommend.cache_info
+    recommend.cache_clear = _recommend.cache_clear
+    return recommend
+
+
+def recommendations_frame(recs):
+    # recommend() 결과를 UI 표시용 프레임으로 (index=관광지명)
+    return pd.DataFrame(recs, columns=['name', *CHANNELS, 'FINAL_SCORE']).set_index('name').rename_axis(None)
+
+
+# -----------------------------------------------------------------------------
+# [Cross-Category] (기준 관광지, 카테고리)별 평균 점수표 + 벡터화 All-Pass 필터
+# -----------------------------------------------------------------------------
+@timed("similarity.category_means")
+def build_category_means(sim, category_map=None):
+    # means[c, s, k]: 기준 s 의 비교 대상 중 카테고리 k 에 속하고 점수 > 0 인 값들의 평균 (없으면 0)
+    category_map = category_map or {}
+    names = sim['registry']['names']
+    cat_codes, categories = pd.factorize(pd.Series([category_map.get(n, '기타') for n in names], dtype=object))
+    onehot = np.zeros((len(names), len(categories)), dtype=np.float32)
+    onehot[np.arange(len(names)), cat_codes] = 1
+
+    means = np.zeros((len(CHANNELS), len(names), len(categories)), dtype=np.float32)
+    for c in range(len(CHANNELS)):
+        vals = np.nan_to_num(sim['tensor'][c])
+        pos = (vals > 0).astype(np.float32)
+        sums, counts = (vals * pos) @ onehot, pos @ onehot
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means[c] = np.where(counts > 0, sums / counts, 0)
+    return {'categories': list(categories), 'cat_codes': cat_codes, 'means': means}
+
+
+def make_cross_category(sim, category_map=None, weights=(50, 30, 20), maxsize=1024):
+    cat_table = build_category_means(sim, category_map)
+    categories, cat_codes = cat_table['categories'], cat_table['cat_codes']
+    etc_code = categories.index('기타') if '기타' in categories else -1
+
+    @cached("similarity.cross_category", lru_cache(maxsize=maxsize))
+    def cross_category(spot):
+        # 반환: (후보 프레임[FINAL_SCORE 내림차순, CATEGORY 포함], 기준 카테고리, (avg_vis, avg_sen, avg_fea)) / 데이터 없으면 None
+        sid = spot_id(sim['registry'], spot)
+        if sid is None: return None
+        rows, present = source_scores(sim, spot, exclude_self=False)
+        src_code = cat_codes[sid]
+        avgs = cat_table['means'][:, sid, src_code]
+
+        # 세 지표 모두 기준 카테고리 평균 초과 & 다른 카테고리 & '기타' 제외
+        mask = present & (cat_codes != src_code) & (cat_codes != etc_code) & (rows > avgs[:, None]).all(axis=0)
+        mask[sid] = False
+        scores = weighted_scores(rows, weights)
+        ids = np.flatnonzero(mask)
+        ids = ids[np.argsort(-scores[ids], kind='stable')]
+        frame = scores_frame(sim, rows, scores, ids)
+        frame['CATEGORY'] = [categories[c] for c in cat_codes[ids]]
+        return frame, categories[src_code], tuple(float(a) for a in avgs)
+
+    return cross_category
+
+
+# -----------------------------------------------------------------------------
+# [이미지 유사도 순위] '이름(0.1234)' 셀을 1회만 파싱하여 이웃 ID / 점수 배열로 보관
+# -----------------------------------------------------------------------------
+RANK_CELL = re.compile(r'(.+)\(([\d.-]+)\)')
+
+
+@timed("similarity.image_ranks")
+def build_image_ranks(df_img, registry):
+    # neighbors[s, r]: 기준 s 의 rank_no[r] 순위 관광지 ID (-1 = 없음) / scores[s, r]: 해당 유사도 (NaN = 없음)
+    n = len(registry['names'])
+    rank_cols = [c for c in df_img.columns if c.endswith('순위') and c[:-2].isdigit()]
+    rank_cols.sort(key=lambda c: int(c[:-2]))
+    rank_no = np.array([int(c[:-2]) for c in rank_cols], dtype=np.int32)
+    neighbors = np.full((n, len(rank_cols)), -1, dtype=np.int32)
+    scores = np.full((n, len(rank_cols)), np.nan, dtype=np.float32)
+    has_row = np.zeros(n, dtype=bool)
+    if df_img.empty or '대상_관광지' not in df_img.columns:
+        return {'neighbors': neighbors, 'scores': scores, 'rank_no': rank_no, 'has_row': has_row, 'top1_avg': 0.0}
+
+    # 순위는 컬럼 위치(N순위) 그대로: 칸이 비었거나 관광지를 찾지 못하면 그 순위만 비워 둠 (-1 / NaN)
+    top1 = []
+    for src, cells in zip(df_img['대상_관광지'], df_img[rank_cols].itertuples(index=False)):
+        sid = spot_id(registry, src)
+        for r, val in enumerate(cells):
+            match = RANK_CELL.search(str(val))
+            if not match: continue
+            if rank_no[r] == 1: top1.append(float(match.group(2)))
+            tid = spot_id(registry, match.group(1).strip())
+            if sid is None or tid is None: continue
+            neighbors[sid, r], scores[sid, r] = tid, float(match.group(2))
+        if sid is not None: has_row[sid] = True
+
+    # 전체 관광지 1순위 점수 평균 (비교 기준, '1순위' 칸 점수 전체)
+    return {'neighbors': neighbors, 'scores': scores, 'rank_no': rank_no, 'has_row': has_row,
+            'top1_avg': float(np.mean(top1)) if top1 else 0.0}
+
+
+def image_candidates(ranks, registry, name, k=8):
+    # 기준 관광지의 상위 k 개 [{'rank', 'name', 'score'}] (순위 파일에 행이 없으면 None)
+    sid = spot_id(registry, name)
+    if sid is None or not ranks['has_row'][sid]: return None
+    out = []
+    for r, tid, score in zip(ranks['rank_no'][:k], ranks['neighbors'][sid, :k], ranks['scores'][sid, :k]):
+        if tid < 0: continue
+        out.append({'rank': int(r), 'name': registry['names'][tid], 'score': float(score)})
+    return out
+
+
+# -----------------------------------------------------------------------------
+# [키워드 설명 인덱스] (기준 ID, 비교 ID) -> 미리 토큰화한 키워드 튜플
+# -----------------------------------------------------------------------------
+SENTIMENT_KEYWORD_COLS = {'vibe_com': '공통_키워드', 'vibe_uniq_s': '기준지_고유_키워드', 'vibe_uniq_t': '비교지_고유_키워드'}
+FEATURE_KEYWORD_COLS = {'feat_com': '엣지_공통_키워드', 'feat_uniq_s': '기준지_고유', 'feat_uniq_t': '비교지_고유'}
+
+
+def split_keywords(val):
+    if not isinstance(val, str): return ()
+    return tuple(k.strip() for k in val.split(',') if k.strip())
+
+
+@timed("similarity.pair_keywords")
+def build_pair_keywords(df, columns, registry):
+    # columns: {결과 키: 원본 컬럼} / 같은 쌍이 여러 번 나오면 첫 행 사용
+    index = {}
+    if df.empty or not {'기준_관광지', '비교_대상'} <= set(df.columns): return index
+    keys = [k for k, col in columns.items() if col in df.columns]
+    cols = [columns[k] for k in keys]
+    for src, tgt, *vals in df[['기준_관광지', '비교_대상', *cols]].itertuples(index=False):
+        sid, tid = spot_id(registry, src), spot_id(registry, tgt)
+        if sid is None or tid is None or (sid, tid) in index: continue
+        index[(sid, tid)] = {k: split_keywords(v) for k, v in zip(keys, vals)}
+    return index
+
+
+def pair_keywords(index, registry, source, target):
+    # 쌍이 없으면 빈 dict (호출부에서 .get(key, ()) 로 사용)
+    sid, tid = spot_id(registry, source), spot_id(registry, target)
+    if sid is None or tid is None: return {}
+    return index.get((sid, tid), {})
@@ -0,0 +1,236 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from config import FILE_CONFIG, SNAPSHOT_DIR
+from registry import canonical_name
+
+# =============================================================================
+# [컬럼형 스냅샷]
+# FILE_CONFIG 원본(CSV/XLSX)을 이름 매핑까지 끝낸 상태로 컬럼별 .npy + manifest.json 으로 저장합니다.
+# 앱은 스냅샷을 mmap 으로 열고, 스냅샷이 없거나 원본과 해시가 다를 때만 CSV 를 파싱합니다.
+# 원본 크기/수정시각이 스냅샷 기록 당시와 같으면 해시도 다시 계산하지 않습니다.
+#   빌드: python snapshot.py
+# =============================================================================
+SNAPSHOT_VERSION = 2
+MANIFEST_NAME = "manifest.json"
+
+# 대표 이름(registry.canonical_name)으로 바꿀 관광지명 컬럼
+NAME_COLUMNS = ['관광지명', '기준_관광지', '비교_대상', '대상_관광지', '리뷰 유사 관광지']
+
+
+def read_source(file_path):
+    # CSV(utf-8-sig -> cp949) 파싱, 실패 시 같은 이름의 xlsx
+    if os.path.exists(file_path):
+        try: return pd.read_csv(file_path, encoding='utf-8-sig')
+        except:
+            try: return pd.read_csv(file_path, encoding='cp949')
+            except: pass
+    xlsx_path = file_path.replace('.csv', '.xlsx').strip()
+    if os.path.exists(xlsx_path):
+        try: return pd.read_excel(xlsx_path)
+        except: pass
+    return pd.DataFrame()
+
+
+def resolve_source(file_path):
+    # 실제로 읽히는 원본 경로 (csv 가 없으면 xlsx)
+    if os.path.exists(file_path): return file_path
+    xlsx_path = file_path.replace('.csv', '.xlsx').strip()
+    if os.path.exists(xlsx_path): return xlsx_path
+    return None
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_stat(key):
+    # (원본 경로, 크기, 수정시각 ns) / 원본 없으면 None
+    source = resolve_source(FILE_CONFIG[key])
+    if source is None: return None
+    st = os.stat(source)
+    return source, st.st_size, st.st_mtime_ns
+
+
+def _source_entry(stat):
+    source, size, mtime_ns = stat
+    return {'source': os.path.basename(source), 'sha256': file_sha256(source), 'size': size, 'mtime_ns': mtime_ns}
+
+
+def source_digest(key, manifest=None, stat=None):
+    # 원본 sha256. 스냅샷에 기록된 원본과 이름/크기/수정시각이 같으면 기록된 해시를 그대로 사용
+    stat = stat or source_stat(key)
+    if stat is None: return None
+    source, size, mtime_ns = stat
+    entry = (manifest or {}).get('tables', {}).get(key) or {}
+    if (entry.get('source'), entry.get('size'), entry.get('mtime_ns')) == (os.path.basename(source), size, mtime_ns):
+        return entry['sha256']
+    return file_sha256(source)
+
+
+def normalize_names(s):
+    # 별칭 -> 대표 이름 (고유값마다 1회 변환, 결측은 그대로 유지)
+    lookup = {v: canonical_name(v) for v in s.dropna().unique()}
+    return s.map(lookup)
+
+
+def normalize_table(key, df):
+    # 로더들이 매번 반복하던 정규화를 한 곳에서 1회 수행
+    if df.empty: return df
+    df = df.copy()
+    df.columns = df.columns.astype(str).str.strip()
+
+    if key == "REVIEW_SIM_DATA" and '관광지명' in df.columns:
+        df['관광지명'] = df['관광지명'].ffill()
+    if key == "CATEGORY_INFO" and '지역구명' in df.columns:
+        # 엑셀 병합 셀: 구의 첫 행에만 값이 있음
+        df['지역구명'] = df['지역구명'].ffill()
+    if key == "IMG_MATRIX_DATA":
+        # 가로 행렬: 첫 컬럼(관광지명) 값과 컬럼 헤더 모두 대표 이름으로
+        df.columns = [canonical_name(c) for c in df.columns]
+
+    for col in NAME_COLUMNS:
+        if col in df.columns:
+            df[col] = normalize_names(df[col])
+
+    if key == "MAIN_DATA":
+        df['날짜'] = pd.to_datetime(df['날짜'], format='mixed', errors='coerce')
+        df = df.dropna(subset=['날짜', '관광지명'])
+        if '행정동' in df.columns:
+            df['행정구'] = df['행정동'].astype(str).apply(lambda x: x.split()[0] if len(x.split()) > 0 else "미분류")
+        else: df['행정구'] = "전체"
+        if '시간대' in df.columns:
+            df['시간대_int'] = df['시간대'].astype(str).str.replace('시', '').apply(pd.to_numeric, errors='coerce')
+    elif key == "PRED_DATA":
+        df['ds'] = pd.to_datetime(df['ds'])
+    elif key == "CATEGORY_INFO" and '카테고리' in df.columns:
+        df['카테고리'] = df['카테고리'].astype(str).str.strip()
+    return df.reset_index(drop=True)
+
+
+# -----------------------------------------------------------------------------
+# 저장 / 로드
+# -----------------------------------------------------------------------------
+def _write_table(df, table_dir):
+    os.makedirs(table_dir, exist_ok=True)
+    columns = []
+    for i, col in enumerate(df.columns):
+        s = df[col]
+        fname = f"c{i}.npy"
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            # 이미 코드화된 컬럼(대용량 합성 데이터 등)은 object 로 풀지 않고 그대로 저장
+            np.save(os.path.join(table_dir, fname), s.cat.codes.to_numpy().astype(np.int32))
+            columns.append({'name': col, 'kind': 'codes', 'file': fname, 'categories': [str(c) for c in s.cat.categories]})
+        elif pd.api.types.is_bool_dtype(s) or pd.api.types.is_numeric_dtype(s) or pd.api.types.is_datetime64_dtype(s):
+            np.save(os.path.join(table_dir, fname), s.to_numpy())
+            columns.append({'name': col, 'kind': 'array', 'file': fname})
+        else:
+            # 문자열 컬럼은 사전(categories) + int32 코드로 저장 (결측 = -1)
+            codes, categories = pd.factorize(s.astype(object), use_na_sentinel=True)
+            np.save(os.path.join(table_dir, fname), codes.astype(np.int32))
+            columns.append({'name': col, 'kind': 'codes', 'file': fname, 'categories': [str(c) for c in categories]})
+    return columns
+
+
+def build_snapshot(keys=None, snapshot_dir=SNAPSHOT_DIR):
+    # 새 디렉터리에 전부 쓴 뒤 교체하여 반쯤 쓰인 스냅샷이 읽히지 않도록 함
+    keys = keys or list(FILE_CONFIG)
+    tmp_dir = f"{snapshot_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    manifest = {'version': SNAPSHOT_VERSION, 'created': time.time(), 'tables': {}}
+    for key in keys:
+        stat = source_stat(key)
+        if stat is None:
+            print(f"[건너뜀] {key}: 원본 파일 없음")
+            continue
+        df = normalize_table(key, read_source(FILE_CONFIG[key]))
+        manifest['tables'][key] = {
+            **_source_entry(stat),
+            'rows': len(df),
+            'columns': _write_table(df, os.path.join(tmp_dir, key)),
+        }
+        print(f"[완료] {key}: {len(df):,} rows, {len(df.columns)} cols")
+
+    with open(os.path.join(tmp_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+    old_dir = f"{snapshot_dir}.old-{os.getpid()}"
+    if os.path.exists(snapshot_dir): os.rename(snapshot_dir, old_dir)
+    os.rename(tmp_dir, snapshot_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return manifest
+
+
+def write_snapshot_table(key, df, snapshot_dir=SNAPSHOT_DIR):
+    # 정규화가 끝난 표 1개를 기존 스냅샷에 추가/교체 (원본 파일이 없으면 해시 검증 없이 사용됨)
+    manifest = read_manifest(snapshot_dir) or {'version': SNAPSHOT_VERSION, 'created': time.time(), 'tables': {}}
+    tmp_dir = os.path.join(snapshot_dir, f"{key}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    stat = source_stat(key)
+    entry = {**(_source_entry(stat) if stat else {'source': None, 'sha256': None}),
+             'rows': len(df), 'columns': _write_table(df, tmp_dir)}
+    table_dir = os.path.join(snapshot_dir, key)
+    shutil.rmtree(table_dir, ignore_errors=True)
+    os.rename(tmp_dir, table_dir)
+    manifest['tables'][key] = entry
+    tmp_manifest = os.path.join(snapshot_dir, f"{MANIFEST_NAME}.tmp-{os.getpid()}")
+    with open(tmp_manifest, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_manifest, os.path.join(snapshot_dir, MANIFEST_NAME))
+    return entry
+
+
+def read_manifest(snapshot_dir=SNAPSHOT_DIR):
+    try:
+        with open(os.path.join(snapshot_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != SNAPSHOT_VERSION: return None
+    return manifest
+
+
+def _read_table(entry, table_dir):
+    data = {}
+    for col in entry['columns']:
+        arr = np.load(os.path.join(table_dir, col['file']), mmap_mode='r', allow_pickle=False)
+        if col['kind'] == 'codes':
+            # 코드 배열(mmap)을 그대로 범주형으로 사용 (행마다 문자열 객체를 만들지 않음, 코드 -1 = 결측)
+            arr = pd.Categorical.from_codes(arr, categories=col['categories'])
+        data[col['name']] = arr
+    return pd.DataFrame(data, columns=[c['name'] for c in entry['columns']], copy=False)
+
+
+def load_snapshot_table(key, manifest, snapshot_dir=SNAPSHOT_DIR, verify=True):
+    # 스냅샷이 없거나 원본 내용이 바뀌었으면 None
+    if manifest is None or key not in manifest['tables']: return None
+    entry = manifest['tables'][key]
+    if verify:
+        digest = source_digest(key, manifest)
+        if digest is not None and digest != entry['sha256']: return None
+    try: return _read_table(entry, os.path.join(snapshot_dir, key))
+    except (OSError, ValueError): return None
+
+
+def load_table(key, manifest=None):
+    # 스냅샷 우선, 실패 시 원본 파싱 + 정규화
+    df = load_snapshot_table(key, manifest if manifest is not None else read_manifest())
+    if df is not None: return df
+    return normalize_table(key, read_source(FILE_CONFIG[key]))
+
+
+if __name__ == "__main__":
+    build_snapshot(sys.argv[1:] or None)
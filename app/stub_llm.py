@@ -0,0 +1,172 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# =============================================================================
+# [로컬 스텁 LLM]
+# 비용/레이트 리밋 없이 리포트 경로를 부하 테스트하기 위한 결정적 응답기입니다.
+# 같은 프롬프트에는 항상 같은 텍스트를 돌려주고, 첫 토큰 지연(로그정규 분포)과 토큰 속도를 흉내 냅니다.
+#   서버 실행: python stub_llm.py --port 18080   (앱은 OPENAI_BASE_URL=http://127.0.0.1:18080/v1)
+#   프로세스 내 사용: LLM_BACKEND=stub   (llm.StubBackend, 네트워크 없음)
+# 환경변수(서버/프로세스 내 공통 기본값):
+#   LLM_STUB_TTFT         첫 토큰 지연 중앙값(초)
+#   LLM_STUB_TTFT_SIGMA   첫 토큰 지연 로그정규 sigma (꼬리 길이)
+#   LLM_STUB_TPS          초당 토큰 수
+#   LLM_STUB_SENTENCES    응답 문장 수
+#   LLM_STUB_ERROR_RATE   429 응답 비율 (서버 전용, Retry-After: 1)
+# =============================================================================
+SENTENCES = [
+    "해당 관광지는 연중 방문 수요가 일정 수준 이상 유지되는 구조입니다.",
+    "월별 추이는 여름 성수기에 정점을 형성하고 겨울철에 저점을 보입니다.",
+    "시간대별로는 오후 시간대에 밀집도가 집중되는 전형적인 체류형 패턴입니다.",
+    "표준편차가 평균 대비 크지 않아 변동성은 제한적인 수준으로 판단됩니다.",
+    "전체 관광지 대비 상위권에 위치하여 상대적 밀집도가 높은 편입니다.",
+    "현재 혼잡 단계를 고려할 때 추가 유입 시 수용 한계에 근접할 가능성이 있습니다.",
+    "유사도가 높은 후보지 중 혼잡도가 쾌적한 곳은 분산 수용지로서 타당합니다.",
+    "유사도가 높더라도 포화 상태인 후보지는 대체지로 부적절합니다.",
+    "데이터상 주말과 공휴일의 편차가 평일 대비 뚜렷하게 나타납니다.",
+    "예측치는 전년 대비 완만한 상승 추세를 유지할 것으로 보입니다.",
+]
+
+
+class LatencyProfile:
+    def __init__(self, ttft=0.6, ttft_sigma=0.5, tps=60.0, sentences=8, error_rate=0.0, seed=None):
+        self.ttft = ttft
+        self.ttft_sigma = ttft_sigma
+        self.tps = tps
+        self.sentences = sentences
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, **overrides):
+        values = dict(ttft=float(os.getenv("LLM_STUB_TTFT", "0.6")),
+                      ttft_sigma=float(os.getenv("LLM_STUB_TTFT_SIGMA", "0.5")),
+                      tps=float(os.getenv("LLM_STUB_TPS", "60")),
+                      sentences=int(os.getenv("LLM_STUB_SENTENCES", "8")),
+                      error_rate=float(os.getenv("LLM_STUB_ERROR_RATE", "0")))
+        values.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**values)
+
+    def first_token_delay(self):
+        # 로그정규: 중앙값 ttft, sigma 가 클수록 p95/p99 꼬리가 길어짐
+        if self.ttft <= 0: return 0.0
+        with self.lock:
+            return self.ttft * math.exp(self.rng.gauss(0, self.ttft_sigma))
+
+    def token_delay(self):
+        return 1.0 / self.tps if self.tps > 0 else 0.0
+
+    def should_fail(self):
+        if self.error_rate <= 0: return False
+        with self.lock:
+            return self.rng.random() < self.error_rate
+
+
+def stub_reply(messages, sentences=8):
+    # 프롬프트 해시로 문장을 골라 항상 같은 응답을 만듦
+    digest = hashlib.sha256(json.dumps(messages, ensure_ascii=False, sort_keys=True).encode("utf-8")).digest()
+    picks = [SENTENCES[digest[i % len(digest)] % len(SENTENCES)] for i in range(sentences)]
+    return "[STUB] " + " ".join(picks)
+
+
+def split_tokens(text):
+    # 공백 단위 조각 (공백 포함) -> 이어 붙이면 원문과 동일
+    words = text.split(" ")
+    return [w + " " for w in words[:-1]] + [words[-1]]
+
+
+def stream_reply(messages, profile):
+    # 첫 토큰 지연 후 토큰 속도에 맞춰 조각을 내보냄
+    time.sleep(profile.first_token_delay())
+    for i, piece in enumerate(split_tokens(stub_reply(messages, profile.sentences))):
+        if i: time.sleep(profile.token_delay())
+        yield piece
+
+
+def complete_reply(messages, profile):
+    return "".join(stream_reply(messages, profile))
+
+
+# -----------------------------------------------------------------------------
+# OpenAI 호환 HTTP 서버 (POST /v1/chat/completions, stream=true 는 SSE)
+# -----------------------------------------------------------------------------
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    profile = None
+
+    def log_message(self, *args): pass
+
+    def _send_json(self, status, payload, headers=()):
+        out = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(out)))
+        for k, v in headers: self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(out)
+
+    def _write_chunk(self, data):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/health"): self._send_json(200, {"status": "ok"})
+        else: self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            return self._send_json(404, {"error": {"message": "not found"}})
+        if self.profile.should_fail():
+            return self._send_json(429, {"error": {"message": "stub rate limit", "type": "rate_limit_error"}},
+                                   headers=[("Retry-After", "1")])
+        model, messages = body.get("model", "stub"), body.get("messages", [])
+        base = {"id": "chatcmpl-stub", "created": int(time.time()), "model": model}
+        if not body.get("stream"):
+            text = complete_reply(messages, self.profile)
+            return self._send_json(200, {**base, "object": "chat.completion",
+                                         "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                                         "usage": {"prompt_tokens": 0, "completion_tokens": len(split_tokens(text)), "total_tokens": 0}})
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for piece in stream_reply(messages, self.profile):
+            chunk = {**base, "object": "chat.completion.chunk",
+                     "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+            self._write_chunk(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+        self._write_chunk(b"data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+def make_server(port=18080, profile=None, host="127.0.0.1"):
+    handler = type("StubHandler", (_Handler,), {"profile": profile or LatencyProfile.from_env()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OpenAI 호환 로컬 스텁 LLM 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--ttft", type=float)
+    parser.add_argument("--ttft-sigma", type=float)
+    parser.add_argument("--tps", type=float)
+    parser.add_argument("--sentences", type=int)
+    parser.add_argument("--error-rate", type=float)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    profile = LatencyProfile.from_env(ttft=args.ttft, ttft_sigma=args.ttft_sigma, tps=args.tps,
+                                      sentences=args.sentences, error_rate=args.error_rate, seed=args.seed)
+    print(f"stub LLM on http://{args.host}:{args.port}/v1 (ttft={profile.ttft}s, sigma={profile.ttft_sigma}, tps={profile.tps})")
+    make_server(args.port, profile, args.host).serve_forever()
@@ -0,0 +1,242 @@
+import argparse
+import cProfile
+import gc
+import json
+import os
+import platform
+import pstats
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+# =============================================================================
+# [앱 렌더링 벤치마크]
+# streamlit.testing AppTest 로 app/main.py 를 헤드리스 실행하면서 사이드바 관광지 선택, 연도/월 버튼,
+# 유사도 하위 탭 4개를 순서대로 눌러 상호작용별 wall time / pandas time / peak memory 를 기록합니다.
+# 규모별(관광지 10x/100x/1000x) 합성 혼잡도 데이터는 synth_data.py 로 만들고, 규모마다 새 프로세스에서 측정합니다.
+#   python bench/bench_app.py                                 # 10x/100x 실행 후 baseline 과 비교
+#   python bench/bench_app.py --scales 10 --output out.json   # 일부 규모만
+#   python bench/bench_app.py --scales 10,100,1000            # 1000x 포함 (메모리 16GB 이상 권장)
+#   python bench/bench_app.py --update-baseline               # bench/baseline_app.json 갱신
+# 측정 방식 (같은 상호작용 시퀀스를 모드별 별도 프로세스에서 반복):
+#   wall_s     상호작용 1회(버튼 클릭 -> st.rerun 포함 렌더 완료)의 경과 시간
+#   pandas_s   cProfile 로 잰 pandas 모듈 내부 자체 시간(tottime) 합계
+#   peak_mb    tracemalloc 기준 상호작용 중 최대 Python/NumPy 할당량
+# 모드별 worker 를 --repeat 번 실행한 중앙값을 기록합니다. (같은 코드 반복 측정에서 pandas_s 가 최대 3배까지 흔들림)
+# 회귀 판정: 중앙값이 baseline 의 REGRESSION_RATIO 배 이상이고 차이가 지표별 하한(MIN_DELTA) 이상일 때만.
+# baseline 에서도 실패했던 규모(1000x OOM 등)의 실패는 예상된 결과로 보고 종료 코드에 반영하지 않습니다.
+# =============================================================================
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.abspath(os.path.join(BENCH_DIR, os.pardir, "app"))
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline_app.json")
+TARGET_SPOT = "감천문화마을"
+MODES = ("wall", "pandas", "memory")
+REGRESSION_RATIO = 1.5
+MIN_DELTA = {'wall_s': 0.25, 'pandas_s': 0.25, 'peak_mb': 10.0}
+DEFAULT_REPEAT = 3
+METRIC_OF = {'wall': 'wall_s', 'pandas': 'pandas_s', 'memory': 'peak_mb'}
+
+# 규모별 합성 데이터 설정 (1000x 는 메모리 한도 때문에 1개 연도만)
+SCALES = {
+    10: dict(years=(2023, 2024), days_per_month=1),
+    100: dict(years=(2023, 2024), days_per_month=1),
+    1000: dict(years=(2024,), days_per_month=1),
+}
+
+
+def interactions(spot):
+    # (이름, AppTest 에 적용할 동작) - 순서대로 실행되며 세션 상태가 이어짐
+    def click_key(key): return lambda at: at.button(key=key).click()
+    def click_label(label): return lambda at: next(b for b in at.button if b.label == label).click()
+    return [
+        ("cold_start", None),
+        ("select_spot", click_label(spot)),
+        ("year_2023", click_key("y_2023")),
+        ("month_7", click_key("m_7")),
+        ("sub_text", click_key("sub_t_1")),
+        ("sub_weighted", click_key("sub_t_2")),
+        ("weighted_rank", click_label("🔍 결과 분석 및 순위 산출 (Click)")),
+        ("sub_cross", click_key("sub_t_3")),
+        ("sub_image", click_key("sub_t_0")),
+    ]
+
+
+class _ThreadProfiler:
+    # AppTest 는 매 실행마다 새 스레드에서 스크립트를 돌리므로 새 스레드에서 cProfile 을 켬
+    def __init__(self):
+        self.prof = cProfile.Profile()
+
+    def _start(self, frame, event, arg):
+        sys.setprofile(None)
+        self.prof.enable()
+
+    def __enter__(self):
+        threading.setprofile(self._start)
+        return self
+
+    def __exit__(self, *exc):
+        threading.setprofile(None)
+
+    def pandas_seconds(self):
+        stats = pstats.Stats(self.prof).stats
+        marker = f"{os.sep}pandas{os.sep}"
+        return sum(tt for (path, _, _), (_, _, tt, _, _) in stats.items() if marker in path)
+
+
+def run_worker(mode, spot, timeout):
+    from streamlit.testing.v1 import AppTest
+    os.chdir(APP_DIR)
+    sys.path.insert(0, APP_DIR)
+    at = AppTest.from_file(os.path.join(APP_DIR, "main.py"), default_timeout=timeout)
+    results = []
+    for name, action in interactions(spot):
+        if action is not None: action(at)
+        gc.collect()
+        if mode == "wall":
+            t0 = time.perf_counter()
+            at.run()
+            value = time.perf_counter() - t0
+        elif mode == "pandas":
+            with _ThreadProfiler() as prof:
+                at.run()
+            value = prof.pandas_seconds()
+        else:
+            tracemalloc.start()
+            at.run()
+            value = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+        errors = [str(e.value)[:200] for e in at.exception]
+        results.append({'interaction': name, 'value': value, 'errors': errors})
+    return results
+
+
+def generate(scale, data_root):
+    from synth_data import build
+    cfg = SCALES.get(scale, SCALES[10])
+    t0 = time.perf_counter()
+    # 유사도/키워드 표는 저장소 원본(73곳)을 사용: N x N 이미지 행렬까지 합성하면 100x 부터 메모리 한도를 넘음
+    info = build(os.path.join(data_root, f"x{scale}"), scale, cfg['years'], cfg['days_per_month'], fmt="snapshot", sources="real")
+    info['generate_s'] = time.perf_counter() - t0
+    return info
+
+
+def run_scale(scale, data_root, timeout, repeat=DEFAULT_REPEAT):
+    data_dir = os.path.join(data_root, f"x{scale}")
+    # 생성도 규모마다 새 프로세스: config 의 데이터/스냅샷 경로는 import 시점에 고정되므로
+    # 한 프로세스에서 여러 규모를 만들면 뒤 규모의 표가 앞 규모 스냅샷에 써짐
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--generate", str(scale), "--data-root", data_root],
+                         capture_output=True, text=True)
+    if out.returncode != 0:
+        reason = "killed (OOM?)" if out.returncode == -9 else out.stderr.strip().splitlines()[-1:]
+        return {'scale': scale, 'data': {'spots': 0, 'rows': 0, 'years': list(SCALES.get(scale, SCALES[10])['years'])},
+                'repeat': repeat, 'failed': {'mode': 'generate', 'returncode': out.returncode, 'reason': reason}, 'interactions': []}
+    info = json.loads(out.stdout.strip().splitlines()[-1])
+    cache_dir = tempfile.mkdtemp(prefix="bench-app-cache-")
+    env = dict(os.environ, SLA_DATA_DIR=data_dir, LLM_BACKEND="stub", LLM_STUB_TTFT="0", LLM_STUB_TPS="0",
+               LLM_PREFETCH="0", LLM_CACHE_PATH=os.path.join(cache_dir, "llm.sqlite3"))
+    rows = {}
+    for mode in MODES:
+        samples = {}
+        for _ in range(repeat):
+            out = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", mode, "--timeout", str(timeout)],
+                                 env=env, capture_output=True, text=True)
+            if out.returncode != 0:
+                # 메모리 부족(OOM, returncode -9) 등으로 worker 가 죽으면 해당 규모는 실패로 기록하고 다음 규모 진행
+                reason = "killed (OOM?)" if out.returncode == -9 else out.stderr.strip().splitlines()[-1:]
+                return {'scale': scale, 'data': info, 'repeat': repeat, 'failed': {'mode': mode, 'returncode': out.returncode, 'reason': reason},
+                        'interactions': list(rows.values())}
+            for r in json.loads(out.stdout.strip().splitlines()[-1]):
+                samples.setdefault(r['interaction'], []).append(r['value'])
+                row = rows.setdefault(r['interaction'], {'interaction': r['interaction'], 'errors': []})
+                row['errors'] = sorted(set(row['errors']) | set(r['errors']))
+        for name, values in samples.items():
+            rows[name][METRIC_OF[mode]] = round(statistics.median(values), 4)
+    return {'scale': scale, 'data': info, 'repeat': repeat, 'interactions': list(rows.values())}
+
+
+def environment():
+    import numpy, pandas, streamlit
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count(),
+            'pandas': pandas.__version__, 'numpy': numpy.__version__, 'streamlit': streamlit.__version__}
+
+
+def compare(report, baseline):
+    # 기준 대비 REGRESSION_RATIO 배 이상, MIN_DELTA 이상 느려진/커진 항목과 baseline 에서는 성공했던 규모의 실패를 표시
+    base = {(s['scale'], r['interaction']): r for s in baseline['scales'] for r in s['interactions']}
+    base_failed = {s['scale'] for s in baseline['scales'] if s.get('failed')}
+    regressions = [f"x{s['scale']} 실패 ({s['failed']['mode']} worker)" for s in report['scales']
+                   if s.get('failed') and s['scale'] not in base_failed]
+    for s in report['scales']:
+        for r in s['interactions']:
+            b = base.get((s['scale'], r['interaction']))
+            if b is None: continue
+            for metric in ('wall_s', 'pandas_s', 'peak_mb'):
+                old, new = b.get(metric), r.get(metric)
+                if old and new and new > old * REGRESSION_RATIO and new - old >= MIN_DELTA[metric]:
+                    regressions.append(f"x{s['scale']} {r['interaction']} {metric}: {old:.3f} -> {new:.3f} ({new / old:.1f}x)")
+    return regressions
+
+
+def print_report(report):
+    for s in report['scales']:
+        d = s['data']
+        print(f"\n[x{s['scale']}] {d['spots']:,} spots, {d['rows']:,} rows, years={d['years']}")
+        if s.get('failed'):
+            print(f"  FAILED in {s['failed']['mode']} worker: {s['failed']['reason']}")
+        print(f"  (worker {s.get('repeat', 1)}회 실행 중앙값)")
+        print(f"  {'interaction':<14} {'wall_s':>9} {'pandas_s':>9} {'peak_mb':>9}")
+        for r in s['interactions']:
+            flag = "  ERROR" if r['errors'] else ""
+            print(f"  {r['interaction']:<14} {r.get('wall_s', float('nan')):>9.3f} {r.get('pandas_s', float('nan')):>9.3f} "
+                  f"{r.get('peak_mb', float('nan')):>9.1f}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AppTest 기반 앱 렌더링 벤치마크")
+    parser.add_argument("--scales", default="10,100")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="모드별 worker 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--data-root", default=os.path.join(tempfile.gettempdir(), "sla_bench_data"))
+    parser.add_argument("--timeout", type=float, default=1800)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--worker", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--generate", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.generate:
+        sys.path.insert(0, BENCH_DIR)
+        print(json.dumps(generate(args.generate, args.data_root), ensure_ascii=False))
+        return
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, TARGET_SPOT, args.timeout), ensure_ascii=False))
+        return
+
+    sys.path.insert(0, BENCH_DIR)
+    report = {'created': time.strftime("%Y-%m-%d"), 'environment': environment(), 'spot': TARGET_SPOT, 'scales': []}
+    for scale in [int(x) for x in args.scales.split(",")]:
+        print(f"running x{scale} ...", flush=True)
+        report['scales'].append(run_scale(scale, args.data_root, args.timeout, args.repeat))
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        print(f"\nbaseline 갱신: {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f))
+        print("\n" + ("\n".join(["[회귀]"] + regressions) if regressions else "baseline 대비 회귀 없음"))
+        if regressions: sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# =============================================================================
+# [리포트 경로 부하 벤치마크]
+# 로컬 스텁 LLM 을 상대로 동시 접속 수별 리포트 생성 지연(첫 토큰 / 전체)과 처리량을 측정합니다.
+# 리포트 버튼 클릭 -> 인사이트 박스 완성까지 사용자가 기다리는 경로(generate_section_analysis, stream=True)를
+# 리미터/서킷/커넥션 풀까지 그대로 통과시키며, 요청마다 프롬프트가 달라 응답 캐시는 적중하지 않습니다.
+#   python bench/bench_llm.py --concurrency 1,4,16,64 --requests 64
+#   --backend server : stub_llm HTTP 서버 + OpenAI SDK (기본)
+#   --backend inproc : LLM_BACKEND=stub (네트워크 없이)
+#   --mode report    : 리포트 함수 직접 호출 (LLM 경로만, 기본)
+#   --mode page      : 동시 세션(AppTest)이 관광지 선택 -> 혼잡도 리포트 버튼 클릭 -> 결과 렌더링까지 실행하고
+#                      리런별 페이지 지연(p50/p95)을 기록 (세션 = worker 프로세스, 세션마다 다른 관광지,
+#                      동시 접속 수 단계마다 빈 응답 캐시). 리미터/커넥션 풀은 프로세스별이고 스텁 서버만 공유
+#                      SLA_DATA_DIR 미지정 시 synth_data.py 로 1x 합성 데이터를 만들어 사용
+#   python bench/bench_llm.py --mode page --concurrency 1,4,8 --requests 8
+# =============================================================================
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+APP_DIR = os.path.join(REPO_DIR, "app")
+PAGE_STEPS = ("cold_start", "select_spot", "report_click")
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else float("nan")
+
+
+def run_level(concurrency, n_requests, tag):
+    from reports import generate_section_analysis, ReportUnavailable
+
+    def one(i):
+        t0 = time.perf_counter()
+        ttft = None
+        chunks, _ = generate_section_analysis("trend", f"BENCH-{tag}-{concurrency}-{i}", 2024,
+                                              "peak=8(1.234), trough=1(0.210)", "보통", stream=True)
+        failed = isinstance(chunks, str)
+        for piece in ([] if failed else chunks):
+            if ttft is None: ttft = time.perf_counter() - t0
+            if isinstance(piece, ReportUnavailable): failed = True
+        return ttft, time.perf_counter() - t0, failed
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(n_requests)))
+    wall = time.perf_counter() - t0
+    ok = [r for r in results if not r[2]]
+    ttfts = [r[0] for r in ok if r[0] is not None]
+    totals = [r[1] for r in ok]
+    return {'concurrency': concurrency, 'requests': n_requests, 'failed': len(results) - len(ok),
+            'ttft_p50': percentile(ttfts, 50), 'ttft_p95': percentile(ttfts, 95),
+            'total_p50': percentile(totals, 50), 'total_p95': percentile(totals, 95),
+            'throughput_rps': len(ok) / wall if wall else float("nan"), 'wall': wall}
+
+
+def run_page_session(spot, timeout):
+    # 세션 1개 = worker 프로세스 1개의 AppTest (AppTest 런타임은 프로세스 전역 싱글턴이라 스레드로 동시 실행 불가)
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(os.path.join(APP_DIR, "main.py"), default_timeout=timeout)
+    actions = [None, lambda: next(b for b in at.button if b.label == spot).click(),
+               lambda: at.button(key="btn_trend").click()]
+    times = {}
+    for step, action in zip(PAGE_STEPS, actions):
+        if action is not None: action()
+        t0 = time.perf_counter()
+        at.run()
+        times[step] = time.perf_counter() - t0
+    failed = bool(at.exception) or any(w.value.startswith("⚠️") for w in at.warning)
+    return {'times': times, 'failed': failed}
+
+
+def run_page_level(concurrency, n_sessions, spots, timeout):
+    # 동시 세션들이 같은 스텁 LLM 서버(--backend server)를 공유. 단계마다 빈 응답 캐시로 시작
+    env = dict(os.environ, LLM_CACHE_PATH=os.path.join(tempfile.mkdtemp(prefix="bench-llm-page-"), "cache.sqlite3"))
+
+    def session(i):
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--page-worker", spots[i % len(spots)],
+                              "--timeout", str(timeout)], env=env, capture_output=True, text=True)
+        if out.returncode != 0: return {'times': {}, 'failed': True}
+        return json.loads(out.stdout.strip().splitlines()[-1])
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(session, range(n_sessions)))
+    wall = time.perf_counter() - t0
+    row = {'concurrency': concurrency, 'sessions': n_sessions, 'failed': sum(r['failed'] for r in results), 'wall': wall}
+    for step in PAGE_STEPS:
+        values = [r['times'][step] for r in results if step in r['times']]
+        row[f'{step}_p50'], row[f'{step}_p95'] = percentile(values, 50), percentile(values, 95)
+    return row
+
+
+def page_spots():
+    from datastore import load
+    return [spot for spots in load()['district_spots'].values() for spot in spots]
+
+
+def report_levels(args):
+    print(f"{'conc':>5} {'ok':>5} {'fail':>5} {'ttft_p50':>9} {'ttft_p95':>9} {'total_p50':>10} {'total_p95':>10} {'req/s':>7}")
+    rows = []
+    tag = int(time.time())
+    for c in [int(x) for x in args.concurrency.split(",")]:
+        r = run_level(c, args.requests, tag)
+        rows.append(r)
+        print(f"{c:>5} {r['requests'] - r['failed']:>5} {r['failed']:>5} {r['ttft_p50']:>9.3f} {r['ttft_p95']:>9.3f} "
+              f"{r['total_p50']:>10.3f} {r['total_p95']:>10.3f} {r['throughput_rps']:>7.2f}")
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="리포트 경로 부하 벤치마크 (스텁 LLM)")
+    parser.add_argument("--backend", choices=["server", "inproc"], default="server")
+    parser.add_argument("--mode", choices=["report", "page"], default="report")
+    parser.add_argument("--timeout", type=float, default=600, help="page 모드 AppTest 리런 타임아웃(초)")
+    parser.add_argument("--concurrency", default="1,4,16,64")
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--ttft", type=float, default=0.6)
+    parser.add_argument("--ttft-sigma", type=float, default=0.5)
+    parser.add_argument("--tps", type=float, default=60)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=18089)
+    parser.add_argument("--json", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--page-worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.page_worker:
+        # 환경변수(데이터/LLM 서버/캐시)는 부모 프로세스가 맞춰서 넘김
+        sys.path.insert(0, APP_DIR)
+        print(json.dumps(run_page_session(args.page_worker, args.timeout), ensure_ascii=False))
+        return
+
+    # 설정은 모듈 import 시점에 읽히므로 import 전에 환경변수를 맞춤
+    os.environ.setdefault("LLM_CACHE_PATH", os.path.join(tempfile.mkdtemp(prefix="bench-llm-"), "cache.sqlite3"))
+    os.environ.update({"LLM_STUB_TTFT": str(args.ttft), "LLM_STUB_TTFT_SIGMA": str(args.ttft_sigma),
+                       "LLM_STUB_TPS": str(args.tps), "LLM_STUB_ERROR_RATE": str(args.error_rate)})
+    if args.mode == "page":
+        # 저장소에는 혼잡도 원본(MAIN_DATA)이 없으므로 SLA_DATA_DIR 미지정 시 1x 합성 데이터를 임시 폴더에 생성
+        # (유사도/키워드 표는 저장소 data/ 링크, bench_app 과 같은 구성). 메트릭 서버/프리페치는 끔
+        if "SLA_DATA_DIR" not in os.environ:
+            sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+            from synth_data import build
+            build(tempfile.mkdtemp(prefix="bench-llm-data-"), 1, fmt="snapshot", sources="real")
+        os.environ.setdefault("SLA_IMAGE_DIR", os.path.join(REPO_DIR, "images"))
+        os.environ.update({"SLA_METRICS_PORT": "0", "SLA_DATA_POLL_SECONDS": "0", "LLM_PREFETCH": "0"})
+        os.chdir(APP_DIR)
+    sys.path.insert(0, os.path.abspath(APP_DIR))
+    server = None
+    if args.backend == "server":
+        from stub_llm import make_server
+        server = make_server(args.port)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        os.environ.update({"LLM_BACKEND": "openai", "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "stub"),
+                           "OPENAI_BASE_URL": f"http://127.0.0.1:{args.port}/v1"})
+    else:
+        os.environ["LLM_BACKEND"] = "stub"
+
+    import llm
+    print(f"backend={args.backend} mode={args.mode} ttft={args.ttft}s sigma={args.ttft_sigma} tps={args.tps} "
+          f"rpm={llm.LLM_RPM} max_connections={llm.LLM_MAX_CONNECTIONS}")
+    if args.mode == "page":
+        spots = page_spots()
+        rows = []
+        print(f"{'conc':>5} {'ok':>5} {'fail':>5} " + " ".join(f"{s + '_p50':>16} {s + '_p95':>16}" for s in PAGE_STEPS))
+        for c in [int(x) for x in args.concurrency.split(",")]:
+            r = run_page_level(c, max(args.requests, c), spots, args.timeout)
+            rows.append(r)
+            print(f"{c:>5} {r['sessions'] - r['failed']:>5} {r['failed']:>5} "
+                  + " ".join(f"{r[s + '_p50']:>16.3f} {r[s + '_p95']:>16.3f}" for s in PAGE_STEPS))
+    else: rows = report_levels(args)
+    if server is not None: server.shutdown()
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({'args': vars(args), 'results': rows}, f, ensure_ascii=False, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+import argparse
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# [합성 데이터]
+# FILE_CONFIG 전체(혼잡도/예측/이미지·리뷰·감성·특성 유사도/키워드/카테고리)를 원본과 같은 스키마로 원하는 규모만큼 생성합니다.
+# 실제 73개 관광지 이름/행정동/카테고리를 먼저 쓰고, 배수만큼 '합성관광지_NNNNN' 을 추가합니다.
+#   MAIN_DATA       관광지 x 연 x 월 x 일 x 24시간 (기준값 x 계절성 x 일중 패턴 x 잡음)
+#   유사도 표들     카테고리 중심 + 잡음 임베딩의 코사인 유사도 (같은 카테고리끼리 높음), 상위 top_k 개만
+#   키워드 표들     저장소 data/ 의 명사/형용사 어휘에서 카테고리별로 치우치게 추출 (자카드/공통·고유 키워드 일관)
+# 이미지 유사도 행렬(IMG_MATRIX_DATA)은 원본처럼 N x N 전체라 규모의 제곱으로 커집니다.
+#   python bench/synth_data.py /tmp/sla_x10 --scale 10
+#   python bench/synth_data.py /tmp/sla_x1000 --scale 1000 --years 2024 --format snapshot
+#   python bench/synth_data.py /tmp/sla_x10 --scale 10 --sources real    # MAIN_DATA 만 합성, 나머지는 data/ 링크
+#   SLA_DATA_DIR=/tmp/sla_x10 streamlit run app/main.py
+# =============================================================================
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "app"))
+REPO_DATA_DIR = os.path.join(APP_DIR, os.pardir, "data")
+BASE_SPOTS = 73
+VALUE_COL = '실질_㎡당_방문객수'
+TOP_K = 72                 # 쌍 단위 표(감성/특성)와 이미지 순위 표의 관광지당 행/열 수 (원본 73곳 = 전체 쌍)
+REVIEW_TOP_K = 5           # 유사도.csv 의 관광지당 행 수
+EMBED_DIM = 32
+
+
+def spot_table(scale, seed=0):
+    # 부산_관광지명.xlsx 와 같은 컬럼(지역구명/관광지명/행정동명/카테고리/관광유효면적, 지역구 채움 완료)
+    cat = pd.read_excel(os.path.join(REPO_DATA_DIR, "부산_관광지명.xlsx"))
+    cat.columns = cat.columns.str.strip()
+    cat['지역구명'] = cat['지역구명'].ffill()
+    for col in ['지역구명', '관광지명', '행정동명', '카테고리']:
+        cat[col] = cat[col].astype(str).str.strip()
+    # 다른 원본 표와 같은 대표 이름으로 (예: 용호만유람선부두 -> 용호만유람선)
+    from registry import canonical_name
+    cat['관광지명'] = cat['관광지명'].map(canonical_name)
+    n = BASE_SPOTS * scale
+    extra = max(n - len(cat), 0)
+    rng = np.random.default_rng(seed)
+    # 합성 관광지: 실제 행에서 지역구/행정동/카테고리를 빌려오고 면적은 로그정규
+    tmpl = cat.iloc[rng.integers(0, len(cat), extra)].reset_index(drop=True)
+    tmpl['관광지명'] = [f"합성관광지_{i:05d}" for i in range(extra)]
+    tmpl['관광유효면적'] = (np.round(rng.lognormal(8.3, 1.1, extra), -2)).clip(300, 60000).astype(int)
+    return pd.concat([cat.iloc[:n], tmpl], ignore_index=True)[['지역구명', '관광지명', '행정동명', '카테고리', '관광유효면적']]
+
+
+def generate_main_data(names, dongs, years=(2023, 2024), days_per_month=1, seed=0):
+    # 관광지 x 연 x 월 x 일 x 24시간, 값 = 관광지 기준값 x 계절성 x 일중 패턴 x 잡음
+    rng = np.random.default_rng(seed)
+    n_spots, n_years = len(names), len(years)
+    shape = (n_spots, n_years, 12, days_per_month, 24)
+    spot, year, month, day, hour = [a.ravel() for a in np.indices(shape, dtype=np.int32)]
+
+    base = rng.lognormal(mean=-0.9, sigma=0.6, size=n_spots)        # 관광지별 평균 밀집도 (대략 0.1 ~ 1.5)
+    peak_month = rng.integers(6, 9, size=n_spots)                   # 성수기 (7~9월)
+    peak_hour = rng.normal(14, 1.5, size=n_spots)                   # 일중 최대 시각
+    season = 1 + 0.35 * np.cos(2 * np.pi * (month - peak_month[spot]) / 12)
+    diurnal = 0.15 + np.exp(-0.5 * ((hour - peak_hour[spot]) / 3.5) ** 2)
+    values = base[spot] * season * diurnal * rng.lognormal(0, 0.15, size=spot.size)
+
+    months = (np.asarray(years, dtype=np.int64)[year] - 1970) * 12 + month
+    dates = months.astype('datetime64[M]').astype('datetime64[D]') + (day * (28 // days_per_month)).astype('timedelta64[D]')
+    hour_labels = pd.Categorical.from_codes(hour, [f"{h}시" for h in range(24)])
+    dong_cat = pd.Categorical(dongs)
+    return pd.DataFrame({
+        '날짜': dates.astype('datetime64[ns]'),
+        '시간대': hour_labels,
+        '행정동': pd.Categorical.from_codes(dong_cat.codes[spot], dong_cat.categories),
+        '관광지명': pd.Categorical.from_codes(spot, pd.Index(names)),
+        VALUE_COL: values,
+    })
+
+
+def normalized_main(df):
+    # snapshot.normalize_table("MAIN_DATA") 결과와 같게: 이름 매핑 + 행정구/시간대_int (카테고리 단위 연산)
+    from snapshot import normalize_names
+    spot = df['관광지명']
+    df['관광지명'] = pd.Categorical.from_codes(spot.cat.codes, normalize_names(pd.Series(spot.cat.categories)))
+    dong = df['행정동']
+    gu = pd.Categorical(dong.cat.categories.str.split().str[0].fillna("미분류"))
+    df['행정구'] = pd.Categorical.from_codes(gu.codes[dong.cat.codes], gu.categories)
+    df['시간대_int'] = df['시간대'].cat.codes.astype(np.int64)
+    return df
+
+
+def generate_pred_data(df, years):
+    # AI_예측_결과.csv: 관광지 x 2025년 월별 예측 (마지막 연도 월 평균 x 관광지별 성장률)
+    spot = df['관광지명'].cat.codes.to_numpy().astype(np.int64)
+    last = df['날짜'].dt.year.to_numpy() == max(years)
+    month = df['날짜'].dt.month.to_numpy() - 1
+    n = len(df['관광지명'].cat.categories)
+    key = spot[last] * 12 + month[last]
+    sums = np.bincount(key, weights=df[VALUE_COL].to_numpy()[last], minlength=n * 12)
+    counts = np.bincount(key, minlength=n * 12)
+    monthly = sums / np.maximum(counts, 1)
+    growth = np.random.default_rng(1).normal(1.03, 0.05, n)
+    return pd.DataFrame({
+        'ds': np.tile([f"2025-{m:02d}-01" for m in range(1, 13)], n),
+        'yhat': (monthly * np.repeat(growth, 12)).clip(0),
+        '관광지명': np.repeat(np.asarray(df['관광지명'].cat.categories, dtype=object), 12),
+    })
+
+
+def embeddings(categories, rng, spread=1.2):
+    # 카테고리 중심 + 잡음 -> 단위 벡터 (같은 카테고리 코사인 ~0.4, 다른 카테고리 ~0)
+    codes, uniques = pd.factorize(pd.Series(categories))
+    centers = rng.normal(size=(len(uniques), EMBED_DIM))
+    emb = centers[codes] + spread * rng.normal(size=(len(codes), EMBED_DIM))
+    return (emb / np.linalg.norm(emb, axis=1, keepdims=True)).astype(np.float32)
+
+
+def top_neighbors(emb, k, block=2048):
+    # 관광지별 코사인 상위 k (자기 제외), N x N 전체를 만들지 않도록 블록 단위로 계산
+    n = len(emb)
+    k = min(k, n - 1)
+    ids = np.empty((n, k), dtype=np.int64)
+    scores = np.empty((n, k), dtype=np.float32)
+    for lo in range(0, n, block):
+        sim = emb[lo:lo + block] @ emb.T
+        sim[np.arange(len(sim)), np.arange(lo, lo + len(sim))] = -np.inf
+        part = np.argpartition(-sim, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(sim, part, axis=1), axis=1, kind='stable')
+        ids[lo:lo + block] = np.take_along_axis(part, order, axis=1)
+        scores[lo:lo + block] = np.take_along_axis(sim, ids[lo:lo + block], axis=1)
+    return ids, scores
+
+
+def rank_cells(names, ids, scores):
+    # '이름(0.1234)' 셀 (원본 이미지 순위/유사도.csv 형식)
+    return np.char.add(np.char.add(names[ids].astype(str), "("), np.char.add(np.char.mod("%.4f", scores), ")"))
+
+
+def image_tables(names, emb, k):
+    # 부산_관광지_유사도_최종_결과_refined.csv (N x N) + 관광지_별_유사도_순위_refined.csv (상위 k)
+    matrix = pd.DataFrame(np.round(emb @ emb.T, 6), columns=names)
+    matrix.insert(0, '관광지명', names)
+    ids, scores = top_neighbors(emb, k)
+    cells = rank_cells(names, ids, scores)
+    ranks = pd.DataFrame(cells, columns=[f"{r}순위" for r in range(1, ids.shape[1] + 1)])
+    ranks.insert(0, '대상_관광지', names)
+    return matrix, ranks, (ids, scores)
+
+
+def review_table(names, emb, image_top, rng, k=REVIEW_TOP_K):
+    # 유사도.csv: 관광지당 k 행, 관광지명은 그룹 첫 행에만 (원본처럼 나머지는 빈칸)
+    ids, scores = top_neighbors(emb, k)
+    k = ids.shape[1]
+    img_ids, img_scores = image_top[0][:, :k], image_top[1][:, :k]
+    first = np.zeros((len(names), k), dtype=bool)
+    first[:, 0] = True
+    return pd.DataFrame({
+        '관광지명': np.where(first, names[:, None], None).ravel(),
+        '이미지유사도': rank_cells(names, img_ids, img_scores).ravel(),
+        '리뷰 유사 관광지': names[ids].ravel(),
+        '리뷰유사도': np.round(np.clip(0.43 + 0.35 * scores + rng.normal(0, 0.03, scores.shape), 0, 1), 6).ravel(),
+    })
+
+
+def keyword_vocab():
+    # 저장소 data/ 의 명사/형용사 어휘
+    def words(file_name, col):
+        df = pd.read_csv(os.path.join(REPO_DATA_DIR, file_name), encoding='utf-8-sig')
+        return sorted({w.strip() for v in df[col].dropna() for w in str(v).split(',') if w.strip()})
+    return words("관광지별_키워드50_추출(정제후).csv", "정제키워드"), words("부산_관광지별_형용사_추출결과.csv", "추출_형용사")
+
+
+def spot_keywords(categories, vocab, size, rng, bias=0.7):
+    # 관광지별 키워드 목록: bias 비율은 카테고리 전용 어휘 풀에서, 나머지는 전체 어휘에서
+    vocab = np.asarray(vocab, dtype=object)
+    uniq = pd.unique(pd.Series(categories))
+    pools = {c: rng.choice(len(vocab), size=min(len(vocab), size * 4), replace=False) for c in uniq}
+    out = []
+    for c, m in zip(categories, rng.poisson(size, len(categories)).clip(5)):
+        own = rng.choice(pools[c], size=min(int(m * bias), len(pools[c])), replace=False)
+        rest = rng.choice(len(vocab), size=m - len(own), replace=False)
+        out.append(list(vocab[pd.unique(np.concatenate([own, rest]))]))
+    return out
+
+
+def pair_rows(names, ids, keywords, n_show=5):
+    # (기준, 순위, 비교) 쌍별 자카드 + 공통/기준 고유/비교 고유 키워드 문자열
+    sets = [set(k) for k in keywords]
+    rows = []
+    for s, targets in enumerate(ids):
+        for rank, t in enumerate(targets, 1):
+            a, b = sets[s], sets[t]
+            common = [w for w in keywords[s] if w in b][:n_show]
+            rows.append((names[s], rank, names[t], len(a & b) / (len(a | b) or 1), ", ".join(common),
+                         ", ".join([w for w in keywords[s] if w not in b][:n_show]),
+                         ", ".join([w for w in keywords[t] if w not in a][:n_show])))
+    return pd.DataFrame(rows, columns=['기준_관광지', '순위', '비교_대상', 'JACCARD', 'COMMON', 'UNIQ_S', 'UNIQ_T'])
+
+
+def sentiment_table(names, emb, adjectives, k):
+    # 관광지_감상유사도_분석(최종, TF-IDF적용).csv (SBERT 가중 유사도 0.87~0.99 대역)
+    ids, scores = top_neighbors(emb, k)
+    df = pair_rows(names, ids, adjectives)
+    df.insert(3, 'SBERT_유사도(가중적용)', np.round(0.957 + 0.03 * scores.ravel(), 4))
+    return df.rename(columns={'JACCARD': '자카드_유사도', 'COMMON': '공통_키워드',
+                              'UNIQ_S': '기준지_고유_키워드', 'UNIQ_T': '비교지_고유_키워드'}).round({'자카드_유사도': 4})
+
+
+def feature_table(names, emb, nouns, k):
+    # 관광지별_키워드_유사도_순위.csv (최종 = 0.8 x SBERT + 0.2 x 가중 자카드, 최종 기준 순위)
+    ids, scores = top_neighbors(emb, k)
+    df = pair_rows(names, ids, nouns)
+    sbert = np.round(0.76 + 0.2 * scores.ravel(), 4)
+    jac = np.round(df['JACCARD'].to_numpy() * 0.5, 4)
+    df.insert(3, '최종_유사도', np.round(0.8 * sbert + 0.2 * jac, 4))
+    df.insert(4, 'SBERT_점수', sbert)
+    df.insert(5, '가중_자카드', jac)
+    df = df.drop(columns='JACCARD').rename(columns={'COMMON': '엣지_공통_키워드', 'UNIQ_S': '기준지_고유', 'UNIQ_T': '비교지_고유'})
+    k = ids.shape[1]
+    order = np.lexsort((-df['최종_유사도'].to_numpy(), np.repeat(np.arange(len(ids)), k)))
+    df = df.iloc[order].reset_index(drop=True)
+    df['순위'] = np.tile(np.arange(1, k + 1), len(ids))
+    return df
+
+
+def category_table(spots):
+    # 부산_관광지명.xlsx 형식: 헤더 공백 포함, 지역구명은 바뀌는 행에만
+    df = spots.copy()
+    df.loc[df['지역구명'].eq(df['지역구명'].shift()), '지역구명'] = None
+    return df.rename(columns={'지역구명': '지역구명 ', '관광지명': '관광지명 '})
+
+
+def generate_tables(spots, years=(2023, 2024), days_per_month=1, seed=0, top_k=TOP_K):
+    # FILE_CONFIG 키 -> 원본 스키마 DataFrame
+    rng = np.random.default_rng(seed + 1)
+    names = spots['관광지명'].to_numpy(dtype=object)
+    cats = spots['카테고리'].tolist()
+    nouns_vocab, adjs_vocab = keyword_vocab()
+    nouns = spot_keywords(cats, nouns_vocab, 28, rng)
+    adjs = spot_keywords(cats, adjs_vocab, 66, rng)
+
+    main = generate_main_data(names.tolist(), (spots['지역구명'] + " " + spots['행정동명']).tolist(), years, days_per_month, seed)
+    img_matrix, img_rank, image_top = image_tables(names, embeddings(cats, rng), top_k)
+    return {
+        "MAIN_DATA": main,
+        "PRED_DATA": generate_pred_data(main, years),
+        "IMG_RANK_DATA": img_rank,
+        "IMG_MATRIX_DATA": img_matrix,
+        "REVIEW_SIM_DATA": review_table(names, embeddings(cats, rng), image_top, rng),
+        "SENTIMENT_DATA": sentiment_table(names, embeddings(cats, rng), adjs, top_k),
+        "FEATURE_DATA": feature_table(names, embeddings(cats, rng), nouns, top_k),
+        "KEYWORD_NOUN": pd.DataFrame({'지역구': spots['지역구명'], '관광지명': names, '정제키워드': [", ".join(k) for k in nouns]}),
+        "KEYWORD_ADJ": pd.DataFrame({'관광지명': names, '추출_형용사': [", ".join(k) for k in adjs]}),
+        "CATEGORY_INFO": category_table(spots),
+    }
+
+
+def link_sources(out_dir, skip=("MAIN_DATA",)):
+    # MAIN_DATA 외 원본은 저장소 data/ 를 심볼릭 링크 (없으면 복사)
+    from config import FILE_CONFIG
+    for key, path in FILE_CONFIG.items():
+        if key in skip: continue
+        name = os.path.basename(path)
+        src, dst = os.path.join(REPO_DATA_DIR, name), os.path.join(out_dir, name)
+        if not os.path.exists(src) or os.path.lexists(dst): continue
+        try: os.symlink(os.path.abspath(src), dst)
+        except OSError: shutil.copy(src, dst)
+
+
+def write_table(key, df, fmt):
+    # csv: 원본 파일 형식 그대로 / snapshot: 원본 없이 정규화된 스냅샷으로 바로 저장 (앱은 해시 검증 없이 mmap 로드)
+    from config import FILE_CONFIG, SNAPSHOT_DIR
+    path = FILE_CONFIG[key]
+    if os.path.lexists(path): os.remove(path)
+    if fmt == "csv":
+        if path.endswith(".xlsx"): df.to_excel(path, index=False)
+        else: df.to_csv(path, index=False, encoding='utf-8-sig', date_format='%Y-%m-%d')
+        return
+    from snapshot import normalize_table, write_snapshot_table
+    write_snapshot_table(key, normalized_main(df) if key == "MAIN_DATA" else normalize_table(key, df), SNAPSHOT_DIR)
+
+
+def build(out_dir, scale=1, years=(2023, 2024), days_per_month=1, fmt="csv", seed=0, sources="synth", top_k=TOP_K):
+    # sources="synth": FILE_CONFIG 전체 합성 / "real": MAIN_DATA 만 합성하고 나머지는 저장소 data/ 링크
+    os.makedirs(out_dir, exist_ok=True)
+    os.environ["SLA_DATA_DIR"] = os.path.abspath(out_dir)
+    os.environ.pop("SLA_SNAPSHOT_DIR", None)  # 스냅샷은 규모별 데이터 폴더 안 (_snapshot)
+    sys.path.insert(0, APP_DIR)
+    spots = spot_table(scale, seed)
+    if sources == "real":
+        link_sources(out_dir)
+        tables = {"MAIN_DATA": generate_main_data(spots['관광지명'].tolist(), (spots['지역구명'] + " " + spots['행정동명']).tolist(),
+                                                  years, days_per_month, seed)}
+    else:
+        tables = generate_tables(spots, years, days_per_month, seed, top_k)
+    for key, df in tables.items():
+        write_table(key, df, fmt)
+    return {'spots': len(spots), 'rows': len(tables["MAIN_DATA"]), 'years': list(years), 'days_per_month': days_per_month,
+            'format': fmt, 'sources': sources, 'table_rows': {k: len(v) for k, v in tables.items()}}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="합성 데이터 생성 (FILE_CONFIG 전체)")
+    parser.add_argument("out_dir")
+    parser.add_argument("--scale", type=int, default=1, help=f"관광지 수 배수 (1 = {BASE_SPOTS}곳)")
+    parser.add_argument("--years", default="2023,2024")
+    parser.add_argument("--days-per-month", type=int, default=1)
+    parser.add_argument("--format", choices=["csv", "snapshot"], default="csv")
+    parser.add_argument("--sources", choices=["synth", "real"], default="synth")
+    parser.add_argument("--top-k", type=int, default=TOP_K, help="관광지당 유사 관광지 수 (쌍 단위 표/이미지 순위)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    info = build(args.out_dir, args.scale, tuple(int(y) for y in args.years.split(",")),
+                 args.days_per_month, args.format, args.seed, args.sources, args.top_k)
+    print(f"[완료] {args.out_dir}: {info['spots']:,} spots, {info['rows']:,} rows ({info['format']}, {info['sources']})")
+    for key, n in info['table_rows'].items():
+        print(f"  {key:<16} {n:>12,} rows")
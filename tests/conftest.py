@@ -0,0 +1,5 @@
+import os
+import sys
+
+# app/ 모듈은 Docker 이미지 안에서처럼 평면 import (from metrics import ...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
@@ -0,0 +1,19 @@
+import os
+
+import llm_cache
+
+
+def test_roundtrip(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    llm_cache.cache_put("k", "model", "응답", path=path)
+    assert llm_cache.cache_get("k", path=path) == "응답"
+    assert llm_cache.cache_get("missing", path=path) is None
+
+
+def test_unusable_cache_dir_is_a_miss(tmp_path):
+    # 캐시 폴더 자리에 파일이 있으면 os.makedirs 가 OSError -> 캐시 미스로 처리되고 응답 생성은 계속
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    path = os.path.join(str(blocker), "sub", "cache.sqlite3")
+    llm_cache.cache_put("k", "model", "응답", path=path)
+    assert llm_cache.cache_get("k", path=path) is None
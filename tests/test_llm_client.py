@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+import llm
+import llm_cache
+from stub_llm import LatencyProfile, make_server, stub_reply
+
+PROFILE = LatencyProfile(ttft=0, ttft_sigma=0, tps=0, sentences=3, seed=0)
+MESSAGES = [{"role": "system", "content": "test"}, {"role": "user", "content": "감천문화마을"}]
+
+
+@pytest.fixture
+def stub_server(monkeypatch, tmp_path):
+    # 임시 포트의 OpenAI 호환 스텁 서버 + 공유 클라이언트를 그 주소로
+    server = make_server(port=0, profile=PROFILE)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://{host}:{port}/v1")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_PATH", str(tmp_path / "llm.sqlite3"))
+    llm.reset_client()
+    llm.set_backend(llm.OpenAIBackend())
+    yield f"http://{host}:{port}/v1"
+    llm.reset_client()
+    llm.set_backend(None)
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_is_shared(stub_server):
+    client = llm.get_client()
+    assert llm.get_client() is client
+    assert str(client.base_url).rstrip("/") == stub_server
+
+
+def test_chat_completion(stub_server):
+    assert llm.chat_completion(MESSAGES, use_cache=False) == stub_reply(MESSAGES, PROFILE.sentences)
+
+
+def test_chat_completion_stream(stub_server):
+    pieces = list(llm.chat_completion_stream(MESSAGES, use_cache=False))
+    assert len(pieces) > 1
+    assert "".join(pieces) == stub_reply(MESSAGES, PROFILE.sentences)
+
+
+def test_stream_reply_is_cached_per_server(stub_server):
+    text = "".join(llm.chat_completion_stream(MESSAGES))
+    key = llm_cache.prompt_key(llm.LLM_MODEL, MESSAGES, 0.3, llm.get_backend().cache_scope())
+    assert llm_cache.cache_get(key) == text
+    assert stub_server in llm.get_backend().cache_scope()
+
+
+def test_keyless_local_server(stub_server, monkeypatch):
+    # OPENAI_BASE_URL 만 있는 로컬 서버는 키 없이 사용 가능 (API Key Missing 아님)
+    monkeypatch.delenv("OPENAI_API_KEY")
+    llm.reset_client()
+    assert llm.backend_available()
+    assert llm.chat_completion(MESSAGES, use_cache=False) == stub_reply(MESSAGES, PROFILE.sentences)
+    monkeypatch.delenv("OPENAI_BASE_URL")
+    assert not llm.backend_available()
+    llm.set_backend(llm.StubBackend(PROFILE))
+    assert llm.backend_available()
@@ -0,0 +1,87 @@
+import socket
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+import metrics
+from profiling import timed, count
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = metrics.start_server(port=_free_port(), host="127.0.0.1")
+    assert server is not None
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def _get(url):
+    with urllib.request.urlopen(url, timeout=5) as res:
+        return res.status, res.headers["Content-Type"], res.read().decode("utf-8")
+
+
+def _samples(text):
+    # "name{labels} value" -> {"name{labels}": float}
+    return {line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+            for line in text.splitlines() if line and not line.startswith("#")}
+
+
+def test_metrics_endpoint(base_url):
+    with timed("report.test_trend"): time.sleep(0.01)
+    with timed("llm.test_stream"): pass
+    with timed("test.section"): pass
+
+    @timed("report.test_decorated")
+    def report(): return "ok"
+    assert report() == "ok"
+
+    count("test.cache", True)
+    count("test.cache", True)
+    count("test.cache", False)
+    metrics.observe_tokens(12, 34)
+
+    status, content_type, text = _get(base_url + "/metrics")
+    assert status == 200 and content_type.startswith("text/plain; version=0.0.4")
+    assert "# TYPE sla_report_duration_seconds histogram" in text
+    samples = _samples(text)
+
+    assert samples['sla_report_duration_seconds_count{report="test_trend"}'] == 1
+    assert samples['sla_report_duration_seconds_sum{report="test_trend"}'] >= 0.01
+    assert samples['sla_report_duration_seconds_bucket{report="test_trend",le="0.005"}'] == 0
+    assert samples['sla_report_duration_seconds_bucket{report="test_trend",le="+Inf"}'] == 1
+    assert samples['sla_report_duration_seconds_count{report="test_decorated"}'] == 1
+    assert samples['sla_llm_duration_seconds_count{mode="test_stream"}'] == 1
+    assert samples['sla_section_duration_seconds_count{section="test.section"}'] == 1
+
+    assert samples['sla_cache_requests_total{cache="test.cache",result="hit"}'] == 2
+    assert samples['sla_cache_requests_total{cache="test.cache",result="miss"}'] == 1
+    assert samples['sla_cache_hit_ratio{cache="test.cache"}'] == pytest.approx(2 / 3)
+
+    assert samples['sla_llm_tokens_total{kind="prompt"}'] >= 12
+    assert samples['sla_llm_tokens_total{kind="completion"}'] >= 34
+
+
+def test_histogram_buckets_are_cumulative(base_url):
+    for elapsed in (0.001, 0.2, 3.0):
+        metrics.observe_section("test.buckets", elapsed)
+    samples = _samples(_get(base_url + "/metrics")[2])
+    prefix = 'sla_section_duration_seconds_bucket{section="test.buckets",le='
+    buckets = [samples[f'{prefix}"{b}"}}'] for b in (*map(metrics._num, metrics.DEFAULT_BUCKETS), "+Inf")]
+    assert buckets == sorted(buckets)
+    assert samples[f'{prefix}"0.005"}}'] == 1 and samples[f'{prefix}"0.25"}}'] == 2 and samples[f'{prefix}"+Inf"}}'] == 3
+    assert samples['sla_section_duration_seconds_count{section="test.buckets"}'] == 3
+
+
+def test_root_path_and_404(base_url):
+    assert "sla_sessions_started_total" in _get(base_url + "/")[2]
+    with pytest.raises(urllib.error.HTTPError) as e:
+        _get(base_url + "/nope")
+    assert e.value.code == 404
@@ -0,0 +1,42 @@
+import time
+
+import llm
+import llm_cache
+import reports
+from profiling import timed, totals
+from stub_llm import LatencyProfile
+
+
+def _total(name):
+    return totals().get(name, {}).get('total_s', 0.0)
+
+
+def test_timed_covers_generator_inside_tuple():
+    @timed("test.tuple_stream")
+    def stream():
+        def pieces():
+            for _ in range(3):
+                time.sleep(0.02)
+                yield "x"
+        return pieces(), "#000"
+
+    gen, color = stream()
+    assert color == "#000" and _total("test.tuple_stream") == 0.0
+    assert "".join(gen) == "xxx"
+    assert _total("test.tuple_stream") >= 0.06
+
+
+def test_section_analysis_stream_duration(monkeypatch, tmp_path):
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_PATH", str(tmp_path / "llm.sqlite3"))
+    llm.set_backend(llm.StubBackend(LatencyProfile(ttft=0.05, ttft_sigma=0, tps=400, sentences=2, seed=0)))
+    try:
+        before = _total("report.section_analysis")
+        t0 = time.perf_counter()
+        chunks, _ = reports.generate_section_analysis("trend", "감천문화마을", 2024, "month,val\n1,0.5", "보통", stream=True)
+        text = "".join(chunks)
+        elapsed = time.perf_counter() - t0
+    finally:
+        llm.set_backend(None)
+    assert text and elapsed > 0.05
+    # 튜플을 만드는 시간이 아니라 마지막 조각까지의 시간이 기록되어야 함
+    assert _total("report.section_analysis") - before >= 0.9 * elapsed
@@ -0,0 +1,25 @@
+import metrics
+from prompts import budgeted, count_tokens, TRUNCATED_MARK
+
+
+def build(data):
+    return f"다음 데이터를 분석하세요.\n{data}"
+
+
+DATA = "\n".join(f"2024-01-{d:02d},{d * 1.5:.3f}" for d in range(1, 29))
+
+
+def test_data_is_trimmed_to_budget():
+    system = "분석가"
+    budget = count_tokens(system) + count_tokens(build("")) + 40
+    out = budgeted(build, DATA, system, budget)
+    assert out.endswith(TRUNCATED_MARK)
+    assert count_tokens(system) + count_tokens(out) <= budget
+
+
+def test_fixed_part_over_budget_drops_data_and_counts():
+    before = metrics.PROMPT_OVER_BUDGET.value()
+    system = "분석가 " * 200
+    out = budgeted(build, DATA, system, budget=50)
+    assert out == build("")
+    assert metrics.PROMPT_OVER_BUDGET.value() == before + 1
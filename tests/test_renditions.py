@@ -0,0 +1,21 @@
+from registry import build_registry, spot_id
+from renditions import build_asset_index, asset_for
+
+
+def test_asset_index_is_keyed_by_spot_id(tmp_path):
+    images = tmp_path / "images"
+    images.mkdir()
+    for stem in ("감천문화마을", "해운대", "없는관광지"):
+        (images / f"{stem}.jpg").write_bytes(b"")
+    registry = build_registry(["감천 문화마을", "해운대", "태종대"])
+    index = build_asset_index(registry, None, image_dir=str(images), out_dir=str(tmp_path / "out"), base_url="")
+
+    sid = spot_id(registry, "감천 문화마을")
+    assert set(index['assets']) == {sid, spot_id(registry, "해운대")}
+    # 이름 변형(공백/대소문자)도 같은 ID -> 같은 사진
+    for variant in ("감천 문화마을", "감천문화마을", " 감천_문화마을 "):
+        assert asset_for(index, spot_id(registry, variant), "card") == str(images / "감천문화마을.jpg")
+    assert index['aliases'] == {"감천 문화마을": "감천문화마을"}
+    assert index['missing'] == ["태종대"]
+    assert index['orphans'] == ["없는관광지"]
+    assert asset_for(index, spot_id(registry, "모르는곳"), "card") is None